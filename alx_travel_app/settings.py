@@ -36,6 +36,10 @@ INSTALLED_APPS = [
 
 # ─── 3) Middleware ────────────────────────────────────────────────────────────
 MIDDLEWARE = [
+    # First so that session/auth queries are counted; inert unless QUERY_INSTRUMENTATION
+    "listings.middleware.QueryInstrumentationMiddleware",
+    # Safe reads of opted-in views go to DATABASE_REPLICAS; inert without replicas
+    "listings.middleware.ReplicaRoutingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -45,9 +49,15 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "django_ip_geolocation.middleware.IpGeolocationMiddleware",
+    # Lazy, cached, local lookups instead of django_ip_geolocation's per-request remote call
+    "listings.middleware.LazyGeolocationMiddleware",
 ]
 
+# Per-request query count / DB time headers and per-view counters (listings.middleware)
+QUERY_INSTRUMENTATION = os.getenv("QUERY_INSTRUMENTATION", "False").lower() == "true"
+# Raise instead of logging a warning when a view exceeds its query_budget
+QUERY_BUDGET_ENFORCE = os.getenv("QUERY_BUDGET_ENFORCE", "False").lower() == "true"
+
 ROOT_URLCONF = "alx_travel_app.urls"
 WSGI_APPLICATION = "alx_travel_app.wsgi.application"
 ASGI_APPLICATION = "alx_travel_app.asgi.application"
@@ -77,6 +87,33 @@ DATABASES = {
     )
 }
 
+# Read replicas, comma-separated URLs; served as "replica1", "replica2", ... to the
+# views that opt in (listings.db_routers). Test runs point them at the test primary.
+DATABASE_REPLICAS = []
+for _i, _url in enumerate(filter(None, (u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(","))), 1):
+    DATABASES[f"replica{_i}"] = {**dj_database_url.parse(_url, conn_max_age=600), "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(f"replica{_i}")
+DATABASE_ROUTERS = ["listings.db_routers.PrimaryReplicaRouter"]
+# "round_robin" or "least_latency"
+DATABASE_REPLICA_SELECTION = os.getenv("DATABASE_REPLICA_SELECTION", "round_robin")
+# After a write, that client reads from the primary for this long (replication lag allowance)
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DATABASE_REPLICA_PIN_SECONDS", "10"))
+
+# Redis when CACHE_URL is set (shared by all workers), per-process memory otherwise
+CACHE_URL = os.getenv("CACHE_URL", "")
+if CACHE_URL:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_URL},
+        "geolocation": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_URL,
+                        "KEY_PREFIX": "geo"},
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "geolocation": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "geolocation",
+                        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("IP_GEOLOCATION_CACHE_SIZE", "10000"))}},
+    }
+
 # ─── 6) Authentication ────────────────────────────────────────────────────────
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -119,12 +156,44 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "rest_framework.schemas.coreapi.AutoSchema",
 }
 
+# Opt in to serializing hotel and booking lists from values() rows, encoded with
+# orjson (listings.fast_serializers); the output is identical to the plain path
+FAST_LIST_SERIALIZATION = os.getenv("FAST_LIST_SERIALIZATION", "False").lower() == "true"
+
+# Keyset (cursor) pagination of /api/hotels/; clients may ask for ?page_size=
+HOTEL_PAGE_SIZE = int(os.getenv("HOTEL_PAGE_SIZE", "20"))
+HOTEL_MAX_PAGE_SIZE = int(os.getenv("HOTEL_MAX_PAGE_SIZE", "100"))
+# Most items accepted by POST /api/bookings/bulk/
+BOOKING_BULK_MAX_ITEMS = int(os.getenv("BOOKING_BULK_MAX_ITEMS", "100"))
+# Largest stay and hotel count priced by one GET /api/hotels/quote/ (listings.services.rates)
+RATE_QUOTE_MAX_NIGHTS = int(os.getenv("RATE_QUOTE_MAX_NIGHTS", "90"))
+RATE_QUOTE_MAX_HOTELS = int(os.getenv("RATE_QUOTE_MAX_HOTELS", "500"))
+# Currency of hotel prices and booking totals; others convert through the
+# ExchangeRate table, re-read per process every FX_RATE_CACHE_SECONDS (listings.services.fx)
+PRICE_CURRENCY = os.getenv("PRICE_CURRENCY", "ETB")
+PRICE_CURRENCY_DECIMAL_PLACES = int(os.getenv("PRICE_CURRENCY_DECIMAL_PLACES", "2"))
+FX_RATE_CACHE_SECONDS = int(os.getenv("FX_RATE_CACHE_SECONDS", "60"))
+# Rows fetched per round trip (and written per response chunk) by the /api/exports/ streams
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+# Cached hotel list/retrieve responses (listings.services.hotel_cache); any Hotel write invalidates them.
+# On only with a shared cache by default: under per-process memory a write
+# invalidates the writing worker alone, and the others serve stale bodies.
+HOTEL_RESPONSE_CACHE = os.getenv("HOTEL_RESPONSE_CACHE", str(bool(CACHE_URL))).lower() == "true"
+HOTEL_CACHE = "default"
+HOTEL_CACHE_TIMEOUT = int(os.getenv("HOTEL_CACHE_TIMEOUT", "300"))
+
 # ─── 11) Swagger ──────────────────────────────────────────────────────────────
 SWAGGER_SETTINGS = {
     "DOC_EXPANSION": "none",
     "USE_SESSION_AUTH": False,
     "JSON_EDITOR": True,
+    # The UI pages fetch the pre-generated document instead of regenerating it
+    "SPEC_URL": "schema-json",
 }
+REDOC_SETTINGS = {"SPEC_URL": "schema-json"}
+# Written by `manage.py generate_schema` (build.sh), served at /swagger.json with an ETag
+OPENAPI_SCHEMA_FILE = os.getenv("OPENAPI_SCHEMA_FILE", str(BASE_DIR / "openapi" / "swagger.json"))
+OPENAPI_SCHEMA_MAX_AGE = int(os.getenv("OPENAPI_SCHEMA_MAX_AGE", "300"))
 
 # ─── 12) Celery ───────────────────────────────────────────────────────────────
 CELERY_BROKER_URL = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0")
@@ -133,24 +202,78 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = os.getenv("TIME_ZONE", "Africa/Lagos")
+# Run tasks inline (no broker needed) for local development
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "False").lower() == "true"
+CELERY_BEAT_SCHEDULE = {
+    "reconcile-pending-payments": {
+        "task": "listings.tasks.reconcile_pending_payments",
+        "schedule": float(os.getenv("PAYMENT_RECONCILE_INTERVAL", "300")),
+    },
+    "relay-outbox": {
+        "task": "listings.tasks.relay_outbox",
+        "schedule": float(os.getenv("OUTBOX_RELAY_INTERVAL", "2")),
+    },
+}
+# Transactional outbox (listings.services.outbox): events per Celery message,
+# seconds before an unprocessed batch is sent again, and how long processed
+# events are kept
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
+OUTBOX_REDELIVER_SECONDS = int(os.getenv("OUTBOX_REDELIVER_SECONDS", "300"))
+OUTBOX_RETENTION_SECONDS = int(os.getenv("OUTBOX_RETENTION_SECONDS", str(7 * 24 * 3600)))
 
 # ─── 13) Email ───────────────────────────────────────────────────────────────
 EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "no-reply@alxtravelapp.com")
+# Booking confirmations per batch task (one SMTP connection each)
+BOOKING_EMAIL_BATCH_SIZE = int(os.getenv("BOOKING_EMAIL_BATCH_SIZE", "200"))
 
 # ─── 14) IP Geolocation ───────────────────────────────────────────────────────
 IP_GEOLOCATION_SETTINGS = {
-    "BACKEND": "django_ip_geolocation.backends.ipstack.IPStack",  # <-- class, not module
-    "API_KEY": os.getenv("IPSTACK_API_KEY", ""),
+    # Local range database by default; set e.g. django_ip_geolocation.backends.ipstack.IPStack for remote lookups
+    "BACKEND": os.getenv("IP_GEOLOCATION_BACKEND", "listings.services.geolocation.LocalIPRangeBackend"),
+    "BACKEND_API_KEY": os.getenv("IPSTACK_API_KEY", ""),
     "ENABLED": os.getenv("IP_GEOLOCATION_ENABLED", "True").lower() == "true",
+    "ENABLE_RESPONSE_HOOK": os.getenv("IP_GEOLOCATION_RESPONSE_HEADER", "False").lower() == "true",
 }
+# Built with `manage.py build_geoip_db`
+IP_GEOLOCATION_DATABASE = os.getenv("IP_GEOLOCATION_DATABASE", str(BASE_DIR / "geoip" / "ip-ranges.bin"))
+IP_GEOLOCATION_CACHE = "geolocation"
+IP_GEOLOCATION_CACHE_TIMEOUT = int(os.getenv("IP_GEOLOCATION_CACHE_TIMEOUT", "86400"))
+# Failed lookups are cached this long; an unreadable database file is reopened at most this often
+IP_GEOLOCATION_MISS_CACHE_TIMEOUT = int(os.getenv("IP_GEOLOCATION_MISS_CACHE_TIMEOUT", "60"))
+IP_GEOLOCATION_RETRY_SECONDS = int(os.getenv("IP_GEOLOCATION_RETRY_SECONDS", "60"))
+# Only these paths (regexes) get a request.geolocation
+IP_GEOLOCATION_ROUTES = [
+    route for route in os.getenv("IP_GEOLOCATION_ROUTES", r"^/api/hotels/,^/api/bookings/").split(",") if route
+]
+
 
 
+# ─── 15) Chapa ────────────────────────────────────────────────────────────────
+CHAPA_SECRET_KEY = os.getenv("CHAPA_SECRET_KEY", "")
+CHAPA_BASE_URL = os.getenv("CHAPA_BASE_URL", "https://api.chapa.co/v1")
+CHAPA_POOL_SIZE = int(os.getenv("CHAPA_POOL_SIZE", "20"))
+CHAPA_CONNECT_TIMEOUT = float(os.getenv("CHAPA_CONNECT_TIMEOUT", "5"))
+CHAPA_READ_TIMEOUT = float(os.getenv("CHAPA_READ_TIMEOUT", "30"))
+# Mount the async payment views; only worth it when served through asgi.py
+ASYNC_PAYMENT_VIEWS = os.getenv("ASYNC_PAYMENT_VIEWS", "False").lower() == "true"
+# Background reconciliation of PENDING payments (listings.tasks)
+PAYMENT_RECONCILE_AFTER_SECONDS = int(os.getenv("PAYMENT_RECONCILE_AFTER_SECONDS", "600"))
+PAYMENT_RECONCILE_BATCH_SIZE = int(os.getenv("PAYMENT_RECONCILE_BATCH_SIZE", "500"))
+PAYMENT_RECONCILE_CONCURRENCY = int(os.getenv("PAYMENT_RECONCILE_CONCURRENCY", "20"))
+# zlib-compress provider payloads in the ProviderCall audit table
+PROVIDER_AUDIT_COMPRESS = os.getenv("PROVIDER_AUDIT_COMPRESS", "True").lower() == "true"
+# A payment initiation claim older than this is considered abandoned
+PAYMENT_INIT_LEASE_SECONDS = int(os.getenv("PAYMENT_INIT_LEASE_SECONDS", "35"))
+# The verify endpoint serves a status confirmed this recently without calling Chapa
+PAYMENT_VERIFY_CACHE_SECONDS = int(os.getenv("PAYMENT_VERIFY_CACHE_SECONDS", "60"))
 
-# ─── 15) Logging ──────────────────────────────────────────────────────────────
+# ─── 16) Logging ──────────────────────────────────────────────────────────────
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
     "handlers": {"console": {"class": "logging.StreamHandler"}},
     "root": {"handlers": ["console"], "level": "INFO"},
+    # httpx logs every Chapa call at INFO
+    "loggers": {"httpx": {"level": "WARNING"}},
 }
@@ -1,18 +1,85 @@
+import json
+
 from django.contrib import admin
-from .models import Hotel, Booking, Payment
+
+from .models import Hotel, Booking, ExchangeRate, HotelDaySummary, OutboxEvent, Payment, ProviderCall, RateRule, RoomInventory
+
+class RateRuleInline(admin.TabularInline):
+    model = RateRule
+    fields = ("start_date", "end_date", "weekdays", "price_per_night", "priority")
+    extra = 0
 
 @admin.register(Hotel)
 class HotelAdmin(admin.ModelAdmin):
-    list_display = ("id", "name", "location", "price_per_night")
+    list_display = ("id", "name", "location", "price_per_night", "room_count")
     search_fields = ("name", "location")
+    # Seasons, weekend prices and one-night overrides (services.rates)
+    inlines = [RateRuleInline]
+
+    def get_search_results(self, request, queryset, search_term):
+        # Use the full-text/trigram index instead of LIKE '%term%' scans.
+        if not search_term.strip():
+            return queryset, False
+        return queryset.search(search_term), False
 
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
-    list_display = ("id", "user", "hotel", "check_in_date", "check_out_date")
+    list_display = ("id", "user", "hotel", "check_in_date", "check_out_date", "nights", "total_price")
     search_fields = ("user__username", "hotel__name")
+    # Booking.objects already annotates nights/total_price in SQL
+    list_select_related = ("hotel", "user")
+
+@admin.register(RoomInventory)
+class RoomInventoryAdmin(admin.ModelAdmin):
+    list_display = ("hotel", "date", "remaining", "total_rooms")
+    list_filter = ("date",)
+    list_select_related = ("hotel",)
+
+@admin.register(HotelDaySummary)
+class HotelDaySummaryAdmin(admin.ModelAdmin):
+    list_display = ("hotel", "date", "currency", "bookings", "nights_sold", "guests", "revenue")
+    list_filter = ("date", "currency")
+    list_select_related = ("hotel",)
+    # Maintained by listings.services.revenue; edit payments, not summaries.
+    readonly_fields = ("hotel", "date", "currency", "bookings", "nights_sold", "guests", "revenue")
+
+    def has_add_permission(self, request):
+        return False
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    # Saves invalidate the per-process rate tables (services.fx)
+    list_display = ("currency", "rate", "decimal_places", "updated_at")
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "topic", "key", "created_at", "dispatched_at", "processed_at")
+    list_filter = ("topic",)
+    search_fields = ("key",)
+    # Written and drained by listings.services.outbox.
+    readonly_fields = ("topic", "key", "payload", "created_at", "dispatched_at", "processed_at")
+
+    def has_add_permission(self, request):
+        return False
+
+class ProviderCallInline(admin.TabularInline):
+    model = ProviderCall
+    fields = ("created_at", "provider", "kind", "ok", "pretty_body")
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Body")
+    def pretty_body(self, obj):
+        return json.dumps(obj.body, indent=2)
 
 @admin.register(Payment)
 class PaymentAdmin(admin.ModelAdmin):
+    inlines = [ProviderCallInline]
     list_display = ("id", "booking", "tx_ref", "status", "amount", "updated_at")
     search_fields = ("tx_ref", "booking__id")
-    list_filter = ("status",)
\ No newline at end of file
+    list_filter = ("status",)
+    list_select_related = ("booking__hotel", "booking__user")
\ No newline at end of file
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class ListingsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "listings"
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+        from . import signals
+
+        post_migrate.connect(signals.repair_search_index, sender=self)
@@ -0,0 +1,91 @@
+"""
+Primary/replica routing. Reads go to a replica only while a request routed
+by ReplicaRoutingMiddleware says so; everything else (writes, Celery tasks,
+management commands, reads after a write or inside a transaction the
+request opened) uses the primary, `default`.
+"""
+import contextvars
+import itertools
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_route = contextvars.ContextVar("db_route", default=None)
+
+
+class Route:
+    """Read target of the current request: `replica`, until something writes."""
+
+    def __init__(self):
+        self.replica = None
+        self.pinned = False
+        self.atomic_depth = 0
+
+    def read_alias(self):
+        if self.replica is None or self.pinned:
+            return DEFAULT_DB_ALIAS
+        if len(connections[DEFAULT_DB_ALIAS].atomic_blocks) > self.atomic_depth:
+            return DEFAULT_DB_ALIAS
+        return self.replica
+
+def activate(route):
+    """Make `route` current for this thread/task; returns the token for deactivate()."""
+    return _route.set(route)
+
+def deactivate(token):
+    _route.reset(token)
+
+def reading_from_replica():
+    route = _route.get()
+    return route is not None and route.read_alias() != DEFAULT_DB_ALIAS
+
+
+# Per-process replica selection
+_counter = itertools.count()
+_latency = {}  # alias -> moving average of seconds per query
+_latency_lock = threading.Lock()
+
+
+def choose_replica():
+    """
+    A replica alias per DATABASE_REPLICA_SELECTION: "round_robin", or
+    "least_latency" (lowest moving average; unmeasured replicas first).
+    """
+    replicas = getattr(settings, "DATABASE_REPLICAS", [])
+    if not replicas:
+        return None
+    if getattr(settings, "DATABASE_REPLICA_SELECTION", "round_robin") == "least_latency":
+        with _latency_lock:
+            return min(replicas, key=lambda alias: _latency.get(alias, 0.0))
+    return replicas[next(_counter) % len(replicas)]
+
+def record_latency(alias, seconds_per_query, weight=0.2):
+    with _latency_lock:
+        previous = _latency.get(alias)
+        _latency[alias] = seconds_per_query if previous is None else previous + weight * (seconds_per_query - previous)
+
+def reset_latency():
+    with _latency_lock:
+        _latency.clear()
+
+
+class PrimaryReplicaRouter:
+    """DATABASE_ROUTERS entry; a no-op until DATABASE_REPLICAS lists aliases."""
+
+    def db_for_read(self, model, **hints):
+        route = _route.get()
+        return route.read_alias() if route is not None else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Pin the rest of the request to the primary so it reads its own writes.
+        route = _route.get()
+        if route is not None:
+            route.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *getattr(settings, "DATABASE_REPLICAS", [])}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
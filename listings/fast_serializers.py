@@ -0,0 +1,150 @@
+import decimal
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+from .renderers import FastJSONRenderer
+
+
+def _decimal_converter(field):
+    # DecimalField.to_representation with the quantize exponent and context built once.
+    coerce = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if field.decimal_places is None or not coerce or field.localize or field.normalize_output:
+        return field.to_representation
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding, fallback = field.rounding, field.to_representation
+
+    def convert(value):
+        if type(value) is not decimal.Decimal:
+            return fallback(value)
+        return format(value.quantize(exponent, rounding=rounding, context=context), "f")
+    return convert
+
+def _datetime_converter(field):
+    """
+    DateTimeField.to_representation for aware values in ISO 8601, the common
+    case under USE_TZ. Returns a binder: the active time zone is looked up
+    once per page rather than per value.
+    """
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if not settings.USE_TZ or output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    fixed_zone, fallback = getattr(field, "timezone", None), field.to_representation
+
+    def bind():
+        zone = fixed_zone or timezone.get_current_timezone()
+
+        def convert(value):
+            if isinstance(value, str) or value.tzinfo is None:
+                return fallback(value)
+            text = value.astimezone(zone).isoformat()
+            return text[:-6] + "Z" if text.endswith("+00:00") else text
+        return convert
+    bind.binds = True
+    return bind
+
+def _converter(field):
+    """
+    A function doing field.to_representation for raw values() data, None when
+    that is the identity, or a binder (see _datetime_converter).
+    """
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return field.pk_field.to_representation if field.pk_field else None
+    if isinstance(field, serializers.DecimalField):
+        return _decimal_converter(field)
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.DateField):
+        output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+        return field.to_representation if output_format is None or output_format.lower() != ISO_8601 else _isodate
+    if isinstance(field, serializers.IntegerField) and type(field) is serializers.IntegerField:
+        return int
+    if type(field) in (serializers.CharField, serializers.URLField):
+        return str
+    return field.to_representation
+
+def _isodate(value):
+    return value if isinstance(value, str) else value.isoformat()
+
+
+class ValuesSerializer:
+    """
+    Read-only fast path for a ModelSerializer: reads its fields straight from
+    QuerySet.values() rows and runs them through converters compiled once,
+    producing the same dicts as `serializer_class(objs, many=True).data`
+    without building model instances or bound fields per row. Only flat
+    fields (model columns, annotations, primary-key relations) are supported.
+    A serializer's `extend_representation(data, context)` classmethod, if
+    any, runs on each dict as its to_representation() would.
+    """
+
+    def __init__(self, serializer_class, context=None):
+        self.extend = getattr(serializer_class, "extend_representation", None)
+        self.names, self.sources, self.converters = [], [], []
+        for name, field in serializer_class(context=context or {}).fields.items():
+            if field.write_only:
+                continue
+            if field.source == "*" or "." in field.source or isinstance(field, serializers.BaseSerializer):
+                raise ImproperlyConfigured(f"{serializer_class.__name__}.{name} is not a flat field")
+            self.names.append(name)
+            self.sources.append(field.source)
+            self.converters.append(_converter(field))
+
+    def values(self, queryset):
+        return queryset.values(*self.sources)
+
+    def to_representation(self, rows, context=None):
+        """Serialized dicts for `rows`, an iterable of values() dicts."""
+        columns = [
+            (name, source, convert() if getattr(convert, "binds", False) else convert)
+            for name, source, convert in zip(self.names, self.sources, self.converters)
+        ]
+        data = []
+        for row in rows:
+            item = {}
+            for name, source, convert in columns:
+                value = row[source]
+                item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        if self.extend is not None:
+            context = context or {}
+            data = [self.extend(item, context) for item in data]
+        return data
+
+    def data(self, queryset):
+        return self.to_representation(self.values(queryset))
+
+@lru_cache(maxsize=None)
+def for_serializer(serializer_class):
+    """ValuesSerializer compiled once per serializer class (fields must not depend on the request)."""
+    return ValuesSerializer(serializer_class)
+
+
+class FastListMixin:
+    """
+    Opt-in fast path for a viewset's list(): rows come from values() through
+    for_serializer(serializer_class) and are encoded by FastJSONRenderer.
+    The JSON is identical to the regular path; FAST_LIST_SERIALIZATION = True
+    turns it on.
+    """
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def list(self, request, *args, **kwargs):
+        if not getattr(settings, "FAST_LIST_SERIALIZATION", False):
+            return super().list(request, *args, **kwargs)
+        rows = for_serializer(self.get_serializer_class())
+        context = self.get_serializer_context()
+        queryset = rows.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(rows.to_representation(page, context))
+        return Response(rows.to_representation(queryset, context))
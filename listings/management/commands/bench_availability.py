@@ -0,0 +1,115 @@
+# listings/management/commands/bench_availability.py
+import random
+import statistics
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from listings.models import Hotel, Booking, RoomInventory
+
+LOCATIONS = ["Addis Ababa", "Bahir Dar", "Gondar", "Hawassa", "Lalibela", "Mekelle"]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the hotel availability query against a large synthetic booking "
+        "and room inventory table. "
+        "Everything is seeded inside a transaction that is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hotels", type=int, default=2_000)
+        parser.add_argument("--bookings", type=int, default=1_000_000)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **opts):
+        try:
+            with transaction.atomic():
+                self._run(**opts)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _run(self, hotels, bookings, queries, batch_size, seed, **_):
+        rng = random.Random(seed)
+        start_day = date.today() - timedelta(days=730)
+
+        user = get_user_model().objects.create_user(username=f"bench-{seed}-{time.time_ns()}")
+        rooms = {
+            h.id: h.room_count for h in Hotel.objects.bulk_create(
+                (
+                    Hotel(
+                        name=f"Bench Hotel {i}",
+                        location=rng.choice(LOCATIONS),
+                        price_per_night=rng.randrange(500, 20_000),
+                        room_count=rng.randint(1, 20),
+                    )
+                    for i in range(hotels)
+                ),
+                batch_size=batch_size,
+            )
+        }
+        hotel_ids = list(rooms)
+
+        t0 = time.perf_counter()
+        sold = Counter()
+        created = 0
+        while created < bookings:
+            n = min(batch_size, bookings - created)
+            batch = []
+            for _ in range(n):
+                hotel_id = rng.choice(hotel_ids)
+                check_in = start_day + timedelta(days=rng.randrange(1095))
+                nights = rng.randint(1, 7)
+                batch.append(
+                    Booking(
+                        user=user,
+                        hotel_id=hotel_id,
+                        check_in_date=check_in,
+                        check_out_date=check_in + timedelta(days=nights),
+                        num_guests=rng.randint(1, 4),
+                    )
+                )
+                for i in range(nights):
+                    sold[hotel_id, check_in + timedelta(days=i)] += 1
+            Booking.objects.bulk_create(batch, batch_size=batch_size)
+            created += n
+        RoomInventory.objects.bulk_create(
+            (
+                RoomInventory(hotel_id=hotel_id, date=night, total_rooms=rooms[hotel_id],
+                              remaining=max(rooms[hotel_id] - count, 0))
+                for (hotel_id, night), count in sold.items()
+            ),
+            batch_size=batch_size,
+        )
+        self.stdout.write(f"Seeded {hotels} hotels / {bookings} bookings in {time.perf_counter() - t0:.1f}s")
+
+        timings = []
+        for _ in range(queries):
+            check_in = date.today() + timedelta(days=rng.randrange(180))
+            check_out = check_in + timedelta(days=rng.randint(1, 7))
+            qs = (
+                Hotel.objects.filter(location=rng.choice(LOCATIONS))
+                .available(check_in, check_out)
+                .order_by("-id")[:20]
+            )
+            t = time.perf_counter()
+            list(qs)
+            timings.append((time.perf_counter() - t) * 1000)
+
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(self.style.SUCCESS(
+            f"availability: {queries} queries, median {statistics.median(timings):.2f} ms, "
+            f"p95 {p95:.2f} ms, max {timings[-1]:.2f} ms"
+        ))
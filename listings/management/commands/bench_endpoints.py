@@ -0,0 +1,172 @@
+# listings/management/commands/bench_endpoints.py
+import io
+import json
+import platform
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from listings.models import Hotel, Booking, Payment
+from listings.services import chapa, hotel_cache
+from listings.services.chapa_stub import ChapaStub
+
+LOCATIONS = ["Addis Ababa", "Bahir Dar", "Gondar", "Hawassa"]
+
+
+class _Rollback(Exception):
+    pass
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def summarize(latencies, queries, errors, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "queries_per_request": round(sum(queries) / len(queries), 2),
+        "max_queries": max(queries),
+    }
+
+
+def regressions(current, baseline, tolerance):
+    """Endpoints whose p95 grew by more than `tolerance` or that now run more queries."""
+    found = []
+    for name, base in baseline.get("endpoints", {}).items():
+        now = current["endpoints"].get(name)
+        if now is None:
+            continue
+        if now["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            found.append(f"{name}: p95 {base['p95_ms']} ms -> {now['p95_ms']} ms")
+        if now["queries_per_request"] > base["queries_per_request"]:
+            found.append(f"{name}: queries/request {base['queries_per_request']} -> {now['queries_per_request']}")
+    return found
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the hotel, booking and payment endpoints in-process against a "
+        "seeded database and a local Chapa stub. Reports throughput, p50/p95/p99 "
+        "latency and queries per request, optionally saving JSON and comparing it "
+        "with a previous run. Seeded rows are rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint.")
+        parser.add_argument("--latency", type=float, default=0.05, help="Chapa stub latency per call, seconds.")
+        parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of Chapa calls answered 503.")
+        parser.add_argument("--hotels", type=int, default=1_000)
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--bookings", type=int, default=20_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", help="Write results as JSON to this path.")
+        parser.add_argument("--baseline", help="JSON results of an earlier run to compare against.")
+        parser.add_argument("--tolerance", type=float, default=0.2,
+                            help="Allowed relative p95 growth before a regression is flagged.")
+
+    def handle(self, *args, **opts):
+        stub = ChapaStub(latency=opts["latency"], failure_rate=opts["failure_rate"], seed=opts["seed"])
+        chapa.configure(**stub.transports())
+        try:
+            with override_settings(CHAPA_SECRET_KEY="CHASECK_TEST-bench"), transaction.atomic():
+                results = self._run(stub, **opts)
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            chapa.configure()
+            hotel_cache.bump_version()  # drop responses cached from the rolled-back rows
+
+        for name, r in results["endpoints"].items():
+            self.stdout.write(
+                f"{name:<18} {r['throughput_rps']:>8} req/s  p50 {r['p50_ms']:>8} ms  p95 {r['p95_ms']:>8} ms  "
+                f"p99 {r['p99_ms']:>8} ms  {r['queries_per_request']:>5} queries  {r['errors']} errors"
+            )
+        if opts["output"]:
+            with open(opts["output"], "w") as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {opts['output']}"))
+        if opts["baseline"]:
+            with open(opts["baseline"]) as fh:
+                found = regressions(results, json.load(fh), opts["tolerance"])
+            if found:
+                raise CommandError("Regressions against baseline:\n  " + "\n  ".join(found))
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
+
+    def _run(self, stub, requests, seed, hotels, users, bookings, latency, failure_rate, **_):
+        call_command("seed_load", hotels=hotels, users=users, bookings=bookings, seed=seed, stdout=io.StringIO())
+        rng = random.Random(seed)
+        user = get_user_model().objects.get(username=f"load-{seed}-0")
+
+        # Unpaid bookings for the initiate calls; each one costs a Chapa round trip.
+        hotel = Hotel.objects.order_by("id").first()
+        unpaid = Booking._base_manager.bulk_create(
+            Booking(user=user, hotel=hotel, check_in_date=date.today() + timedelta(days=30 + i % 300),
+                    check_out_date=date.today() + timedelta(days=32 + i % 300), num_guests=1)
+            for i in range(requests)
+        )
+
+        client = Client(HTTP_HOST="localhost")
+        client.force_login(user)
+        hotels_url, bookings_url = reverse("hotel-list"), reverse("booking-list")
+        endpoints = [
+            ("hotels", lambda i: client.get(hotels_url, {"location": rng.choice(LOCATIONS)} if i % 2 else {})),
+            ("bookings", lambda i: client.get(bookings_url)),
+            ("payments_initiate", lambda i: client.post(
+                reverse("payments-initiate"), {"booking_id": unpaid[i].id}, content_type="application/json")),
+        ]
+        results = {}
+        for name, call in endpoints:
+            results[name] = self._measure(call, requests)
+
+        tx_refs = list(Payment.objects.filter(booking__in=unpaid).values_list("tx_ref", flat=True))
+        if tx_refs:
+            results["payments_verify"] = self._measure(
+                lambda i: client.get(reverse("payments-verify", args=[tx_refs[i % len(tx_refs)]])), requests
+            )
+
+        return {
+            "meta": {
+                "created_at": datetime.now(dt_timezone.utc).isoformat(timespec="seconds"),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "dataset": {"hotels": hotels, "users": users, "bookings": bookings, "seed": seed},
+                "chapa_stub": {"latency": latency, "failure_rate": failure_rate, "calls": len(stub.calls)},
+            },
+            "endpoints": results,
+        }
+
+    def _measure(self, call, n):
+        latencies, queries, errors = [], [], 0
+        count = [0]
+
+        def counter(execute, sql, params, many, context):
+            count[0] += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            for i in range(n):
+                count[0] = 0
+                t = time.perf_counter()
+                response = call(i)
+                latencies.append(time.perf_counter() - t)
+                queries.append(count[0])
+                errors += response.status_code >= 400
+        return summarize(latencies, queries, errors, time.perf_counter() - start)
@@ -0,0 +1,75 @@
+# listings/management/commands/bench_serializers.py
+import io
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from listings.fast_serializers import for_serializer
+from listings.models import Hotel, Booking, Payment
+from listings.renderers import FastJSONRenderer
+from listings.serializers import HotelSerializer, BookingSerializer, PaymentSerializer
+from listings.services import hotel_cache
+
+CASES = [
+    ("hotels", HotelSerializer, lambda: Hotel.objects.order_by("-id")),
+    ("bookings", BookingSerializer, lambda: Booking.objects.order_by("-id")),
+    ("payments", PaymentSerializer, lambda: Payment.objects.order_by("-id")),
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark list serialization: ModelSerializer + JSONRenderer against "
+        "the values() fast path + FastJSONRenderer on pages of --rows rows, including "
+        "the query. Fails if the two ever differ by a byte. Seeded rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000, help="Rows per page.")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per path; the best one counts.")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, rows, repeat, seed, **opts):
+        try:
+            with transaction.atomic():
+                call_command("seed_load", hotels=rows, users=100, bookings=rows, payment_ratio=1.0, seed=seed,
+                             skip_inventory=True, stdout=io.StringIO())
+                for name, serializer_class, queryset in CASES:
+                    self._compare(name, serializer_class, lambda: queryset()[:rows], repeat)
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            hotel_cache.bump_version()
+
+    def _compare(self, name, serializer_class, page, repeat):
+        def plain():
+            return JSONRenderer().render(serializer_class(page(), many=True).data)
+
+        def fast():
+            return FastJSONRenderer().render(for_serializer(serializer_class).data(page()))
+
+        if plain() != fast():
+            raise CommandError(f"{name}: fast path output differs from {serializer_class.__name__}")
+        count = page().count()
+        before, after = self._best(plain, repeat), self._best(fast, repeat)
+        self.stdout.write(
+            f"{name:<9} {count} rows  plain {count / before:>10,.0f} rows/s  "
+            f"fast {count / after:>10,.0f} rows/s  x{before / after:.1f}"
+        )
+
+    @staticmethod
+    def _best(render, repeat):
+        timings = []
+        for _ in range(repeat):
+            t = time.perf_counter()
+            render()
+            timings.append(time.perf_counter() - t)
+        return min(timings)
@@ -0,0 +1,48 @@
+# listings/management/commands/build_geoip_db.py
+import csv
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from listings.services.geolocation import RECORD, packed_ip
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert an IP-range CSV (start_ip,end_ip,country_code[,continent_code], "
+        "e.g. the DB-IP country lite export) into the sorted binary file read by "
+        "listings.services.geolocation.LocalIPRangeBackend."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path")
+        parser.add_argument("--output", default=None, help="Defaults to IP_GEOLOCATION_DATABASE.")
+
+    def handle(self, *args, csv_path, output, **opts):
+        output = output or settings.IP_GEOLOCATION_DATABASE
+        records, skipped = [], 0
+        with open(csv_path, newline="") as fh:
+            for row in csv.reader(fh):
+                start, end = (packed_ip(value) for value in row[:2]) if len(row) >= 3 else (None, None)
+                if start is None or end is None or start > end:
+                    skipped += 1
+                    continue
+                country = row[2].strip().upper()[:2].ljust(2)
+                continent = (row[3] if len(row) > 3 else "").strip().upper()[:2].ljust(2)
+                records.append((start, end, country.encode("ascii"), continent.encode("ascii")))
+        if not records:
+            raise CommandError(f"No usable ranges in {csv_path}")
+
+        records.sort()
+        for previous, current in zip(records, records[1:]):
+            if current[0] <= previous[1]:
+                raise CommandError("Overlapping ranges in the input; the lookup needs disjoint ranges")
+
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        tmp = f"{output}.tmp"
+        with open(tmp, "wb") as fh:
+            for record in records:
+                fh.write(RECORD.pack(*record))
+        os.replace(tmp, output)  # running workers keep their old mapping until restart
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(records)} ranges to {output} ({skipped} rows skipped)."))
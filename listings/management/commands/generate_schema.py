@@ -0,0 +1,20 @@
+# listings/management/commands/generate_schema.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from listings.services import api_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI (Swagger 2.0) document served at /swagger.json. "
+        "Run at build time; the API serves the file as is."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=None, help="Defaults to OPENAPI_SCHEMA_FILE.")
+
+    def handle(self, *args, output, **opts):
+        output = output or settings.OPENAPI_SCHEMA_FILE
+        size = api_schema.write(output)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {size} bytes of OpenAPI schema to {output}."))
@@ -0,0 +1,106 @@
+# listings/management/commands/loadtest_payments.py
+import asyncio
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+
+from listings.models import Hotel, Booking, Payment
+from listings.services import chapa
+from listings.services.chapa_stub import ChapaStub
+from listings.views import VerifyPaymentAPIView, AsyncVerifyPaymentView
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare payment verification throughput of the sync view (a fixed pool of "
+        "worker threads, like gunicorn sync workers) and the async view (one event "
+        "loop) against a deliberately slow in-process Chapa stub."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--latency", type=float, default=0.2, help="Stub latency per Chapa call, seconds.")
+        parser.add_argument("--sync-workers", type=int, default=4)
+        parser.add_argument("--concurrency", type=int, default=200, help="In-flight requests for the async run.")
+
+    def handle(self, *args, requests, latency, sync_workers, concurrency, **opts):
+        stub = ChapaStub(latency=latency)
+        chapa.configure(**stub.transports())
+        # A payment per request and pass: one the sync pass completed would be
+        # answered from is_recently_verified() without reaching the stub.
+        user, hotel, tx_refs = self._seed(2 * requests)
+        try:
+            with override_settings(CHAPA_SECRET_KEY="CHASECK_TEST-loadtest"):
+                self._report("sync ", stub, *self._run_sync(tx_refs[:requests], sync_workers))
+                self._report("async", stub, *asyncio.run(self._run_async(tx_refs[requests:], concurrency)))
+        finally:
+            chapa.configure()
+            Payment.objects.filter(tx_ref__in=tx_refs).delete()
+            Booking._base_manager.filter(user=user).delete()
+            hotel.delete()
+            user.delete()
+
+    def _seed(self, n):
+        tag = uuid.uuid4().hex[:8]
+        user = get_user_model().objects.create_user(username=f"loadtest-{tag}")
+        hotel = Hotel.objects.create(name=f"Loadtest {tag}", location="Loadtest", price_per_night=100)
+        bookings = Booking.objects.bulk_create(
+            Booking(user=user, hotel=hotel, check_in_date=date(2030, 1, 1), check_out_date=date(2030, 1, 2), num_guests=1)
+            for _ in range(n)
+        )
+        payments = Payment.objects.bulk_create(
+            Payment(booking=b, tx_ref=f"loadtest-{tag}-{i}", amount=100) for i, b in enumerate(bookings)
+        )
+        return user, hotel, [p.tx_ref for p in payments]
+
+    def _run_sync(self, tx_refs, workers):
+        view = VerifyPaymentAPIView.as_view()
+        factory = RequestFactory()
+
+        def one(tx_ref):
+            t = time.perf_counter()
+            response = view(factory.get(f"/api/payments/verify/{tx_ref}/"), tx_ref=tx_ref)
+            response.render()
+            assert response.status_code == 200, response.content
+            return time.perf_counter() - t
+
+        def close_connection(_):
+            connection.close()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            latencies = list(pool.map(one, tx_refs))
+            list(pool.map(close_connection, range(workers)))
+        return latencies, time.perf_counter() - start
+
+    async def _run_async(self, tx_refs, concurrency):
+        view = AsyncVerifyPaymentView.as_view()
+        factory = AsyncRequestFactory()
+        gate = asyncio.Semaphore(concurrency)
+
+        async def one(tx_ref):
+            async with gate:
+                t = time.perf_counter()
+                response = await view(factory.get(f"/api/payments/verify/{tx_ref}/"), tx_ref=tx_ref)
+                assert response.status_code == 200, response.content
+                return time.perf_counter() - t
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one(tx_ref) for tx_ref in tx_refs))
+        return latencies, time.perf_counter() - start
+
+    def _report(self, label, stub, latencies, elapsed):
+        latencies = sorted(latencies)
+        p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+        stub_calls, stub.calls[:] = len(stub.calls), []
+        self.stdout.write(self.style.SUCCESS(
+            f"{label}: {len(latencies)} requests in {elapsed:.2f}s = {len(latencies) / elapsed:.1f} req/s, "
+            f"p50 {statistics.median(latencies) * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms, {stub_calls} Chapa calls"
+        ))
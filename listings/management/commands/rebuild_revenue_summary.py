@@ -0,0 +1,28 @@
+# listings/management/commands/rebuild_revenue_summary.py
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from listings.services import revenue
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute HotelDaySummary rows from completed payments. Verification keeps "
+        "them current; run this after deploying them and after bulk payment fixes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hotel", type=int, action="append", dest="hotel_ids",
+                            help="Only this hotel id (repeatable).")
+        parser.add_argument("--start", type=date.fromisoformat, default=None, help="First day (YYYY-MM-DD).")
+        parser.add_argument("--end", type=date.fromisoformat, default=None, help="Last day (YYYY-MM-DD).")
+        parser.add_argument("--batch-size", type=int, default=5_000, help="Rows per INSERT statement.")
+
+    def handle(self, *args, hotel_ids, start, end, batch_size, **opts):
+        if start and end and end < start:
+            raise CommandError("--end must not be before --start")
+        t = time.perf_counter()
+        rows = revenue.rebuild(hotel_ids, start=start, end=end, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {rows} summary rows in {time.perf_counter() - t:.1f}s."))
@@ -1,18 +1,18 @@
 # listings/management/commands/seed_listings.py
 from django.core.management.base import BaseCommand
-from listings.models import Listing
+from listings.models import Hotel
 
 SAMPLES = [
-    dict(title="Lakeview Studio", description="Cozy by the lake", price_per_night=120, currency="USD"),
-    dict(title="City Loft", description="Heart of downtown", price_per_night=185, currency="USD"),
+    dict(name="Lakeview Studio", location="Bahir Dar", price_per_night=120, room_count=4),
+    dict(name="City Loft", location="Addis Ababa", price_per_night=185, room_count=10),
 ]
 
 class Command(BaseCommand):
-    help = "Seed a few sample listings"
+    help = "Seed a few sample hotels (see seed_load for large datasets)"
 
     def handle(self, *args, **kwargs):
         created = 0
         for data in SAMPLES:
-            obj, was_created = Listing.objects.get_or_create(title=data["title"], defaults=data)
+            obj, was_created = Hotel.objects.get_or_create(name=data["name"], defaults=data)
             created += 1 if was_created else 0
-        self.stdout.write(self.style.SUCCESS(f"Seeded {created} new listing(s)."))
+        self.stdout.write(self.style.SUCCESS(f"Seeded {created} new hotel(s)."))
@@ -0,0 +1,151 @@
+# listings/management/commands/seed_load.py
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from listings.models import Hotel, Booking, Payment
+from listings.services import hotel_cache, inventory, revenue
+
+LOCATIONS = ["Addis Ababa", "Bahir Dar", "Gondar", "Hawassa", "Lalibela", "Mekelle", "Dire Dawa", "Jimma"]
+HOTEL_WORDS = ["Grand", "Palace", "Lodge", "Resort", "Inn", "Suites", "Plaza", "View"]
+PAYMENT_STATUSES = [Payment.Status.COMPLETED, Payment.Status.PENDING, Payment.Status.FAILED]
+PAYMENT_WEIGHTS = [70, 20, 10]
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large, reproducible synthetic dataset (hotels, users, bookings, "
+        "payments) for load testing. The same --seed always produces the same rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hotels", type=int, default=10_000)
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--bookings", type=int, default=1_000_000)
+        parser.add_argument("--payment-ratio", type=float, default=0.8,
+                            help="Share of bookings that get a payment row.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--start", type=date.fromisoformat, default=None,
+                            help="First check-in date (YYYY-MM-DD); defaults to a year ago.")
+        parser.add_argument("--days", type=int, default=730, help="Spread of check-in dates.")
+        parser.add_argument("--batch-size", type=int, default=2_000, help="Rows per INSERT statement.")
+        parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows per transaction.")
+        parser.add_argument("--skip-inventory", action="store_true",
+                            help="Don't rebuild RoomInventory from the new bookings.")
+
+    def handle(self, *args, **opts):
+        # Payments draw from their own stream so --chunk-size never changes the data.
+        self.rng = random.Random(opts["seed"])
+        self.payment_rng = random.Random(opts["seed"] + 1)
+        self.batch_size = opts["batch_size"]
+        self.chunk_size = opts["chunk_size"]
+        self.tag = f"load-{opts['seed']}"
+        self.now = timezone.now()
+        start = opts["start"] or date.today() - timedelta(days=365)
+
+        User = get_user_model()
+        if User.objects.filter(username__startswith=f"{self.tag}-").exists():
+            raise CommandError(f"Seed {opts['seed']} was already loaded; pick another --seed or clean up first.")
+
+        hotels = self._load("hotels", Hotel, self._hotels(opts["hotels"]))
+        hotel_cache.bump_version()  # bulk_create sends no post_save
+        prices = {h.id: h.price_per_night for h in hotels}
+        hotel_ids = list(prices)
+        del hotels
+
+        users = self._load("users", User, self._users(User, opts["users"]))
+        user_ids = [u.id for u in users]
+        del users
+
+        # Payments follow each booking chunk so only one chunk of bookings is held in memory.
+        payments = 0
+        t = time.perf_counter()
+        for chunk in _chunks(self._bookings(opts["bookings"], hotel_ids, user_ids, start, opts["days"]),
+                             self.chunk_size):
+            with transaction.atomic():
+                chunk = Booking._base_manager.bulk_create(chunk, batch_size=self.batch_size)
+                payments += len(Payment.objects.bulk_create(
+                    self._payments(chunk, prices, opts["payment_ratio"]), batch_size=self.batch_size
+                ))
+        self._report("bookings+payments", opts["bookings"] + payments, time.perf_counter() - t)
+
+        if not opts["skip_inventory"]:
+            t = time.perf_counter()
+            inventory.rebuild(hotel_ids, batch_size=self.batch_size)
+            self.stdout.write(f"inventory: rebuilt for {len(hotel_ids)} hotels in {time.perf_counter() - t:.1f}s")
+        t = time.perf_counter()
+        rows = revenue.rebuild(hotel_ids, batch_size=self.batch_size)
+        self.stdout.write(f"revenue: {rows} summary rows in {time.perf_counter() - t:.1f}s")
+
+    def _load(self, label, model, rows):
+        """bulk_create `rows` in chunk-sized transactions; returns the saved objects (with pks)."""
+        saved = []
+        t = time.perf_counter()
+        for chunk in _chunks(rows, self.chunk_size):
+            with transaction.atomic():
+                saved.extend(model._base_manager.bulk_create(chunk, batch_size=self.batch_size))
+        self._report(label, len(saved), time.perf_counter() - t)
+        return saved
+
+    def _report(self, label, rows, elapsed):
+        self.stdout.write(self.style.SUCCESS(
+            f"{label}: {rows} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)"
+        ))
+
+    def _hotels(self, n):
+        rng = self.rng
+        for i in range(n):
+            yield Hotel(
+                name=f"{rng.choice(HOTEL_WORDS)} {rng.choice(LOCATIONS)} {i}",
+                location=rng.choice(LOCATIONS),
+                price_per_night=Decimal(rng.randrange(50_000, 2_000_000)) / 100,
+                room_count=rng.randint(5, 200),
+            )
+
+    def _users(self, User, n):
+        # Hashing is the slow part of create_user(); every seeded account shares one unusable password.
+        password = make_password(None)
+        for i in range(n):
+            username = f"{self.tag}-{i}"
+            yield User(username=username, email=f"{username}@example.com", password=password)
+
+    def _bookings(self, n, hotel_ids, user_ids, start, days):
+        rng = self.rng
+        for _ in range(n):
+            check_in = start + timedelta(days=rng.randrange(days))
+            yield Booking(
+                hotel_id=rng.choice(hotel_ids),
+                user_id=rng.choice(user_ids),
+                check_in_date=check_in,
+                check_out_date=check_in + timedelta(days=rng.randint(1, 14)),
+                num_guests=rng.randint(1, 4),
+            )
+
+    def _payments(self, bookings, prices, ratio):
+        rng = self.payment_rng
+        for booking in bookings:
+            if rng.random() >= ratio:
+                continue
+            nights = (booking.check_out_date - booking.check_in_date).days
+            status = rng.choices(PAYMENT_STATUSES, PAYMENT_WEIGHTS)[0]
+            yield Payment(
+                booking_id=booking.id,
+                tx_ref=f"{self.tag}-{booking.id}",
+                amount=prices[booking.hotel_id] * nights,
+                status=status,
+                completed_at=self.now if status == Payment.Status.COMPLETED else None,
+            )
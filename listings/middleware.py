@@ -0,0 +1,223 @@
+import logging
+import re
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.functional import SimpleLazyObject, empty
+from django_ip_geolocation.utils import is_user_consented
+from rest_framework.permissions import SAFE_METHODS
+
+from listings import db_routers
+from listings.services.geolocation import locate_request
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more queries than its declared `query_budget` (raised when QUERY_BUDGET_ENFORCE is on)."""
+
+
+class QueryRecorder:
+    """execute_wrapper that counts queries and times them, keeping the slowest one."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_sql = ""
+        self.slowest = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if elapsed >= self.slowest:
+                self.slowest, self.slowest_sql = elapsed, sql
+
+
+# Per-view counters for this process: {view name: {...}}
+_stats = {}
+UNRESOLVED = "<unresolved>"
+_stats_lock = threading.Lock()
+
+
+def _record(view, recorder):
+    with _stats_lock:
+        s = _stats.setdefault(view, {"requests": 0, "queries": 0, "db_ms": 0.0, "max_queries": 0,
+                                     "slowest_ms": 0.0, "slowest_sql": ""})
+        s["requests"] += 1
+        s["queries"] += recorder.count
+        s["db_ms"] += recorder.duration * 1000
+        s["max_queries"] = max(s["max_queries"], recorder.count)
+        if recorder.slowest * 1000 > s["slowest_ms"]:
+            s["slowest_ms"], s["slowest_sql"] = recorder.slowest * 1000, recorder.slowest_sql
+
+def query_stats():
+    """Snapshot of the per-view counters collected by QueryInstrumentationMiddleware."""
+    with _stats_lock:
+        return {view: dict(s) for view, s in _stats.items()}
+
+def reset_query_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def _view_name(view_func):
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    if view_class is not None:
+        return f"{view_class.__module__}.{view_class.__qualname__}"
+    return f"{view_func.__module__}.{view_func.__qualname__}"
+
+def _view_option(view_func, request, name):
+    """
+    A per-view setting such as `query_budget`: one value for every method, or
+    a dict keyed by viewset action ("list", "retrieve", ...) or HTTP method ("post", ...).
+    """
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    value = getattr(view_class, name, None)
+    if not isinstance(value, dict):
+        return value
+    method = request.method.lower()
+    action = (getattr(view_func, "actions", None) or {}).get(method)
+    return value.get(action, value.get(method))
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Records, per request, the number of queries, total DB time and the
+    slowest statement, and reports them as X-DB-* response headers, on
+    `response.query_stats` and in the per-view counters of query_stats().
+    Views going over their `query_budget` are logged, or fail with
+    QueryBudgetExceeded when QUERY_BUDGET_ENFORCE is set (tests).
+
+    Switched on by the QUERY_INSTRUMENTATION setting; put it first in
+    MIDDLEWARE so session and auth queries are counted too.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request._query_view = ("", None)
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        view, budget = request._query_view
+        view = view or UNRESOLVED  # one bucket for 404s, however many paths get scanned
+        _record(view, recorder)
+        response.query_stats = {
+            "view": view,
+            "queries": recorder.count,
+            "db_ms": round(recorder.duration * 1000, 2),
+            "slowest_ms": round(recorder.slowest * 1000, 2),
+            "slowest_sql": recorder.slowest_sql,
+            "budget": budget,
+        }
+        response["X-DB-Queries"] = str(recorder.count)
+        response["X-DB-Time-Ms"] = f"{recorder.duration * 1000:.2f}"
+        response["X-DB-Slowest-Ms"] = f"{recorder.slowest * 1000:.2f}"
+        response["X-View-Name"] = view
+
+        if budget is not None and recorder.count > budget:
+            message = (f"{view} ran {recorder.count} queries for {request.method} {request.path} "
+                       f"(budget {budget}); slowest: {recorder.slowest_sql}")
+            if getattr(settings, "QUERY_BUDGET_ENFORCE", False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_view = (_view_name(view_func), _view_option(view_func, request, "query_budget"))
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Sends the reads of safe requests to a read replica (db_routers.choose_replica)
+    when the view opts in with `read_replica` (True, or per action/method as for
+    `query_budget`). The first write pins the rest of the request to the
+    primary, and a response to a request that wrote carries a short-lived
+    cookie that keeps that client on the primary until the replicas caught up
+    (DATABASE_REPLICA_PIN_SECONDS). Replica query times feed the
+    least-latency selection. Inert unless DATABASE_REPLICAS is set.
+    """
+    PIN_COOKIE = "db_pin"
+
+    def __init__(self, get_response):
+        if not getattr(settings, "DATABASE_REPLICAS", []):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        route = db_routers.Route()
+        request._db_route = route
+        token = db_routers.activate(route)
+        try:
+            with ExitStack() as stack:
+                request._db_route_stack = stack
+                response = self.get_response(request)
+        finally:
+            db_routers.deactivate(token)
+
+        recorder = getattr(request, "_db_replica_recorder", None)
+        if recorder is not None and recorder.count:
+            db_routers.record_latency(route.replica, recorder.duration / recorder.count)
+        if route.pinned or request.method not in SAFE_METHODS:
+            response.set_cookie(self.PIN_COOKIE, "1", max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                                httponly=True, samesite="Lax")
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method not in SAFE_METHODS
+            or self.PIN_COOKIE in request.COOKIES
+            or not _view_option(view_func, request, "read_replica")
+        ):
+            return None
+        route = request._db_route
+        route.replica = db_routers.choose_replica()
+        route.atomic_depth = len(connections["default"].atomic_blocks)
+        request._db_replica_recorder = QueryRecorder()
+        request._db_route_stack.enter_context(
+            connections[route.replica].execute_wrapper(request._db_replica_recorder)
+        )
+        return None
+
+
+class LazyGeolocationMiddleware:
+    """
+    Replacement for django_ip_geolocation's IpGeolocationMiddleware. Only
+    requests matching IP_GEOLOCATION_ROUTES get a `request.geolocation`, and
+    it is a lazy object: the (cached, local) lookup runs the first time a view
+    reads it. The X-IP-Geolocation response hook likewise only fires then.
+    """
+
+    def __init__(self, get_response):
+        options = settings.IP_GEOLOCATION_SETTINGS
+        if not options.get("ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.routes = [re.compile(route) for route in getattr(settings, "IP_GEOLOCATION_ROUTES", [])]
+        self.response_header = options.get("RESPONSE_HEADER", "X-IP-Geolocation")
+        self.response_hook = options.get("ENABLE_RESPONSE_HOOK", False)
+
+    def __call__(self, request):
+        if not any(route.search(request.path_info) for route in self.routes) or not is_user_consented(request):
+            return self.get_response(request)
+
+        request.geolocation = SimpleLazyObject(lambda: locate_request(request) or {})
+        response = self.get_response(request)
+        if self.response_hook and request.geolocation._wrapped is not empty:
+            response[self.response_header] = request.geolocation._wrapped
+        return response
@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("listings", "0001_initial"),
+    ]
+
+    operations = [
+        # Listing -> Hotel
+        migrations.RenameModel(old_name="Listing", new_name="Hotel"),
+        migrations.RenameField(model_name="hotel", old_name="title", new_name="name"),
+        migrations.RemoveField(model_name="hotel", name="description"),
+        migrations.RemoveField(model_name="hotel", name="currency"),
+        migrations.RemoveField(model_name="hotel", name="created_at"),
+        migrations.AddField(
+            model_name="hotel",
+            name="location",
+            field=models.CharField(default="", max_length=255),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name="hotel",
+            name="name",
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AlterField(
+            model_name="hotel",
+            name="price_per_night",
+            field=models.DecimalField(decimal_places=2, max_digits=10),
+        ),
+        # Booking
+        migrations.RenameField(model_name="booking", old_name="listing", new_name="hotel"),
+        migrations.RenameField(model_name="booking", old_name="start_date", new_name="check_in_date"),
+        migrations.RenameField(model_name="booking", old_name="end_date", new_name="check_out_date"),
+        migrations.RenameField(model_name="booking", old_name="guests", new_name="num_guests"),
+        migrations.RemoveField(model_name="booking", name="total_price"),
+        migrations.RemoveField(model_name="booking", name="currency"),
+        migrations.RemoveField(model_name="booking", name="created_at"),
+        migrations.AlterField(
+            model_name="booking",
+            name="hotel",
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="listings.hotel"),
+        ),
+        migrations.AlterField(
+            model_name="booking",
+            name="user",
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name="booking",
+            name="num_guests",
+            field=models.PositiveIntegerField(),
+        ),
+        # Payment
+        migrations.AlterField(
+            model_name="payment",
+            name="tx_ref",
+            field=models.CharField(max_length=255, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="status",
+            field=models.CharField(choices=[("PENDING", "Pending"), ("COMPLETED", "Completed"), ("FAILED", "Failed")], default="PENDING", max_length=50),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="amount",
+            field=models.DecimalField(decimal_places=2, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="currency",
+            field=models.CharField(default="ETB", max_length=10),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="raw_init_resp",
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="raw_verify_resp",
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="checkout_url",
+            field=models.URLField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="chapa_ref_id",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0002_hotel'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['location', '-id'], name='hotel_location_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['price_per_night', '-id'], name='hotel_price_id_idx'),
+        ),
+    ]
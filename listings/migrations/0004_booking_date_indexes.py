@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0003_hotel_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['hotel', 'check_in_date', 'check_out_date'], name='booking_hotel_dates_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['hotel', 'check_out_date', 'check_in_date'], name='booking_hotel_checkout_idx'),
+        ),
+    ]
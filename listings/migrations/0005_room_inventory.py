@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+from collections import Counter
+from datetime import timedelta
+
+
+def backfill_inventory(apps, schema_editor):
+    """Derive inventory rows for the nights already held by existing bookings."""
+    Booking = apps.get_model("listings", "Booking")
+    Hotel = apps.get_model("listings", "Hotel")
+    RoomInventory = apps.get_model("listings", "RoomInventory")
+    db = schema_editor.connection.alias
+
+    sold = Counter()
+    for hotel_id, check_in, check_out in Booking.objects.using(db).values_list(
+        "hotel_id", "check_in_date", "check_out_date"
+    ).iterator(chunk_size=5000):
+        for i in range((check_out - check_in).days):
+            sold[hotel_id, check_in + timedelta(days=i)] += 1
+
+    rooms = dict(Hotel.objects.using(db).values_list("id", "room_count"))
+    RoomInventory.objects.using(db).bulk_create(
+        (
+            RoomInventory(hotel_id=hotel_id, date=night, total_rooms=rooms[hotel_id],
+                          remaining=max(rooms[hotel_id] - count, 0))
+            for (hotel_id, night), count in sold.items()
+        ),
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0004_booking_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hotel',
+            name='room_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.CreateModel(
+            name='RoomInventory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total_rooms', models.PositiveIntegerField()),
+                ('remaining', models.PositiveIntegerField()),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inventory', to='listings.hotel')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='roominventory',
+            constraint=models.UniqueConstraint(fields=('hotel', 'date'), name='inventory_hotel_date_uniq'),
+        ),
+        migrations.RunPython(backfill_inventory, migrations.RunPython.noop),
+    ]
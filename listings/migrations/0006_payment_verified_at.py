@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0005_room_inventory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='verified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['status', 'updated_at'], name='payment_status_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0006_payment_verified_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='idempotency_key',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='init_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
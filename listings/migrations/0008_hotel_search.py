@@ -0,0 +1,64 @@
+from django.db import migrations
+
+# The SQL is copied here rather than imported from listings.services.search so
+# this migration keeps doing the same thing whatever that module becomes.
+
+POSTGRES_INSTALL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS hotel_search_tsv_idx ON listings_hotel "
+    "USING GIN ((to_tsvector('simple', name || ' ' || location)))",
+    "CREATE INDEX IF NOT EXISTS hotel_name_trgm_idx ON listings_hotel USING GIN (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS hotel_location_trgm_idx ON listings_hotel USING GIN (location gin_trgm_ops)",
+]
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS hotel_search_tsv_idx",
+    "DROP INDEX IF EXISTS hotel_name_trgm_idx",
+    "DROP INDEX IF EXISTS hotel_location_trgm_idx",
+]
+
+SQLITE_INSTALL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS listings_hotel_fts USING fts5("
+    "name, location, content='listings_hotel', content_rowid='id', tokenize='trigram')",
+    """CREATE TRIGGER IF NOT EXISTS listings_hotel_fts_ai AFTER INSERT ON listings_hotel BEGIN
+        INSERT INTO listings_hotel_fts(rowid, name, location) VALUES (new.id, new.name, new.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS listings_hotel_fts_ad AFTER DELETE ON listings_hotel BEGIN
+        INSERT INTO listings_hotel_fts(listings_hotel_fts, rowid, name, location)
+        VALUES ('delete', old.id, old.name, old.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS listings_hotel_fts_au AFTER UPDATE OF name, location ON listings_hotel BEGIN
+        INSERT INTO listings_hotel_fts(listings_hotel_fts, rowid, name, location)
+        VALUES ('delete', old.id, old.name, old.location);
+        INSERT INTO listings_hotel_fts(rowid, name, location) VALUES (new.id, new.name, new.location);
+    END""",
+    "INSERT INTO listings_hotel_fts(listings_hotel_fts) VALUES ('rebuild')",
+]
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS listings_hotel_fts_ai",
+    "DROP TRIGGER IF EXISTS listings_hotel_fts_ad",
+    "DROP TRIGGER IF EXISTS listings_hotel_fts_au",
+    "DROP TABLE IF EXISTS listings_hotel_fts",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        # Other backends have no index and search with LIKE scans.
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql, params=None)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0007_payment_idempotency'),
+    ]
+
+    operations = [
+        # tsvector + pg_trgm GIN indexes on PostgreSQL, an FTS5 shadow table on SQLite
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_INSTALL, "sqlite": SQLITE_INSTALL}),
+            _run({"postgresql": POSTGRES_UNINSTALL, "sqlite": SQLITE_UNINSTALL}),
+        ),
+    ]
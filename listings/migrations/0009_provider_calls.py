@@ -0,0 +1,75 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:49
+
+import json
+import zlib
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def move_raw_responses(apps, schema_editor):
+    """Copy the inline Chapa payloads into ProviderCall rows before the columns go."""
+    Payment = apps.get_model("listings", "Payment")
+    ProviderCall = apps.get_model("listings", "ProviderCall")
+    db = schema_editor.connection.alias
+
+    def call(payment, kind, body):
+        raw = json.dumps(body, separators=(",", ":"), default=str).encode()
+        compressed = len(raw) >= 256
+        return ProviderCall(payment=payment, kind=kind, ok="error" not in body, compressed=compressed,
+                            payload=zlib.compress(raw) if compressed else raw)
+
+    payments = Payment.objects.using(db).only("id", "raw_init_resp", "raw_verify_resp").order_by("id")
+    batch = []
+    for payment in payments.iterator(chunk_size=2000):
+        if payment.raw_init_resp:
+            batch.append(call(payment, "initialize", payment.raw_init_resp))
+            error = payment.raw_init_resp.get("error")
+            if error:
+                Payment.objects.using(db).filter(pk=payment.pk).update(provider_error=str(error)[:255])
+        if payment.raw_verify_resp:
+            batch.append(call(payment, "verify", payment.raw_verify_resp))
+        if len(batch) >= 2000:
+            ProviderCall.objects.using(db).bulk_create(batch)
+            batch = []
+    ProviderCall.objects.using(db).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0008_hotel_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='provider_error',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.CreateModel(
+            name='ProviderCall',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(default='chapa', max_length=20)),
+                ('kind', models.CharField(choices=[('initialize', 'Initialize'), ('verify', 'Verify')], max_length=20)),
+                ('ok', models.BooleanField(default=True)),
+                ('payload', models.BinaryField()),
+                ('compressed', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('payment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='provider_calls', to='listings.payment')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['payment', 'created_at'], name='providercall_payment_idx')],
+            },
+        ),
+        migrations.RunPython(move_raw_responses, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='payment',
+            name='raw_init_resp',
+        ),
+        migrations.RemoveField(
+            model_name='payment',
+            name='raw_verify_resp',
+        ),
+    ]
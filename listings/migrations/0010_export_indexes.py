@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0009_provider_calls'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['check_in_date', 'id'], name='booking_check_in_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['created_at', 'id'], name='payment_created_id_idx'),
+        ),
+    ]
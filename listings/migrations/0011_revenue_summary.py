@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:55
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def backfill_completed_at(apps, schema_editor):
+    """Best guess for payments completed before completed_at existed: their last verification."""
+    Payment = apps.get_model("listings", "Payment")
+    Payment.objects.using(schema_editor.connection.alias).filter(status="COMPLETED").update(completed_at=Coalesce("verified_at", "updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0010_export_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='HotelDaySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('currency', models.CharField(max_length=10)),
+                ('bookings', models.IntegerField(default=0)),
+                ('nights_sold', models.IntegerField(default=0)),
+                ('guests', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='day_summaries', to='listings.hotel')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date', 'hotel'], name='summary_date_hotel_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='hoteldaysummary',
+            constraint=models.UniqueConstraint(fields=('hotel', 'date', 'currency'), name='summary_hotel_date_currency_uniq'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0012_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='quoted_total',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.CreateModel(
+            name='RateRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('weekdays', models.PositiveSmallIntegerField(default=127)),
+                ('price_per_night', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('priority', models.SmallIntegerField(default=0)),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rate_rules', to='listings.hotel')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hotel', 'end_date', 'start_date'], name='raterule_hotel_dates_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='raterule',
+            constraint=models.CheckConstraint(check=models.Q(('end_date__gt', models.F('start_date'))), name='raterule_dates_check'),
+        ),
+        migrations.AddConstraint(
+            model_name='raterule',
+            constraint=models.CheckConstraint(check=models.Q(('weekdays__gte', 1), ('weekdays__lte', 127)), name='raterule_weekdays_check'),
+        ),
+    ]
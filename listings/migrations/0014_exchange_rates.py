@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0013_rate_rules'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('currency', models.CharField(max_length=10, primary_key=True, serialize=False)),
+                ('rate', models.DecimalField(decimal_places=10, max_digits=20)),
+                ('decimal_places', models.PositiveSmallIntegerField(default=2)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0014_exchange_rates'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='booking_hotel_dates_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='booking_hotel_checkout_idx',
+        ),
+    ]
@@ -1,33 +1,205 @@
-from django.db import models
+import json
+import zlib
+
+from django.db import connections, models
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from datetime import date
 
+from listings.services import search as hotel_search
+
+class HotelQuerySet(models.QuerySet):
+    def available(self, check_in, check_out, rooms=1):
+        """
+        Hotels with at least `rooms` rooms left on every night of [check_in, check_out).
+        Nights without an inventory row have never been booked, so only sold-down
+        rows need checking; that anti-join is served by the (hotel, date) key.
+        """
+        sold_out = RoomInventory.objects.filter(
+            hotel=models.OuterRef("pk"),
+            date__gte=check_in,
+            date__lt=check_out,
+            remaining__lt=rooms,
+        )
+        return self.filter(room_count__gte=rooms).filter(~models.Exists(sold_out))
+
+    def search(self, term):
+        """Hotels whose name or location match `term`, ranked by relevance (see services.search)."""
+        return hotel_search.search(self, term, connections[self.db].vendor)
+
+
 class Hotel(models.Model):
     name = models.CharField(max_length=255)
     location = models.CharField(max_length=255)
     price_per_night = models.DecimalField(max_digits=10, decimal_places=2)
+    room_count = models.PositiveIntegerField(default=1)
+
+    objects = HotelQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Back the keyset pagination (ORDER BY id DESC) of filtered hotel lists.
+            models.Index(fields=["location", "-id"], name="hotel_location_id_idx"),
+            models.Index(fields=["price_per_night", "-id"], name="hotel_price_id_idx"),
+        ]
 
     def __str__(self):
         return self.name
 
+class NightsBetween(models.Func):
+    """Whole days between two date expressions, computed by the database."""
+    output_field = models.IntegerField()
+    arg_joiner = " - "
+    template = "(%(expressions)s)"
+
+    def __init__(self, start, end, **extra):
+        super().__init__(end, start, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template="CAST(julianday(%(expressions)s) AS INTEGER)",
+            arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, function="DATEDIFF", template="%(function)s(%(expressions)s)",
+            arg_joiner=", ", **extra_context,
+        )
+
+
+class BookingQuerySet(models.QuerySet):
+    def with_totals(self):
+        """Annotate `nights` and `total_price` in SQL instead of per row in Python."""
+        nights = NightsBetween("check_in_date", "check_out_date")
+        return self.annotate(
+            nights=models.Case(
+                models.When(check_out_date__gt=models.F("check_in_date"), then=nights),
+                default=models.Value(0),
+                output_field=models.IntegerField(),
+            ),
+        ).annotate(
+            # The price quoted when booked (services.rates); bookings from
+            # before rates, or inserted without a quote, cost the flat rate.
+            total_price=Coalesce(
+                "quoted_total",
+                models.ExpressionWrapper(
+                    models.F("hotel__price_per_night") * models.F("nights"),
+                    output_field=models.DecimalField(max_digits=12, decimal_places=2),
+                ),
+            ),
+        )
+
+
+class BookingManager(models.Manager.from_queryset(BookingQuerySet)):
+    """Always joins hotel and user and carries the SQL-computed totals."""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("hotel", "user").with_totals()
+
+
 class Booking(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE)
     check_in_date = models.DateField()
     check_out_date = models.DateField()
     num_guests = models.PositiveIntegerField()
+    # Stay price from listings.services.rates, fixed when the dates are booked
+    quoted_total = models.DecimalField(max_digits=12, decimal_places=2, blank=True, null=True)
+
+    objects = BookingManager()
+
+    class Meta:
+        indexes = [
+            # Streaming exports walk a check-in range in this order.
+            models.Index(fields=["check_in_date", "id"], name="booking_check_in_id_idx"),
+        ]
 
     @property
-    def total_price(self):
-        """Calculates the total price for the booking."""
+    def nights(self):
+        """Number of nights; uses the queryset annotation when present."""
+        if "_nights" in self.__dict__:
+            return self._nights
         if self.check_in_date and self.check_out_date and self.check_in_date < self.check_out_date:
-            num_nights = (self.check_out_date - self.check_in_date).days
-            return self.hotel.price_per_night * num_nights
+            return (self.check_out_date - self.check_in_date).days
         return 0
 
+    @nights.setter
+    def nights(self, value):
+        self._nights = value
+
+    @property
+    def total_price(self):
+        """Calculates the total price for the booking."""
+        if "_total_price" in self.__dict__:
+            return self._total_price
+        if self.quoted_total is not None:
+            return self.quoted_total
+        return self.hotel.price_per_night * self.nights if self.nights else 0
+
+    @total_price.setter
+    def total_price(self, value):
+        self._total_price = value
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Dates or hotel may have changed; drop the stale SQL annotations.
+        self.__dict__.pop("_nights", None)
+        self.__dict__.pop("_total_price", None)
+
     def __str__(self):
         return f"Booking for {self.hotel.name} by {self.user.username}"
 
+class RateRule(models.Model):
+    """
+    Price per night for the nights of [start_date, end_date) falling on one of
+    `weekdays` (bitmask, Monday = 1): a season, weekend pricing or a one-night
+    override. Where rules overlap the highest priority wins, then the newest;
+    nights no rule covers cost Hotel.price_per_night. See services.rates.
+    """
+    ALL_WEEK = 0b1111111
+    WEEKEND = 0b0110000  # Friday and Saturday nights
+
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="rate_rules")
+    start_date = models.DateField()
+    end_date = models.DateField()
+    weekdays = models.PositiveSmallIntegerField(default=ALL_WEEK)
+    price_per_night = models.DecimalField(max_digits=10, decimal_places=2)
+    priority = models.SmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(check=models.Q(end_date__gt=models.F("start_date")), name="raterule_dates_check"),
+            models.CheckConstraint(check=models.Q(weekdays__gte=1, weekdays__lte=127), name="raterule_weekdays_check"),
+        ]
+        indexes = [
+            # Rules of the candidate hotels overlapping a stay.
+            models.Index(fields=["hotel", "end_date", "start_date"], name="raterule_hotel_dates_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.hotel_id}: {self.price_per_night} from {self.start_date} to {self.end_date}"
+
+class RoomInventory(models.Model):
+    """
+    Rooms left per hotel per night. Rows are created lazily from Hotel.room_count
+    the first time a night is reserved (see listings.services.inventory).
+    """
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="inventory")
+    date = models.DateField()
+    total_rooms = models.PositiveIntegerField()
+    remaining = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["hotel", "date"], name="inventory_hotel_date_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.hotel_id} @ {self.date}: {self.remaining}/{self.total_rooms}"
+
 class Payment(models.Model):
     # --- Add Status choices ---
     class Status(models.TextChoices):
@@ -42,12 +214,131 @@ class Payment(models.Model):
     currency = models.CharField(max_length=10, default="ETB") # <-- Add currency field
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    # Add fields to store Chapa's responses
-    raw_init_resp = models.JSONField(default=dict)
-    raw_verify_resp = models.JSONField(default=dict)
+    # Chapa's full responses live in ProviderCall; only the last init error stays here
+    provider_error = models.CharField(max_length=255, blank=True, default="")
     checkout_url = models.URLField(blank=True, null=True)
     chapa_ref_id = models.CharField(max_length=255, blank=True, null=True)
+    # Last time the status was confirmed with Chapa (verify view or reconciliation)
+    verified_at = models.DateTimeField(blank=True, null=True)
+    # When the payment became COMPLETED; the day it counts under in HotelDaySummary
+    completed_at = models.DateTimeField(blank=True, null=True)
+    # Initiation bookkeeping (listings.services.payments.claim_initiation)
+    idempotency_key = models.CharField(max_length=255, blank=True, null=True)
+    init_started_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # Reconciliation scans stale PENDING rows.
+            models.Index(fields=["status", "updated_at"], name="payment_status_updated_idx"),
+            # Streaming exports walk a created_at range in this order.
+            models.Index(fields=["created_at", "id"], name="payment_created_id_idx"),
+        ]
+
+    def __str__(self):
+        return f"Payment for Booking #{self.booking_id} - Status: {self.status}"
+
+class HotelDaySummary(models.Model):
+    """
+    Completed payments per hotel, day of completion and currency, kept up to
+    date by listings.services.revenue as payments are verified.
+    """
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="day_summaries")
+    date = models.DateField()
+    currency = models.CharField(max_length=10)
+    bookings = models.IntegerField(default=0)
+    nights_sold = models.IntegerField(default=0)
+    guests = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["hotel", "date", "currency"], name="summary_hotel_date_currency_uniq"),
+        ]
+        indexes = [
+            # Date-range reports across all hotels.
+            models.Index(fields=["date", "hotel"], name="summary_date_hotel_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.hotel_id} @ {self.date}: {self.revenue} {self.currency}"
+
+class ExchangeRate(models.Model):
+    """
+    Units of `currency` per unit of PRICE_CURRENCY (what hotel prices are in)
+    and the decimal places amounts in it round to. Loaded from a fixture
+    (`manage.py loaddata fx_rates` ships sample rates) or kept in the admin;
+    read through listings.services.fx.
+    """
+    currency = models.CharField(max_length=10, primary_key=True)
+    rate = models.DecimalField(max_digits=20, decimal_places=10)
+    decimal_places = models.PositiveSmallIntegerField(default=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.currency} {self.rate}"
+
+class OutboxEvent(models.Model):
+    """
+    A side effect to run once the transaction that wrote it commits, e.g. a
+    confirmation email for a new booking. Rows are written next to the data
+    they describe (listings.services.outbox) and handed to Celery in batches
+    by the relay; `key` makes recording the same event twice a no-op.
+    """
+    topic = models.CharField(max_length=50)
+    key = models.CharField(max_length=255, unique=True)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(blank=True, null=True)
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # The relay only ever scans the unprocessed tail, oldest first.
+            models.Index(fields=["id"], condition=models.Q(processed_at__isnull=True), name="outbox_pending_idx"),
+            models.Index(fields=["processed_at"], name="outbox_processed_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} {self.key}"
+
+class ProviderCall(models.Model):
+    """
+    Append-only audit trail of payment provider calls, one row per call.
+    Payloads are kept out of the Payment row and zlib-compressed when
+    PROVIDER_AUDIT_COMPRESS is on; read them back through `body`.
+    """
+    class Kind(models.TextChoices):
+        INITIALIZE = "initialize", "Initialize"
+        VERIFY = "verify", "Verify"
+
+    payment = models.ForeignKey(Payment, on_delete=models.CASCADE, related_name="provider_calls")
+    provider = models.CharField(max_length=20, default="chapa")
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    ok = models.BooleanField(default=True)
+    payload = models.BinaryField()
+    compressed = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["payment", "created_at"], name="providercall_payment_idx")]
+
+    @classmethod
+    def build(cls, payment, kind, body, ok=True):
+        """Unsaved row for `body` (any JSON-serializable value)."""
+        raw = json.dumps(body, separators=(",", ":"), default=str).encode()
+        compressed = getattr(settings, "PROVIDER_AUDIT_COMPRESS", True) and len(raw) >= 256
+        return cls(payment=payment, kind=kind, ok=ok, compressed=compressed,
+                   payload=zlib.compress(raw) if compressed else raw)
+
+    @property
+    def body(self):
+        raw = bytes(self.payload)
+        return json.loads(zlib.decompress(raw) if self.compressed else raw)
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Provider calls are append-only.")
+        super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"Payment for Booking #{self.booking.id} - Status: {self.status}"
\ No newline at end of file
+        return f"{self.provider} {self.kind} for payment #{self.payment_id}"
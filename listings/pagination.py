@@ -0,0 +1,17 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class HotelCursorPagination(CursorPagination):
+    """
+    Keyset pagination over Hotel.id with opaque cursors.
+    Every page is a single indexed range scan, however deep the client scrolls.
+    """
+    ordering = "-id"
+    page_size_query_param = "page_size"
+
+    def __init__(self):
+        super().__init__()
+        # Read per instance so settings overrides apply
+        self.page_size = getattr(settings, "HOTEL_PAGE_SIZE", 20)
+        self.max_page_size = getattr(settings, "HOTEL_MAX_PAGE_SIZE", 100)
@@ -0,0 +1,33 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional: without it this is the stock JSONRenderer
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it can match the stock
+    output byte for byte: compact, non-ASCII left as is, U+2028/U+2029
+    escaped. Indented output, ASCII-only or non-strict settings and anything
+    orjson rejects (huge ints, lone surrogates) go through the stock path.
+    Floats are the one type orjson may format differently; the serializers
+    behind it render numbers as ints or decimal strings.
+    """
+    # Dates and dataclasses are left to encoder_class, which formats them its own way.
+    _options = orjson and (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii or not self.compact or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self._options)
+        except TypeError:  # orjson.JSONEncodeError
+            return super().render(data, accepted_media_type, renderer_context)
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
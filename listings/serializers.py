@@ -1,19 +1,188 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import Hotel, Booking, Payment
+from .models import Hotel, Booking, Payment, ProviderCall
+
+class ConvertedPricesMixin:
+    """
+    Adds {"converted": {"currency": ..., <field>: ...}} for the `price_fields`
+    when the view put an fx Converter in context["convert"] (?currency=).
+    The converter is built once per request; no per-row queries.
+    """
+    price_fields = ()
+
+    @classmethod
+    def extend_representation(cls, data, context):
+        convert = context.get("convert")
+        if convert is not None:
+            data["converted"] = {"currency": convert.currency, **{
+                name: convert.format(data[name]) for name in cls.price_fields
+            }}
+        return data
+
+    def to_representation(self, instance):
+        return self.extend_representation(super().to_representation(instance), self.context)
+
+class HotelSerializer(ConvertedPricesMixin, serializers.ModelSerializer):
+    price_fields = ("price_per_night",)
 
-class HotelSerializer(serializers.ModelSerializer):
     class Meta:
         model = Hotel
         fields = ["id", "name", "location", "price_per_night"]
 
-class BookingSerializer(serializers.ModelSerializer):
+class HotelPrimaryKeyField(serializers.PrimaryKeyRelatedField):
+    """Resolves from context["hotels"] (prefetched by BookingBulkSerializer) when present."""
+
+    def to_internal_value(self, data):
+        hotels = self.context.get("hotels")
+        if hotels is None:
+            return super().to_internal_value(data)
+        try:
+            return hotels[int(data)]
+        except (KeyError, TypeError, ValueError):
+            self.fail("does_not_exist", pk_value=data)
+
+class BookingSerializer(ConvertedPricesMixin, serializers.ModelSerializer):
+    price_fields = ("total_price",)
+    hotel = HotelPrimaryKeyField(queryset=Hotel.objects.all())
+    # Annotated in SQL by Booking.objects (see BookingQuerySet.with_totals)
+    nights = serializers.IntegerField(read_only=True)
+    total_price = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+
     class Meta:
         model = Booking
-        fields = ["id", "user", "hotel", "check_in_date", "check_out_date", "num_guests"]
+        fields = ["id", "user", "hotel", "check_in_date", "check_out_date", "num_guests", "nights", "total_price"]
         read_only_fields = ["user"]
 
+    def validate(self, attrs):
+        check_in = attrs.get("check_in_date", getattr(self.instance, "check_in_date", None))
+        check_out = attrs.get("check_out_date", getattr(self.instance, "check_out_date", None))
+        if check_in and check_out and check_out <= check_in:
+            raise serializers.ValidationError({"check_out_date": "Must be after check_in_date."})
+        return attrs
+
+class BookingBulkSerializer(serializers.ListSerializer):
+    """
+    Validates a list of bookings item by item, fetching every referenced hotel
+    with one query. Invalid items don't fail the list: after is_valid(),
+    validated_data holds None at their index and `item_errors` their errors.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise serializers.ValidationError({"non_field_errors": ["Expected a list of bookings."]})
+        max_items = getattr(settings, "BOOKING_BULK_MAX_ITEMS", 100)
+        if not data or len(data) > max_items:
+            raise serializers.ValidationError({"non_field_errors": [f"Send between 1 and {max_items} bookings."]})
+
+        hotel_ids = set()
+        for item in data:
+            try:
+                hotel_ids.add(int(item["hotel"]))
+            except (KeyError, TypeError, ValueError):
+                pass
+        self.context["hotels"] = Hotel.objects.in_bulk(hotel_ids)
+
+        validated, self.item_errors = [], []
+        for item in data:
+            try:
+                validated.append(self.child.run_validation(item))
+                self.item_errors.append(None)
+            except serializers.ValidationError as exc:
+                validated.append(None)
+                self.item_errors.append(exc.detail)
+        return validated
+
+class ProviderCallSerializer(serializers.ModelSerializer):
+    body = serializers.JSONField(read_only=True)
+
+    class Meta:
+        model = ProviderCall
+        fields = ["id", "provider", "kind", "ok", "body", "created_at"]
+
 class PaymentSerializer(serializers.ModelSerializer):
+    # Provider payloads only with context["expand"] = ["provider_calls"]
+    provider_calls = ProviderCallSerializer(many=True, read_only=True)
+
     class Meta:
         model = Payment
-        fields = "__all__"
-        read_only_fields = ["tx_ref", "status", "created_at", "updated_at"]
\ No newline at end of file
+        fields = [
+            "id", "booking", "tx_ref", "status", "amount", "currency", "checkout_url", "chapa_ref_id",
+            "provider_error", "verified_at", "created_at", "updated_at", "provider_calls",
+        ]
+        read_only_fields = ["tx_ref", "status", "created_at", "updated_at"]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if "provider_calls" not in self.context.get("expand", ()):
+            self.fields.pop("provider_calls")
+
+class AvailabilitySearchSerializer(serializers.Serializer):
+    """Query parameters of GET /api/hotels/availability/."""
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+
+    def validate(self, attrs):
+        if attrs["check_out"] <= attrs["check_in"]:
+            raise serializers.ValidationError({"check_out": "Must be after check_in."})
+        return attrs
+
+
+class RateQuoteSerializer(AvailabilitySearchSerializer):
+    """Query parameters of GET /api/hotels/quote/; `hotels` is a comma-separated id list."""
+    hotels = serializers.CharField(required=False)
+
+    def validate_hotels(self, value):
+        try:
+            ids = [int(i) for i in value.split(",") if i.strip()]
+        except ValueError:
+            raise serializers.ValidationError("Expected comma-separated hotel ids.")
+        if len(ids) > settings.RATE_QUOTE_MAX_HOTELS:
+            raise serializers.ValidationError(f"At most {settings.RATE_QUOTE_MAX_HOTELS} hotels per quote.")
+        return ids
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if (attrs["check_out"] - attrs["check_in"]).days > settings.RATE_QUOTE_MAX_NIGHTS:
+            raise serializers.ValidationError({"check_out": f"Stays are limited to {settings.RATE_QUOTE_MAX_NIGHTS} nights."})
+        return attrs
+
+class HotelQuoteSerializer(ConvertedPricesMixin, serializers.Serializer):
+    """One hotel's total in GET /api/hotels/quote/, from {"hotel": id, "total_price": Decimal} dicts."""
+    price_fields = ("total_price",)
+    hotel = serializers.IntegerField()
+    total_price = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
+class HotelSearchSerializer(serializers.Serializer):
+    """Query parameters of GET /api/hotels/search/."""
+    q = serializers.CharField(max_length=100, trim_whitespace=True)
+    limit = serializers.IntegerField(min_value=1, max_value=settings.HOTEL_MAX_PAGE_SIZE, default=20)
+
+
+class ExportRangeSerializer(serializers.Serializer):
+    """Query parameters of the /api/exports/ endpoints; both dates inclusive."""
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get("start") and attrs.get("end") and attrs["end"] < attrs["start"]:
+            raise serializers.ValidationError({"end": "Must not be before start."})
+        return attrs
+
+
+class RevenueReportSerializer(ExportRangeSerializer):
+    """Query parameters of GET /api/reports/revenue/."""
+    hotel = serializers.IntegerField(required=False, min_value=1)
+    by = serializers.ChoiceField(choices=["day", "hotel"], default="day")
+
+
+class RevenueRowSerializer(serializers.Serializer):
+    """One row of the revenue report: per day or per hotel, and per currency."""
+    date = serializers.DateField(read_only=True)
+    hotel_id = serializers.IntegerField(read_only=True)
+    hotel = serializers.CharField(source="hotel__name", read_only=True)
+    currency = serializers.CharField(read_only=True)
+    bookings = serializers.IntegerField(read_only=True)
+    nights_sold = serializers.IntegerField(read_only=True)
+    guests = serializers.IntegerField(read_only=True)
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
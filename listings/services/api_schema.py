@@ -0,0 +1,87 @@
+"""
+The OpenAPI document, generated once at build time (manage.py generate_schema,
+run by build.sh) and served from OPENAPI_SCHEMA_FILE. drf_yasg is only
+imported to generate a schema or to render the Swagger/ReDoc pages.
+"""
+import hashlib
+import logging
+import os
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+INFO = {
+    "title": "ALX Travel API",
+    "default_version": "v1",
+    "description": "API for listings, bookings, and Chapa payments",
+}
+
+
+def generate():
+    """Introspect every API view and return the schema as JSON bytes."""
+    from drf_yasg import openapi
+    from drf_yasg.codecs import OpenAPICodecJson
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    # No request: a mock one would carry a host that ALLOWED_HOSTS rejects.
+    schema = OpenAPISchemaGenerator(openapi.Info(**INFO)).get_schema(request=None, public=True)
+    # The file is served from any host: leave host and scheme to the client.
+    schema.pop("host", None)
+    schema.pop("schemes", None)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+def write(path=None):
+    """Generate the schema into `path` (default OPENAPI_SCHEMA_FILE) atomically; returns its size."""
+    path = path or settings.OPENAPI_SCHEMA_FILE
+    body = generate()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(body)
+    os.replace(tmp, path)
+    return len(body)
+
+
+_loaded = (None, b"", "")  # ((path, mtime), body, etag)
+_lock = threading.Lock()
+
+
+def load():
+    """
+    (body, etag) of the schema file, re-read only when its mtime changes.
+    Without a file (no build step, e.g. a dev server) the schema is generated
+    in-process once and kept.
+    """
+    global _loaded
+    path = settings.OPENAPI_SCHEMA_FILE
+    try:
+        stamp = (path, os.stat(path).st_mtime_ns)
+    except FileNotFoundError:
+        stamp = (path, None)
+    if _loaded[0] == stamp:
+        return _loaded[1], _loaded[2]
+
+    with _lock:
+        if _loaded[0] != stamp:
+            if stamp[1] is None:
+                logger.warning("%s not found; generating the OpenAPI schema in-process "
+                               "(run manage.py generate_schema at build time)", path)
+                body = generate()
+            else:
+                with open(path, "rb") as fh:
+                    body = fh.read()
+            _loaded = (stamp, body, hashlib.sha256(body).hexdigest()[:32])
+        return _loaded[1], _loaded[2]
+
+def render_ui(request, name):
+    """HTML of the "swagger" or "redoc" page; the page fetches the schema from SPEC_URL itself."""
+    from drf_yasg import openapi
+    from drf_yasg.renderers import ReDocRenderer, SwaggerUIRenderer
+
+    renderer = {"swagger": SwaggerUIRenderer, "redoc": ReDocRenderer}[name]()
+    # Only the title and version are read from the document for the page itself.
+    info = openapi.Swagger(info=openapi.Info(title=INFO["title"], default_version=INFO["default_version"]),
+                           paths=openapi.Paths({}), _prefix="")
+    return renderer.render(info, renderer.media_type, {"request": request})
@@ -1,13 +1,25 @@
+import asyncio
 import uuid
-import requests
+import weakref
+
+import httpx
 from django.conf import settings
-from requests.exceptions import RequestException
 
 BASE_URL = "https://api.chapa.co/v1"
 
+
+class ChapaError(Exception):
+    """Chapa could not be reached or answered with an error."""
+
+    def __init__(self, message, status_code=None, body=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+
 def _headers():
     """Generate headers for Chapa API requests."""
-    key = (settings.CHAPA_SECRET_KEY or "").strip()
+    key = (getattr(settings, "CHAPA_SECRET_KEY", "") or "").strip()
     if not key:
         raise ValueError(
             "CHAPA_SECRET_KEY is missing. Add it to .env file, e.g.,\n"
@@ -28,16 +40,7 @@ def generate_tx_ref(prefix="booking"):
     """Generate a unique transaction reference."""
     return f"{prefix}-{uuid.uuid4().hex[:12]}"
 
-def _raise_with_body(resp: requests.Response):
-    """Raise HTTPError with response body for debugging."""
-    try:
-        body = resp.json()
-    except ValueError:
-        body = resp.text
-    msg = f"HTTP {resp.status_code} {resp.reason} for {resp.url}: {body}"
-    raise requests.HTTPError(msg, response=resp)
-
-def initialize(
+def _initialize_payload(
     amount,
     currency,
     email,
@@ -50,7 +53,7 @@ def initialize(
     customization=None,
     meta=None,
 ):
-    """Initialize a Chapa payment transaction."""
+    """Validate arguments and build the /transaction/initialize body."""
     if not tx_ref:
         raise ValueError("tx_ref is required")
     if not amount or float(amount) <= 0:
@@ -78,32 +81,174 @@ def initialize(
         payload["customization"] = customization
     if meta:
         payload["meta"] = meta
+    return payload
 
-    try:
-        response = requests.post(
-            f"{BASE_URL}/transaction/initialize",
-            json=payload,
-            headers=_headers(),
-            timeout=30,
-        )
-        if not response.ok:
-            _raise_with_body(response)
+def _json_or_raise(response: httpx.Response, action):
+    """Return the JSON body, or raise ChapaError carrying the body for debugging."""
+    if response.is_success:
         return response.json()
-    except RequestException as e:
-        raise RequestException(f"Failed to initialize payment: {str(e)}")
+    try:
+        body = response.json()
+    except ValueError:
+        body = response.text
+    raise ChapaError(
+        f"Failed to {action} payment: HTTP {response.status_code} "
+        f"{response.reason_phrase} for {response.request.url}: {body}",
+        status_code=response.status_code,
+        body=body,
+    )
+
+
+class _BaseChapaClient:
+    """Connection settings shared by the sync and async clients."""
+
+    def __init__(
+        self,
+        base_url=None,
+        pool_size=None,
+        connect_timeout=None,
+        read_timeout=None,
+        transport=None,
+    ):
+        self.base_url = (base_url or getattr(settings, "CHAPA_BASE_URL", BASE_URL)).rstrip("/")
+        pool_size = pool_size or getattr(settings, "CHAPA_POOL_SIZE", 20)
+        self._options = {
+            "base_url": self.base_url,
+            "timeout": httpx.Timeout(
+                read_timeout or getattr(settings, "CHAPA_READ_TIMEOUT", 30.0),
+                connect=connect_timeout or getattr(settings, "CHAPA_CONNECT_TIMEOUT", 5.0),
+            ),
+            "limits": httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        }
+        if transport is not None:
+            self._options["transport"] = transport
+
+
+class ChapaClient(_BaseChapaClient):
+    """
+    Chapa API client over one pooled keep-alive connection set.
+    Pass `transport` (any httpx transport) or `base_url` to talk to a stub.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._http = httpx.Client(**self._options)
+
+    def initialize(self, **kwargs):
+        """Initialize a Chapa payment transaction."""
+        payload = _initialize_payload(**kwargs)
+        try:
+            response = self._http.post("/transaction/initialize", json=payload, headers=_headers())
+        except httpx.HTTPError as e:
+            raise ChapaError(f"Failed to initialize payment: {e}") from e
+        return _json_or_raise(response, "initialize")
+
+    def verify(self, tx_ref: str):
+        """Verify a Chapa payment transaction."""
+        if not tx_ref:
+            raise ValueError("tx_ref is required")
+        try:
+            response = self._http.get(f"/transaction/verify/{tx_ref}", headers=_headers())
+        except httpx.HTTPError as e:
+            raise ChapaError(f"Failed to verify payment: {e}") from e
+        return _json_or_raise(response, "verify")
+
+    def close(self):
+        self._http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncChapaClient(_BaseChapaClient):
+    """asyncio flavour of ChapaClient with the same methods, awaitable."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._http = httpx.AsyncClient(**self._options)
+
+    async def initialize(self, **kwargs):
+        """Initialize a Chapa payment transaction."""
+        payload = _initialize_payload(**kwargs)
+        try:
+            response = await self._http.post("/transaction/initialize", json=payload, headers=_headers())
+        except httpx.HTTPError as e:
+            raise ChapaError(f"Failed to initialize payment: {e}") from e
+        return _json_or_raise(response, "initialize")
+
+    async def verify(self, tx_ref: str):
+        """Verify a Chapa payment transaction."""
+        if not tx_ref:
+            raise ValueError("tx_ref is required")
+        try:
+            response = await self._http.get(f"/transaction/verify/{tx_ref}", headers=_headers())
+        except httpx.HTTPError as e:
+            raise ChapaError(f"Failed to verify payment: {e}") from e
+        return _json_or_raise(response, "verify")
+
+    async def close(self):
+        await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+# ─── Process-wide clients ─────────────────────────────────────────────────────
+_client_options = {}
+_client = None
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def configure(**options):
+    """
+    Rebuild the shared clients with these options (base_url, pool_size, timeouts,
+    transport), e.g. `configure(transport=httpx.MockTransport(handler))` in tests.
+    `async_transport`, if given, replaces `transport` for the async client.
+    """
+    global _client
+    if _client is not None:
+        _client.close()
+    _client = None
+    _async_clients.clear()
+    _client_options.clear()
+    _client_options.update(options)
+
+def get_client():
+    """The shared sync client, created on first use."""
+    global _client
+    if _client is None:
+        options = {k: v for k, v in _client_options.items() if k != "async_transport"}
+        _client = ChapaClient(**options)
+    return _client
+
+def get_async_client():
+    """The shared async client for the running event loop (pools are loop-bound)."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        options = dict(_client_options)
+        if "async_transport" in options:
+            options["transport"] = options.pop("async_transport")
+        client = _async_clients[loop] = AsyncChapaClient(**options)
+    return client
+
+async def close_async_client():
+    """Close the running loop's shared async client, e.g. before a private loop shuts down."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+def initialize(**kwargs):
+    """Initialize a Chapa payment transaction through the shared client."""
+    return get_client().initialize(**kwargs)
 
 def verify(tx_ref: str):
-    """Verify a Chapa payment transaction."""
-    if not tx_ref:
-        raise ValueError("tx_ref is required")
-    try:
-        response = requests.get(
-            f"{BASE_URL}/transaction/verify/{tx_ref}",
-            headers=_headers(),
-            timeout=30,
-        )
-        if not response.ok:
-            _raise_with_body(response)
-        return response.json()
-    except RequestException as e:
-        raise RequestException(f"Failed to verify payment: {str(e)}")
\ No newline at end of file
+    """Verify a Chapa payment transaction through the shared client."""
+    return get_client().verify(tx_ref)
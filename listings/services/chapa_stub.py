@@ -0,0 +1,63 @@
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+
+class ChapaStub:
+    """
+    In-process stand-in for api.chapa.co, used by tests, load tests and benchmarks.
+    Plug it in with `chapa.configure(**ChapaStub(latency=0.2).transports())`.
+
+    latency       seconds added to every call
+    failure_rate  share of calls answered with HTTP 503
+    verify_status "success", "failed", "cancelled" or "pending" for verify calls
+    """
+
+    def __init__(self, latency=0.0, failure_rate=0.0, verify_status="success", seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.verify_status = verify_status
+        self.calls = []
+        self._rng = random.Random(seed)
+
+    def transports(self):
+        """Keyword arguments for chapa.configure(): a sync and an async transport."""
+        return {
+            "transport": httpx.MockTransport(self._handle_sync),
+            "async_transport": httpx.MockTransport(self._handle_async),
+        }
+
+    def _handle_sync(self, request):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.respond(request)
+
+    async def _handle_async(self, request):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.respond(request)
+
+    def respond(self, request):
+        path = request.url.path
+        self.calls.append((request.method, path))
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            return httpx.Response(503, json={"message": "Service unavailable (stub)"})
+
+        if path.endswith("/transaction/initialize"):
+            body = json.loads(request.content)
+            return httpx.Response(200, json={
+                "message": "Hosted Link",
+                "status": "success",
+                "data": {"checkout_url": f"https://checkout.chapa.co/checkout/payment/{body['tx_ref']}"},
+            })
+        if "/transaction/verify/" in path:
+            tx_ref = path.rsplit("/", 1)[-1]
+            return httpx.Response(200, json={
+                "message": "Payment details",
+                "status": "success",
+                "data": {"status": self.verify_status, "tx_ref": tx_ref, "reference": f"AP{tx_ref[-8:]}"},
+            })
+        return httpx.Response(404, json={"message": "Not found (stub)"})
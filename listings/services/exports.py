@@ -0,0 +1,85 @@
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from listings.models import Booking, Payment
+
+BOOKING_COLUMNS = [
+    ("id", "id"),
+    ("hotel_id", "hotel_id"),
+    ("hotel", "hotel__name"),
+    ("user", "user__username"),
+    ("check_in_date", "check_in_date"),
+    ("check_out_date", "check_out_date"),
+    ("num_guests", "num_guests"),
+    ("nights", "nights"),
+    ("total_price", "total_price"),
+]
+PAYMENT_COLUMNS = [
+    ("id", "id"),
+    ("booking_id", "booking_id"),
+    ("tx_ref", "tx_ref"),
+    ("status", "status"),
+    ("amount", "amount"),
+    ("currency", "currency"),
+    ("created_at", "created_at"),
+    ("verified_at", "verified_at"),
+]
+
+
+def booking_rows(start=None, end=None):
+    """Bookings checking in within [start, end] (inclusive dates), as value tuples."""
+    queryset = Booking.objects.all()
+    if start:
+        queryset = queryset.filter(check_in_date__gte=start)
+    if end:
+        queryset = queryset.filter(check_in_date__lte=end)
+    return queryset.order_by("check_in_date", "id").values_list(*(field for _, field in BOOKING_COLUMNS))
+
+def payment_rows(start=None, end=None):
+    """Payments created within [start, end] (inclusive dates, current time zone), as value tuples."""
+    queryset = Payment.objects.all()
+    if start:
+        queryset = queryset.filter(created_at__gte=timezone.make_aware(datetime.combine(start, time.min)))
+    if end:
+        queryset = queryset.filter(created_at__lt=timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min)))
+    return queryset.order_by("created_at", "id").values_list(*(field for _, field in PAYMENT_COLUMNS))
+
+
+class _Echo:
+    """File-like object whose write() hands the csv module's output straight back."""
+
+    def write(self, value):
+        return value
+
+def stream_csv(columns, rows, chunk_size):
+    """
+    Yield a header and then the rows as CSV, `chunk_size` rows per piece.
+    `rows` is a queryset iterated with .iterator(), i.e. a server-side cursor
+    where the backend has them, so memory stays flat however many rows there are.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in columns])
+    buffer = []
+    for row in rows.iterator(chunk_size=chunk_size):
+        buffer.append(writer.writerow(row))
+        if len(buffer) >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+def stream_ndjson(columns, rows, chunk_size):
+    """Like stream_csv, one JSON object per line."""
+    names = [name for name, _ in columns]
+    buffer = []
+    for row in rows.iterator(chunk_size=chunk_size):
+        buffer.append(json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder) + "\n")
+        if len(buffer) >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
@@ -0,0 +1,106 @@
+"""
+Currency conversion from the ExchangeRate table. Each process keeps the
+table in memory for FX_RATE_CACHE_SECONDS, then re-reads the rows: converting
+costs no query in between. Every ExchangeRate write (see listings.signals)
+bumps a version in the FX_CACHE cache and drops the writing process's copy at
+once; with a shared cache the version also keys cached responses, but other
+processes only pick the new rates up when their copy expires.
+"""
+import threading
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from listings.models import ExchangeRate
+
+VERSION_KEY = "fx:version"
+
+
+class UnknownCurrency(ValueError):
+    pass
+
+
+def _cache():
+    return caches[getattr(settings, "FX_CACHE", "default")]
+
+def _shared_version():
+    # Seeded from the clock, as hotel_cache does, so an evicted key never
+    # comes back as a number a process has already loaded.
+    cache = _cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+def _incr():
+    cache = _cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+
+def bump_version():
+    """Make every process re-read the table; again on commit, like hotel_cache.bump_version()."""
+    global _table
+    _incr()
+    transaction.on_commit(_incr)
+    _table = (None, 0.0, {})
+
+
+_table = (None, 0.0, {})  # (version, monotonic time loaded, {currency: (rate, exponent)})
+_lock = threading.Lock()
+
+
+def _load():
+    base = settings.PRICE_CURRENCY
+    rates = {base: (Decimal(1), Decimal(1).scaleb(-settings.PRICE_CURRENCY_DECIMAL_PLACES))}
+    for row in ExchangeRate.objects.all():
+        rates[row.currency] = (row.rate, Decimal(1).scaleb(-row.decimal_places))
+    return rates
+
+def table():
+    """
+    (version, {currency: (rate per PRICE_CURRENCY unit, rounding exponent)}),
+    re-read once FX_RATE_CACHE_SECONDS have passed whether or not the version
+    moved: a per-process cache never sees other processes' bumps.
+    """
+    global _table
+    version, loaded_at, rates = _table
+    if version is not None and time.monotonic() - loaded_at < getattr(settings, "FX_RATE_CACHE_SECONDS", 60):
+        return version, rates
+    with _lock:
+        version, loaded_at, rates = _table
+        if version is None or time.monotonic() - loaded_at >= getattr(settings, "FX_RATE_CACHE_SECONDS", 60):
+            _table = (_shared_version(), time.monotonic(), _load())
+        return _table[0], _table[2]
+
+
+class Converter:
+    """Converts amounts in one currency to another at the rate of its table version."""
+
+    def __init__(self, currency, rate, exponent, version):
+        self.currency, self.rate, self.exponent, self.version = currency, rate, exponent, version
+
+    def __call__(self, amount):
+        """Decimal `amount` converted and rounded half up to the target's minor unit."""
+        return (Decimal(amount) * self.rate).quantize(self.exponent, rounding=ROUND_HALF_UP)
+
+    def format(self, amount):
+        return None if amount is None else f"{self(amount):f}"
+
+def converter(currency, source=None):
+    """Converter from `source` (default PRICE_CURRENCY) to `currency`; UnknownCurrency if either has no rate."""
+    version, rates = table()
+    currency, source = currency.upper(), (source or settings.PRICE_CURRENCY).upper()
+    for code in (currency, source):
+        if code not in rates:
+            raise UnknownCurrency(code)
+    (rate, exponent), (source_rate, _) = rates[currency], rates[source]
+    return Converter(currency, rate if source_rate == 1 else rate / source_rate, exponent, version)
+
+def convert(amount, currency, source=None):
+    return converter(currency, source)(amount)
@@ -0,0 +1,149 @@
+import ipaddress
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from django_ip_geolocation.backends import GeolocationBackend
+from django_ip_geolocation.utils import _get_remote_ip_from_request
+
+logger = logging.getLogger(__name__)
+
+# One record per IP range, sorted by start: 16-byte start and end addresses
+# (IPv4 stored IPv6-mapped, so both families share one ordering), then the
+# ISO country code and the continent code.
+RECORD = struct.Struct(">16s16s2s2s")
+
+
+def packed_ip(ip):
+    """16-byte big-endian form of an IPv4/IPv6 address, or None if it isn't one."""
+    try:
+        address = ipaddress.ip_address(ip.strip())
+    except (AttributeError, ValueError):
+        return None
+    if address.version == 4:
+        address = ipaddress.IPv6Address(f"::ffff:{address}")
+    return address.packed
+
+
+class IPRangeDatabase:
+    """
+    Read-only, memory-mapped table of IP ranges (see build_geoip_db).
+    Lookups binary-search the sorted records in place; pages are shared
+    by every worker process through the OS page cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._count = len(self._map) // RECORD.size
+
+    def __len__(self):
+        return self._count
+
+    def lookup(self, ip):
+        """(country_code, continent_code) for `ip`, or None when no range covers it."""
+        key = packed_ip(ip)
+        if key is None:
+            return None
+        data, size = self._map, RECORD.size
+        lo, hi = 0, self._count
+        while lo < hi:  # first record starting after key
+            mid = (lo + hi) // 2
+            if data[mid * size:mid * size + 16] <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return None
+        _, end, country, continent = RECORD.unpack_from(data, (lo - 1) * size)
+        if key > end:
+            return None
+        return country.decode("ascii").strip(), continent.decode("ascii").strip()
+
+
+_databases = {}  # {path: (IPRangeDatabase or None, monotonic time of the last failed open)}
+_databases_lock = threading.Lock()
+
+def get_database(path=None):
+    """
+    The process-wide IPRangeDatabase for `path` (default IP_GEOLOCATION_DATABASE),
+    opened once. None when the file can't be opened; the open is retried at
+    most every IP_GEOLOCATION_RETRY_SECONDS, not on every lookup.
+    """
+    path = path or settings.IP_GEOLOCATION_DATABASE
+    with _databases_lock:
+        database, failed_at = _databases.get(path, (None, None))
+        retry = getattr(settings, "IP_GEOLOCATION_RETRY_SECONDS", 60)
+        if database is None and (failed_at is None or time.monotonic() - failed_at >= retry):
+            try:
+                database, failed_at = IPRangeDatabase(path), None
+            except OSError:
+                logger.warning("Couldn't open the IP range database %s", path, exc_info=True)
+                failed_at = time.monotonic()
+            _databases[path] = (database, failed_at)
+        return database
+
+
+class LocalIPRangeBackend(GeolocationBackend):
+    """django_ip_geolocation backend answering from the local range database; no network."""
+
+    def geolocate(self):
+        database = get_database()
+        if database is None:
+            raise LookupError("IP range database unavailable")
+        found = database.lookup(self._ip)
+        if found:
+            country, continent = found
+            self._raw_data = {"country_code": country, "continent_code": continent}
+
+    def _parse(self):
+        self._continent = self._raw_data.get("continent_code")
+        self._country = {"code": self._raw_data.get("country_code"), "name": None}
+        self._geo_data = None
+
+
+MISS = {}  # cached in place of the data of a failed lookup
+
+def _lookup(ip):
+    backend_cls = import_string(settings.IP_GEOLOCATION_SETTINGS["BACKEND"])
+    backend = backend_cls(ip)
+    backend.geolocate()
+    data = backend.data()
+    data.pop("raw_data", None)
+    return data
+
+def locate_ip(ip):
+    """
+    Geolocation dict for `ip` via the configured backend, cached per IP (with
+    IP_GEOLOCATION_CACHE_TIMEOUT) in the IP_GEOLOCATION_CACHE cache, whose
+    size bound is shared by all workers. None for a malformed IP or a failed
+    lookup; failures are cached for IP_GEOLOCATION_MISS_CACHE_TIMEOUT only,
+    so they aren't retried on every request but don't outlive a short outage.
+    """
+    ip = (ip or "").strip()
+    if packed_ip(ip) is None:
+        return None
+    cache = caches[getattr(settings, "IP_GEOLOCATION_CACHE", "default")]
+    key = f"geoip:{ip}"
+    data = cache.get(key)
+    if data is None:
+        try:
+            data = _lookup(ip)
+        except Exception:
+            logger.warning("Couldn't geolocate %s", ip, exc_info=True)
+            cache.set(key, MISS, getattr(settings, "IP_GEOLOCATION_MISS_CACHE_TIMEOUT", 60))
+            return None
+        cache.set(key, data, getattr(settings, "IP_GEOLOCATION_CACHE_TIMEOUT", 86400))
+    return data or None
+
+def locate_request(request):
+    ip = settings.IP_GEOLOCATION_SETTINGS.get("FORCE_IP_ADDR") or _get_remote_ip_from_request(request)
+    return locate_ip(ip)
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from listings import db_routers
+
+VERSION_KEY = "hotels:version"
+BUMPED_AT_KEY = "hotels:bumped_at"
+
+
+def _cache():
+    return caches[getattr(settings, "HOTEL_CACHE", "default")]
+
+def current_version():
+    # Seeded from the clock so a version key lost to eviction or a restart
+    # never comes back as a number that older entries were stored under.
+    cache = _cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+def _incr():
+    cache = _cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+    cache.set(BUMPED_AT_KEY, time.time(), timeout=None)
+
+def _replica_may_lag():
+    # A replica can still serve pre-write rows for a while after a bump;
+    # responses read from one in that window must not be stored.
+    if not db_routers.reading_from_replica():
+        return False
+    bumped_at = _cache().get(BUMPED_AT_KEY)
+    return bumped_at is not None and time.time() - bumped_at < getattr(settings, "DATABASE_REPLICA_PIN_SECONDS", 0)
+
+def bump_version():
+    """
+    Invalidate every cached hotel response. Bumped right away (so this
+    transaction reads fresh data) and again on commit, evicting anything
+    other requests cached from the pre-commit state in between.
+    """
+    _incr()
+    transaction.on_commit(_incr)
+
+
+def _key(request, action, version):
+    params = sorted(request.query_params.lists())
+    raw = json.dumps([request.build_absolute_uri(request.path), params, request.accepted_media_type])
+    return f"hotels:{version}:{action}:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+def _etag_matches(request, etag):
+    header = request.headers.get("If-None-Match", "")
+    return header.strip() == "*" or etag in [tag.strip() for tag in header.split(",")]
+
+def cached_response(request, action, render):
+    """
+    Serve a hotel read from the cache, keyed by table version, URL, query
+    parameters and negotiated media type. `render()` produces the DRF
+    Response on a miss; only 200s are stored. The strong ETag is a digest of
+    the data, so a matching If-None-Match gets a bodiless 304. With
+    HOTEL_RESPONSE_CACHE off, every read is rendered.
+    """
+    if not getattr(settings, "HOTEL_RESPONSE_CACHE", False):
+        return render()
+    cache = _cache()
+    key = _key(request, action, current_version())
+    entry = cache.get(key)
+    if entry is None:
+        response = render()
+        if response.status_code != status.HTTP_200_OK or _replica_may_lag():
+            return response
+        body = json.dumps(response.data, cls=JSONEncoder, sort_keys=True).encode()
+        digest = hashlib.sha256(body + request.accepted_media_type.encode()).hexdigest()[:32]
+        entry = (f'"{digest}"', response.data)
+        cache.set(key, entry, getattr(settings, "HOTEL_CACHE_TIMEOUT", 300))
+
+    etag, data = entry
+    if _etag_matches(request, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(data, headers={"ETag": etag})
@@ -0,0 +1,91 @@
+from collections import Counter
+from datetime import timedelta
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Least
+
+from listings.models import Booking, Hotel, RoomInventory
+
+
+class NoAvailability(Exception):
+    """Raised when at least one night of a stay has too few rooms left."""
+
+
+def _nights(check_in, check_out):
+    return [check_in + timedelta(days=i) for i in range((check_out - check_in).days)]
+
+
+def _ensure_rows(hotel, nights):
+    """Create missing inventory rows from the hotel's room count; racing inserts are ignored."""
+    RoomInventory.objects.bulk_create(
+        [
+            RoomInventory(hotel=hotel, date=night, total_rooms=hotel.room_count, remaining=hotel.room_count)
+            for night in nights
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def reserve(hotel, check_in, check_out, rooms=1):
+    """
+    Take `rooms` rooms for every night of [check_in, check_out).
+
+    A single conditional UPDATE decrements all nights at once; each row is
+    only touched while `remaining >= rooms`, so concurrent callers contend on
+    row locks for the nights they share and never on the whole table. If any
+    night is short the transaction is rolled back and NoAvailability raised.
+    """
+    nights = _nights(check_in, check_out)
+    if not nights:
+        return
+    with transaction.atomic():
+        _ensure_rows(hotel, nights)
+        updated = RoomInventory.objects.filter(
+            hotel=hotel,
+            date__gte=check_in,
+            date__lt=check_out,
+            remaining__gte=rooms,
+        ).update(remaining=F("remaining") - rooms)
+        if updated != len(nights):
+            raise NoAvailability(f"{hotel} has no {rooms} room(s) left between {check_in} and {check_out}")
+
+
+def release(hotel, check_in, check_out, rooms=1):
+    """Give back rooms taken by `reserve` (booking cancelled or moved)."""
+    RoomInventory.objects.filter(
+        hotel=hotel,
+        date__gte=check_in,
+        date__lt=check_out,
+    ).update(remaining=Least(F("remaining") + rooms, F("total_rooms")))
+
+
+def rebuild(hotel_ids=None, batch_size=5000):
+    """
+    Recompute inventory rows from bookings, one hotel at a time so memory stays
+    bounded by a single hotel's calendar. Used after bulk loads that bypass reserve().
+    """
+    hotels = Hotel.objects.all()
+    if hotel_ids is not None:
+        hotels = hotels.filter(id__in=hotel_ids)
+    rooms = dict(hotels.values_list("id", "room_count"))
+
+    stays = (
+        Booking._base_manager.filter(hotel__in=hotels)
+        .order_by("hotel_id")
+        .values_list("hotel_id", "check_in_date", "check_out_date")
+        .iterator(chunk_size=batch_size)
+    )
+    with transaction.atomic():
+        RoomInventory.objects.filter(hotel_id__in=hotels.values("id")).delete()
+        for hotel_id, hotel_stays in groupby(stays, key=lambda row: row[0]):
+            sold = Counter(night for _, check_in, check_out in hotel_stays for night in _nights(check_in, check_out))
+            RoomInventory.objects.bulk_create(
+                (
+                    RoomInventory(hotel_id=hotel_id, date=night, total_rooms=rooms[hotel_id],
+                                  remaining=max(rooms[hotel_id] - count, 0))
+                    for night, count in sold.items()
+                ),
+                batch_size=batch_size,
+            )
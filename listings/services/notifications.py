@@ -0,0 +1,11 @@
+from listings.services import outbox
+
+
+def queue_booking_confirmations(booking_ids):
+    """
+    Record booking.created outbox events for these bookings; their
+    confirmation emails go out in batches once the relay picks the events up
+    after commit. A rollback drops them along with the bookings.
+    """
+    outbox.bookings_created(booking_ids)
+
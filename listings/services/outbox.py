@@ -0,0 +1,131 @@
+"""
+Transactional outbox. Side effects are recorded as OutboxEvent rows in the
+transaction that makes the change they describe, so an event exists exactly
+when its change committed and requests never talk to the broker. The relay
+(tasks.relay_outbox, on CELERY_BEAT_SCHEDULE) hands pending events to Celery
+one batch per message; workers run the handlers registered below
+(tasks.process_outbox_events).
+
+Delivery is at least once: a batch that was dispatched but never processed
+(lost message, worker crash, failing handler) is dispatched again after
+OUTBOX_REDELIVER_SECONDS, and processing skips events already processed.
+Handlers run outside any transaction, and each handler call's events are
+marked processed as soon as it returns, so a failure only repeats the call
+that failed.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from listings.models import OutboxEvent, Payment
+
+BOOKING_CREATED = "booking.created"
+PAYMENT_STATUS = "payment.status"  # no handler yet: recorded for consumers to come
+
+_handlers = {}
+
+
+def handler(topic, batch_size=None):
+    """
+    Register fn(payloads) to process the `topic` events of a batch, at most
+    batch_size() of them per call (all in one call when None).
+    """
+    def register(fn):
+        _handlers[topic] = (fn, batch_size)
+        return fn
+    return register
+
+def record(events):
+    """
+    Write (topic, key, payload) events; keys already recorded are skipped.
+    Call inside the transaction that makes the change.
+    """
+    OutboxEvent.objects.bulk_create(
+        [OutboxEvent(topic=topic, key=key, payload=payload) for topic, key, payload in events],
+        ignore_conflicts=True,
+    )
+
+def bookings_created(booking_ids):
+    record((BOOKING_CREATED, f"{BOOKING_CREATED}:{i}", {"booking_id": i}) for i in booking_ids)
+
+def payment_status_changed(payments):
+    """
+    One event per payment and status it reaches under a tx_ref; repeated
+    verifications, and payments still PENDING, add nothing.
+    """
+    record(
+        (PAYMENT_STATUS, f"{PAYMENT_STATUS}:{p.tx_ref}:{p.status}",
+         {"payment_id": p.id, "booking_id": p.booking_id, "status": p.status})
+        for p in payments if p.status != Payment.Status.PENDING
+    )
+
+
+def pending(now=None):
+    """Unprocessed events not dispatched yet, or dispatched too long ago to still be in flight."""
+    cutoff = (now or timezone.now()) - timedelta(seconds=getattr(settings, "OUTBOX_REDELIVER_SECONDS", 300))
+    return (
+        OutboxEvent.objects.filter(processed_at__isnull=True)
+        .filter(Q(dispatched_at__isnull=True) | Q(dispatched_at__lt=cutoff))
+        .order_by("id")
+    )
+
+def relay(publish, batch_size=None):
+    """
+    Drain pending events: `publish(event_ids)` once per batch of
+    OUTBOX_BATCH_SIZE, marking the batch dispatched in the same transaction.
+    A failed publish leaves the batch pending. Concurrent relays skip each
+    other's rows. Returns the number of events dispatched.
+    """
+    batch_size = batch_size or getattr(settings, "OUTBOX_BATCH_SIZE", 500)
+    dispatched = 0
+    while True:
+        with transaction.atomic():
+            now = timezone.now()
+            ids = list(pending(now).select_for_update(skip_locked=True).values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            publish(ids)
+            OutboxEvent.objects.filter(id__in=ids).update(dispatched_at=now)
+        dispatched += len(ids)
+        if len(ids) < batch_size:
+            break
+    return dispatched
+
+def process(event_ids):
+    """
+    Run the handlers for these events, topic by topic in chunks of the
+    handler's batch_size, marking each chunk processed once its call returns.
+    Already processed events are skipped. A failing call raises, leaving its
+    chunk and the ones after it for redelivery. Returns the number of events
+    processed.
+    """
+    events = defaultdict(list)
+    for event in (
+        OutboxEvent.objects.filter(id__in=event_ids, processed_at__isnull=True)
+        .order_by("id")
+        .only("id", "topic", "payload")
+    ):
+        events[event.topic].append(event)
+
+    processed = 0
+    for topic, batch in events.items():
+        fn, batch_size = _handlers.get(topic, (None, None))
+        size = (batch_size and batch_size()) or len(batch)
+        for start in range(0, len(batch), size):
+            chunk = batch[start:start + size]
+            if fn is not None:
+                fn([event.payload for event in chunk])
+            processed += OutboxEvent.objects.filter(
+                id__in=[event.id for event in chunk], processed_at__isnull=True
+            ).update(processed_at=timezone.now())
+    return processed
+
+def purge():
+    """Delete events processed more than OUTBOX_RETENTION_SECONDS ago; returns how many."""
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, "OUTBOX_RETENTION_SECONDS", 7 * 24 * 3600))
+    deleted, _ = OutboxEvent.objects.filter(processed_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,226 @@
+import asyncio
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from listings.models import Booking, Payment, ProviderCall
+from listings.services import chapa, fx, outbox, rates, revenue
+
+# Chapa verify statuses that end a checkout without payment
+FAILED_OUTCOMES = {"failed", "cancelled"}
+
+# Fields written back after a provider verification
+VERIFY_FIELDS = ["status", "chapa_ref_id", "verified_at", "completed_at", "updated_at"]
+
+
+# Outcomes of claim_initiation()
+START = "start"        # this request must call Chapa
+REUSE = "reuse"        # a live checkout_url already exists
+BUSY = "busy"          # another request is calling Chapa right now
+PAID = "paid"          # nothing left to pay
+REPLAY_FAILED = "replay_failed"  # same Idempotency-Key as a failed attempt
+CHECKOUT_OPEN = "checkout_open"  # a live checkout_url charges another price
+
+
+def _init_lease():
+    return timedelta(seconds=getattr(settings, "PAYMENT_INIT_LEASE_SECONDS", 35))
+
+def claim_initiation(booking, currency, idempotency_key=None):
+    """
+    Decide, under a row lock on the booking, whether this request may call
+    chapa.initialize. The lock is only held for these few statements: the
+    winner records `init_started_at` and commits before talking to Chapa, so
+    concurrent or retried requests see the claim (or the stored checkout_url)
+    and never trigger a second provider call. The booking's price is charged
+    converted into `currency`, which must have a rate (services.fx). A live
+    checkout for another amount (the booking changed) or currency is neither
+    reused nor replaced: the guest could still pay on it, under a tx_ref
+    nothing would verify any more.
+    Returns (outcome, payment).
+    """
+    now = timezone.now()
+
+    def price():
+        return fx.convert(rates.booking_amount(booking), currency)
+
+    try:
+        with transaction.atomic():
+            Booking._base_manager.select_for_update().get(pk=booking.pk)
+            payment = Payment.objects.filter(booking=booking).first()
+
+            if payment is None:
+                payment = Payment.objects.create(
+                    booking=booking,
+                    tx_ref=chapa.generate_tx_ref(prefix=f"booking-{booking.id}"),
+                    amount=price(),
+                    currency=currency,
+                    status=Payment.Status.PENDING,
+                    idempotency_key=idempotency_key,
+                    init_started_at=now,
+                )
+                return START, payment
+
+            if payment.status == Payment.Status.COMPLETED:
+                return PAID, payment
+            if idempotency_key and idempotency_key == payment.idempotency_key and payment.status == Payment.Status.FAILED:
+                return REPLAY_FAILED, payment
+            if payment.status == Payment.Status.PENDING:
+                if payment.checkout_url:
+                    same_price = payment.currency == currency and payment.amount == price()
+                    return (REUSE if same_price else CHECKOUT_OPEN), payment
+                if payment.init_started_at and now - payment.init_started_at < _init_lease():
+                    return BUSY, payment
+
+            # Failed, or a claim abandoned before any checkout_url was stored:
+            # retried under a fresh tx_ref and price if that changed.
+            amount = price()
+            if payment.status == Payment.Status.FAILED or (payment.amount, payment.currency) != (amount, currency):
+                payment.tx_ref = chapa.generate_tx_ref(prefix=f"booking-{booking.id}")
+                payment.status = Payment.Status.PENDING
+                payment.amount = amount
+                payment.currency = currency
+                payment.checkout_url = ""
+            payment.idempotency_key = idempotency_key
+            payment.init_started_at = now
+            payment.save(update_fields=["tx_ref", "status", "amount", "currency", "checkout_url",
+                                        "idempotency_key", "init_started_at", "updated_at"])
+            return START, payment
+    except IntegrityError:
+        # Lost the race to create the payment row (no row lock to wait on yet).
+        return BUSY, Payment.objects.get(booking=booking)
+
+def apply_verify_response(payment, verify_resp):
+    """
+    Copy the outcome of a Chapa verify call onto `payment`. Neither is saved:
+    returns the ProviderCall audit row for the caller to store alongside.
+    Only an explicit failure fails the payment; a checkout that is still
+    open or not paid yet keeps its status and is just marked as checked.
+    """
+    data = verify_resp.get("data") or {}
+    outcome = str(data.get("status", "")).lower()
+    now = timezone.now()
+
+    if outcome == "success":
+        if payment.status != Payment.Status.COMPLETED:
+            payment.completed_at = now
+        payment.status = Payment.Status.COMPLETED
+        payment.chapa_ref_id = data.get("reference") or data.get("ref_id") or ""
+    elif outcome in FAILED_OUTCOMES:
+        payment.status = Payment.Status.FAILED
+        payment.completed_at = None
+    payment.verified_at = payment.updated_at = now
+    return ProviderCall.build(payment, ProviderCall.Kind.VERIFY, verify_resp)
+
+def save_verification(payment, verify_resp):
+    """
+    Apply a Chapa verify response to the payment's row, locked and re-read,
+    and store it with its audit row, the revenue summary change and its
+    status event in one transaction, so concurrent verifications of one payment count it once.
+    Only VERIFY_FIELDS are written. A response for a tx_ref the payment has
+    moved on from (re-initiated meanwhile) is only audited.
+    Returns the payment as stored.
+    """
+    with transaction.atomic():
+        # Lock with a write rather than select_for_update(): on SQLite two
+        # transactions that read first can't both upgrade to writing.
+        if not Payment.objects.filter(pk=payment.pk, tx_ref=payment.tx_ref).update(updated_at=timezone.now()):
+            ProviderCall.build(payment, ProviderCall.Kind.VERIFY, verify_resp).save()
+            return payment
+        current = Payment.objects.get(pk=payment.pk)
+        completed_before = current.completed_at
+        call = apply_verify_response(current, verify_resp)
+        current.save(update_fields=VERIFY_FIELDS)
+        call.save()
+        revenue.record_changes([(current, completed_before)])
+        outbox.payment_status_changed([current])
+    return current
+
+def save_init_failure(payment, call):
+    """Store a payment whose Chapa initialization failed, with its audit row and status event."""
+    with transaction.atomic():
+        payment.save()
+        call.save()
+        outbox.payment_status_changed([payment])
+
+def is_recently_verified(payment):
+    """
+    True when a COMPLETED status came from Chapa recently enough to serve
+    as-is. Any other status may still change, so it is always re-checked.
+    """
+    if payment.status != Payment.Status.COMPLETED or payment.verified_at is None:
+        return False
+    max_age = getattr(settings, "PAYMENT_VERIFY_CACHE_SECONDS", 60)
+    return timezone.now() - payment.verified_at < timedelta(seconds=max_age)
+
+def stale_pending_payments():
+    """Pending payments nobody has confirmed for a while, oldest id first."""
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, "PAYMENT_RECONCILE_AFTER_SECONDS", 600))
+    return Payment.objects.filter(status=Payment.Status.PENDING, updated_at__lt=cutoff).order_by("id")
+
+async def _verify_all(tx_refs, concurrency):
+    """Verify tx_refs concurrently, at most `concurrency` calls in flight; None marks a failed call."""
+    client = chapa.get_async_client()
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(tx_ref):
+        async with gate:
+            try:
+                return await client.verify(tx_ref)
+            except Exception:
+                return None
+
+    return await asyncio.gather(*(one(tx_ref) for tx_ref in tx_refs))
+
+def reconcile_pending(batch_size=None, concurrency=None):
+    """
+    Verify stale pending payments with Chapa in chunks and write the results
+    back with one bulk_update per chunk. Calls that fail are left for the next
+    run, as are payments verified or re-initiated while Chapa answered: only
+    rows still PENDING under the same tx_ref are written. Returns (checked, updated).
+    """
+    batch_size = batch_size or getattr(settings, "PAYMENT_RECONCILE_BATCH_SIZE", 500)
+    concurrency = concurrency or getattr(settings, "PAYMENT_RECONCILE_CONCURRENCY", 20)
+
+    # DB work stays on this thread; one private loop (and one Chapa pool)
+    # serves the HTTP fan-out of every chunk.
+    loop = asyncio.new_event_loop()
+    checked = updated = 0
+    last_id = 0
+    try:
+        while True:
+            chunk = list(
+                stale_pending_payments()
+                .filter(id__gt=last_id)
+                .only("id", "booking_id", "tx_ref", "status", "amount", "currency", "chapa_ref_id",
+                      "completed_at")[:batch_size]
+            )
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            results = loop.run_until_complete(_verify_all([p.tx_ref for p in chunk], concurrency))
+
+            answered = [(p, r) for p, r in zip(chunk, results) if r is not None]
+            with transaction.atomic():
+                unchanged = dict(
+                    Payment.objects.select_for_update(skip_locked=True)
+                    .filter(id__in=[p.id for p, _ in answered], status=Payment.Status.PENDING)
+                    .values_list("id", "tx_ref")
+                )
+                verified, calls, changes = [], [], []
+                for payment, verify_resp in answered:
+                    if unchanged.get(payment.id) == payment.tx_ref:
+                        changes.append((payment, payment.completed_at))
+                        calls.append(apply_verify_response(payment, verify_resp))
+                        verified.append(payment)
+                Payment.objects.bulk_update(verified, VERIFY_FIELDS)
+                ProviderCall.objects.bulk_create(calls)
+                revenue.record_changes(changes)
+                outbox.payment_status_changed(verified)
+            checked += len(chunk)
+            updated += len(verified)
+    finally:
+        loop.run_until_complete(chapa.close_async_client())
+        loop.close()
+    return checked, updated
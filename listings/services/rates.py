@@ -0,0 +1,76 @@
+"""
+Nightly rates. A night costs the price of the RateRule with the highest
+priority (then the newest) covering it, or Hotel.price_per_night when none
+does. quote() prices one stay for many hotels at once: the rules of every
+candidate come in with one query and are resolved on a hotel x night grid
+with NumPy. Amounts are integer cents throughout, so totals are exact.
+"""
+from decimal import Decimal
+
+import numpy as np
+
+from listings.models import Booking, RateRule
+
+
+def _cents(amount):
+    return int(amount * 100)  # DecimalField(decimal_places=2): exact
+
+def quote(hotels, check_in, check_out):
+    """{hotel id: price of the nights [check_in, check_out)} for these Hotel instances."""
+    hotels = list(hotels)
+    nights = (check_out - check_in).days
+    if nights <= 0:
+        return {hotel.id: Decimal("0.00") for hotel in hotels}
+
+    row_of = {hotel.id: row for row, hotel in enumerate(hotels)}
+    grid = np.repeat(np.array([_cents(h.price_per_night) for h in hotels], dtype=np.int64)[:, None], nights, axis=1)
+
+    rules = list(
+        RateRule.objects.filter(hotel_id__in=row_of, start_date__lt=check_out, end_date__gt=check_in)
+        .order_by("priority", "id")  # ascending precedence
+        .values_list("hotel_id", "start_date", "end_date", "weekdays", "price_per_night")
+    )
+    if rules:
+        rows = np.array([row_of[r[0]] for r in rules])
+        first = np.array([(r[1] - check_in).days for r in rules])[:, None]
+        stop = np.array([(r[2] - check_in).days for r in rules])[:, None]
+        weekdays = np.array([r[3] for r in rules])[:, None]
+        prices = np.array([_cents(r[4]) for r in rules], dtype=np.int64)
+
+        night = np.arange(nights)
+        weekday = (check_in.weekday() + night) % 7
+        # covers[i, n]: rule i applies to night n; rank is its precedence + 1.
+        covers = (night >= first) & (night < stop) & ((weekdays >> weekday) & 1).astype(bool)
+        rank = np.where(covers, np.arange(1, len(rules) + 1)[:, None], 0)
+        winner = np.zeros(grid.shape, dtype=np.int64)
+        np.maximum.at(winner, rows, rank)
+        grid = np.where(winner > 0, prices[winner - 1], grid)
+
+    return {hotel.id: Decimal(int(total)).scaleb(-2) for hotel, total in zip(hotels, grid.sum(axis=1))}
+
+def price_stay(hotel, check_in, check_out):
+    return quote([hotel], check_in, check_out)[hotel.id]
+
+def price_bookings(bookings):
+    """
+    Set quoted_total on unsaved bookings, with one quote() per distinct stay
+    for all the hotels booked for it.
+    """
+    stays = {}
+    for booking in bookings:
+        stays.setdefault((booking.check_in_date, booking.check_out_date), []).append(booking)
+    for (check_in, check_out), group in stays.items():
+        totals = quote({b.hotel_id: b.hotel for b in group}.values(), check_in, check_out)
+        for booking in group:
+            booking.quoted_total = totals[booking.hotel_id]
+
+def booking_amount(booking):
+    """
+    What to charge for `booking`: its quoted_total, quoted (and stored) now
+    for bookings made before rates.
+    """
+    if booking.quoted_total is None:
+        booking.quoted_total = price_stay(booking.hotel, booking.check_in_date, booking.check_out_date)
+        Booking._base_manager.filter(pk=booking.pk).update(quoted_total=booking.quoted_total)
+        booking.total_price = booking.quoted_total
+    return booking.quoted_total
@@ -0,0 +1,114 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from listings.models import Booking, HotelDaySummary, NightsBetween, Payment
+
+SUMS = ("bookings", "nights_sold", "guests", "revenue")
+
+
+def _apply(totals):
+    """
+    Add each (bookings, nights_sold, guests, revenue) delta in `totals` to its
+    summary row. Missing rows are inserted empty first, racing inserts ignored,
+    so the increments below always find their row.
+    """
+    HotelDaySummary.objects.bulk_create(
+        [HotelDaySummary(hotel_id=hotel_id, date=day, currency=currency) for hotel_id, day, currency in totals],
+        ignore_conflicts=True,
+    )
+    for (hotel_id, day, currency), deltas in sorted(totals.items()):  # fixed lock order
+        HotelDaySummary.objects.filter(hotel_id=hotel_id, date=day, currency=currency).update(
+            **{field: F(field) + delta for field, delta in zip(SUMS, deltas)}
+        )
+
+def record_changes(changes):
+    """
+    Fold verification outcomes into the daily summaries. `changes` holds
+    (payment, completed_at before verification) pairs: payments that just
+    became COMPLETED are added under their completion day, and ones that
+    stopped being COMPLETED are taken back out of the day they counted in.
+    Call inside the transaction that saves the payments.
+    """
+    moves = []
+    for payment, completed_before in changes:
+        completed = payment.status == Payment.Status.COMPLETED
+        if completed and completed_before is None:
+            moves.append((payment, payment.completed_at, 1))
+        elif not completed and completed_before is not None:
+            moves.append((payment, completed_before, -1))
+    if not moves:
+        return
+
+    stays = (
+        Booking._base_manager.only("hotel_id", "num_guests", "check_in_date", "check_out_date")
+        .in_bulk([payment.booking_id for payment, _, _ in moves])
+    )
+    totals = defaultdict(lambda: [0, 0, 0, Decimal(0)])
+    for payment, at, sign in moves:
+        booking = stays[payment.booking_id]
+        row = totals[booking.hotel_id, timezone.localdate(at), payment.currency]
+        row[0] += sign
+        row[1] += sign * max((booking.check_out_date - booking.check_in_date).days, 0)
+        row[2] += sign * booking.num_guests
+        row[3] += sign * payment.amount
+    with transaction.atomic(savepoint=False):
+        _apply(totals)
+
+
+def rebuild(hotel_ids=None, start=None, end=None, batch_size=5000):
+    """
+    Recompute the summaries from completed payments, optionally for some
+    hotels and/or completion days in [start, end]. Returns the rows written.
+    """
+    summaries = HotelDaySummary.objects.all()
+    completed = Payment.objects.filter(status=Payment.Status.COMPLETED, completed_at__isnull=False)
+    if hotel_ids is not None:
+        summaries = summaries.filter(hotel_id__in=hotel_ids)
+        completed = completed.filter(booking__hotel_id__in=hotel_ids)
+    if start:
+        summaries = summaries.filter(date__gte=start)
+        completed = completed.filter(completed_at__date__gte=start)
+    if end:
+        summaries = summaries.filter(date__lte=end)
+        completed = completed.filter(completed_at__date__lte=end)
+
+    nights = Greatest(NightsBetween("booking__check_in_date", "booking__check_out_date"), Value(0))
+    rows = (
+        completed.annotate(day=TruncDate("completed_at"))
+        .values("booking__hotel_id", "day", "currency")
+        .annotate(bookings=Count("id"), nights_sold=Sum(nights), guests=Sum("booking__num_guests"),
+                  revenue=Sum("amount"))
+        .order_by()
+    )
+    with transaction.atomic():
+        summaries.delete()
+        created = HotelDaySummary.objects.bulk_create(
+            (
+                HotelDaySummary(hotel_id=row["booking__hotel_id"], date=row["day"], currency=row["currency"],
+                                **{field: row[field] for field in SUMS})
+                for row in rows
+            ),
+            batch_size=batch_size,
+        )
+    return len(created)
+
+def report(start=None, end=None, hotel_id=None, by="day"):
+    """Summary totals over [start, end] grouped by day or by hotel, and by currency."""
+    rows = HotelDaySummary.objects.all()
+    if start:
+        rows = rows.filter(date__gte=start)
+    if end:
+        rows = rows.filter(date__lte=end)
+    if hotel_id:
+        rows = rows.filter(hotel_id=hotel_id)
+    group = ["date"] if by == "day" else ["hotel_id", "hotel__name"]
+    return (
+        rows.values(*group, "currency")
+        .annotate(**{field: Sum(field) for field in SUMS})
+        .order_by(*group, "currency")
+    )
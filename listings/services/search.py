@@ -0,0 +1,94 @@
+"""
+Indexed hotel search over name and location.
+
+PostgreSQL: a GIN index on a 'simple' tsvector plus pg_trgm GIN indexes for
+fuzzy/substring matches. SQLite: an external-content FTS5 table with the
+trigram tokenizer, kept in sync with listings_hotel by triggers. Other
+backends fall back to LIKE scans. The indexes are created by migration 0008.
+"""
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "listings_hotel_fts"
+PG_VECTOR = "to_tsvector('simple', name || ' ' || location)"
+
+SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_ai": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON listings_hotel BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, location) VALUES (new.id, new.name, new.location);
+        END""",
+    f"{FTS_TABLE}_ad": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON listings_hotel BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, location)
+            VALUES ('delete', old.id, old.name, old.location);
+        END""",
+    f"{FTS_TABLE}_au": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, location ON listings_hotel BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, location)
+            VALUES ('delete', old.id, old.name, old.location);
+            INSERT INTO {FTS_TABLE}(rowid, name, location) VALUES (new.id, new.name, new.location);
+        END""",
+}
+
+
+def ensure_sqlite_index(connection):
+    """
+    (Re)create the FTS5 table and its triggers (installed by migration 0008),
+    rebuilding the index if any were missing. Run after every migrate:
+    SQLite migrations that remake listings_hotel drop the triggers along with
+    the old table.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name IN (%s, 'listings_hotel') "
+            "OR (type = 'trigger' AND tbl_name = 'listings_hotel')",
+            [FTS_TABLE],
+        )
+        present = {row[0] for row in cursor.fetchall()}
+        if "listings_hotel" not in present or present >= {FTS_TABLE, *SQLITE_TRIGGERS}:
+            return
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "name, location, content='listings_hotel', content_rowid='id', tokenize='trigram')"
+        )
+        for sql in SQLITE_TRIGGERS.values():
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def _fts5_query(term):
+    # The trigram tokenizer needs 3+ characters; each word must occur as a substring.
+    words = [w for w in term.split() if len(w) >= 3]
+    return " AND ".join('"%s"' % w.replace('"', '""') for w in words)
+
+def search(queryset, term, vendor):
+    """Filter `queryset` to hotels matching `term`, best matches first (annotated `search_rank`)."""
+    term = " ".join(term.split())
+    if not term:
+        return queryset.none()
+
+    if vendor == "postgresql":
+        rank = RawSQL(
+            f"ts_rank({PG_VECTOR}, plainto_tsquery('simple', %s)) "
+            "+ greatest(similarity(name, %s), similarity(location, %s))",
+            [term, term, term],
+            output_field=FloatField(),
+        )
+        matches = RawSQL(
+            f"{PG_VECTOR} @@ plainto_tsquery('simple', %s) OR name %% %s OR location %% %s",
+            [term, term, term],
+            output_field=BooleanField(),
+        )
+        return queryset.filter(matches).annotate(search_rank=rank).order_by("-search_rank", "-id")
+
+    match = _fts5_query(term) if vendor == "sqlite" else ""
+    if match:
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = listings_hotel.id", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+            select={"search_rank": f"-bm25({FTS_TABLE})"},
+        ).order_by("-search_rank", "-id")
+
+    # Terms too short for trigrams, or no index on this backend.
+    return queryset.filter(Q(name__icontains=term) | Q(location__icontains=term)).order_by("-id")
@@ -0,0 +1,26 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ExchangeRate, Hotel
+from .services import fx, hotel_cache, search
+
+
+@receiver(post_save, sender=Hotel)
+@receiver(post_delete, sender=Hotel)
+def invalidate_hotel_responses(sender, **kwargs):
+    # API, admin and shell edits alike; bulk_create()/update() callers bump themselves.
+    hotel_cache.bump_version()
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+def invalidate_fx_rates(sender, **kwargs):
+    # loaddata included: every process re-reads the table on its next check.
+    fx.bump_version()
+
+
+def repair_search_index(using, **kwargs):
+    # Connected to post_migrate in ListingsConfig.ready().
+    connection = connections[using]
+    if connection.vendor == "sqlite":
+        search.ensure_sqlite_index(connection)
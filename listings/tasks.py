@@ -1,16 +1,56 @@
 from celery import shared_task
-from django.core.mail import send_mail
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
 from .models import Booking
+from .services import outbox, payments
+
+
+def _confirmation_message(booking):
+    subject = f"Booking Confirmation for {booking.hotel.name}"
+    message = f"Dear {booking.user.username},\n\nThank you for your booking at {booking.hotel.name}.\n\n"
+    return EmailMessage(subject, message, settings.DEFAULT_FROM_EMAIL, [booking.user.email])
+
+def _send_confirmations(booking_ids):
+    """
+    Load the bookings with one joined query (Booking.objects brings hotel and
+    user along) and send every message over a single mail connection.
+    Returns (sent booking ids, missing booking ids).
+    """
+    bookings = list(Booking.objects.filter(id__in=booking_ids))
+    found = {b.id for b in bookings}
+    sendable = [b for b in bookings if b.user.email]
+    if sendable:
+        with get_connection() as connection:
+            connection.send_messages([_confirmation_message(b) for b in sendable])
+    return [b.id for b in sendable], [i for i in booking_ids if i not in found]
+
+@outbox.handler(outbox.BOOKING_CREATED, batch_size=lambda: getattr(settings, "BOOKING_EMAIL_BATCH_SIZE", 200))
+def _confirm_bookings(payloads):
+    _send_confirmations([p["booking_id"] for p in payloads])
 
 @shared_task
 def send_booking_confirmation_email(booking_id):
-    try:
-        booking = Booking.objects.get(id=booking_id)
-        subject = f"Booking Confirmation for {booking.hotel.name}"
-        message = f"Dear {booking.user.username},\n\nThank you for your booking at {booking.hotel.name}.\n\n"
-        from_email = 'no-reply@alxtravelapp.com'
-        recipient_list = [booking.user.email]
-        send_mail(subject, message, from_email, recipient_list)
-        return f"Confirmation email sent for booking ID {booking_id}"
-    except Booking.DoesNotExist:
+    sent, missing = _send_confirmations([booking_id])
+    if missing:
         return f"Booking with ID {booking_id} not found."
+    return f"Confirmation email sent for booking ID {booking_id}"
+
+
+@shared_task
+def reconcile_pending_payments():
+    """Periodic (see CELERY_BEAT_SCHEDULE): confirm stale PENDING payments with Chapa in bulk."""
+    checked, updated = payments.reconcile_pending()
+    return f"Reconciled {updated} of {checked} pending payment(s)"
+
+
+@shared_task
+def relay_outbox():
+    """Periodic (see CELERY_BEAT_SCHEDULE): hand pending outbox events to workers, one message per batch."""
+    dispatched = outbox.relay(process_outbox_events.delay)
+    purged = outbox.purge()
+    return f"Dispatched {dispatched} outbox event(s); purged {purged}"
+
+@shared_task
+def process_outbox_events(event_ids):
+    processed = outbox.process(event_ids)
+    return f"Processed {processed} of {len(event_ids)} outbox event(s)"
@@ -0,0 +1,24 @@
+from django.test import override_settings
+
+
+def query_budget_enforced():
+    """
+    Decorator / context manager for tests: turns on QueryInstrumentationMiddleware
+    and makes any view exceeding its declared `query_budget` raise
+    QueryBudgetExceeded, which fails the test. Use a client created inside it.
+
+        @query_budget_enforced()
+        def test_bookings_list(db): ...
+    """
+    return override_settings(QUERY_INSTRUMENTATION=True, QUERY_BUDGET_ENFORCE=True)
+
+
+def assert_query_budget(response, budget=None):
+    """Fail unless `response` stayed within `budget` (default: the view's declared one)."""
+    stats = getattr(response, "query_stats", None)
+    assert stats is not None, "QueryInstrumentationMiddleware did not run; use query_budget_enforced()"
+    budget = stats["budget"] if budget is None else budget
+    assert budget is not None, f"{stats['view']} declares no query_budget"
+    assert stats["queries"] <= budget, (
+        f"{stats['view']} ran {stats['queries']} queries (budget {budget}); slowest: {stats['slowest_sql']}"
+    )
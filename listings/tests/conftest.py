@@ -0,0 +1,19 @@
+# listings/tests/conftest.py
+import pytest
+from listings.services import chapa
+from listings.services.chapa_stub import ChapaStub
+
+
+@pytest.fixture
+def eager_celery(settings):
+    # Read through by the Celery app configured from Django settings (namespace CELERY).
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+@pytest.fixture
+def stub(settings):
+    """Chapa answered by an in-process ChapaStub, returned for inspection."""
+    settings.CHAPA_SECRET_KEY = "CHASECK_TEST-stub"
+    stub = ChapaStub()
+    chapa.configure(**stub.transports())
+    yield stub
+    chapa.configure()
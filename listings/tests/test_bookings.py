@@ -0,0 +1,86 @@
+# listings/tests/test_bookings.py
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from listings.models import Hotel, Booking, RoomInventory
+from listings.tasks import relay_outbox
+
+User = get_user_model()
+
+
+def create_user(username="u1", password="pass123", email="u1@example.com"):
+    return User.objects.create_user(username=username, password=password, email=email)
+
+def create_bookings(user, n):
+    hotels = Hotel.objects.bulk_create(
+        Hotel(name=f"Hotel {i}", location="Addis Ababa", price_per_night=Decimal("120.50")) for i in range(n)
+    )
+    return Booking.objects.bulk_create(
+        Booking(user=user, hotel=h, check_in_date=date(2025, 9, 1), check_out_date=date(2025, 9, 4), num_guests=2)
+        for h in hotels
+    )
+
+def test_totals_are_annotated_in_sql(db):
+    user = create_user()
+    create_bookings(user, 1)
+    booking = Booking.objects.get()
+    assert booking.nights == 3
+    assert booking.total_price == Decimal("361.50")
+    assert "_total_price" in booking.__dict__
+
+def test_bookings_list_query_count_is_constant(db):
+    user = create_user()
+    client = APIClient()
+    client.force_authenticate(user)
+    url = reverse("booking-list")
+
+    create_bookings(user, 2)
+    with CaptureQueriesContext(connection) as few:
+        client.get(url)
+    create_bookings(user, 20)
+    with CaptureQueriesContext(connection) as many:
+        resp = client.get(url)
+
+    assert resp.status_code == 200
+    assert len(resp.json()) == 22
+    assert resp.json()[0]["total_price"] == "361.50"
+    assert len(many) == len(few)
+
+def test_bulk_create_reports_per_item_and_emails_once(db, eager_celery):
+    user = create_user()
+    big = Hotel.objects.create(name="Big", location="Addis Ababa", price_per_night=100, room_count=5)
+    single = Hotel.objects.create(name="Single", location="Gondar", price_per_night=80, room_count=1)
+    client = APIClient()
+    client.force_authenticate(user)
+    stay = {"check_in_date": "2025-10-01", "check_out_date": "2025-10-03", "num_guests": 2}
+    items = [
+        {"hotel": big.id, **stay},
+        {"hotel": single.id, **stay},
+        {"hotel": single.id, **stay},  # the only room is gone by now
+        {"hotel": 999999, **stay},
+        {"hotel": big.id, **stay, "check_out_date": "2025-09-30"},
+        {"hotel": big.id, **stay, "num_guests": 1},
+    ]
+
+    with CaptureQueriesContext(connection) as queries:
+        resp = client.post(reverse("booking-bulk"), items, format="json")
+    assert resp.status_code == 207
+    assert [r["status"] for r in resp.json()] == [201, 201, 409, 400, 400, 201]
+    assert resp.json()[0]["booking"]["total_price"] == "200.00"
+    assert "hotel" in resp.json()[3]["errors"]
+    assert sum("listings_hotel" in q["sql"] and "INSERT" not in q["sql"] for q in queries.captured_queries) == 1
+
+    assert Booking.objects.filter(user=user).count() == 3
+    assert RoomInventory.objects.get(hotel=single, date=date(2025, 10, 1)).remaining == 0
+    assert mail.outbox == []  # nothing reaches the broker during the request
+    assert relay_outbox() == "Dispatched 3 outbox event(s); purged 0"
+    assert len(mail.outbox) == 3
+
+    resp = client.post(reverse("booking-bulk"), {"hotel": big.id}, format="json")
+    assert resp.status_code == 400
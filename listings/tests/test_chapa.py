@@ -0,0 +1,43 @@
+# listings/tests/test_chapa.py
+import asyncio
+
+import pytest
+from listings.services import chapa
+from listings.services.chapa_stub import ChapaStub
+
+INIT_KWARGS = dict(amount=100, currency="ETB", email="u1@example.com", first_name="U", last_name="One", tx_ref="tx-1")
+
+
+@pytest.fixture(autouse=True)
+def chapa_key(settings):
+    settings.CHAPA_SECRET_KEY = "CHASECK_TEST-stub"
+
+def test_sync_client_against_stub_transport():
+    with chapa.ChapaClient(transport=ChapaStub().transports()["transport"]) as client:
+        resp = client.initialize(**INIT_KWARGS)
+        assert resp["data"]["checkout_url"].endswith("/tx-1")
+        assert client.verify("tx-1")["data"]["status"] == "success"
+
+    with chapa.ChapaClient(transport=ChapaStub(failure_rate=1).transports()["transport"]) as client:
+        with pytest.raises(chapa.ChapaError) as exc:
+            client.verify("tx-1")
+        assert exc.value.status_code == 503
+
+def test_async_client_has_the_same_api():
+    async def run():
+        transport = ChapaStub(latency=0.05).transports()["async_transport"]
+        async with chapa.AsyncChapaClient(transport=transport) as client:
+            results = await asyncio.gather(*(client.verify(f"tx-{i}") for i in range(20)))
+            return [r["data"]["tx_ref"] for r in results]
+
+    assert asyncio.run(run()) == [f"tx-{i}" for i in range(20)]
+
+def test_module_functions_use_the_shared_client(stub):
+    assert chapa.get_client() is chapa.get_client()
+    assert chapa.verify("tx-9")["data"]["tx_ref"] == "tx-9"
+
+def test_missing_secret_key_is_reported(settings):
+    settings.CHAPA_SECRET_KEY = ""
+    with chapa.ChapaClient(transport=ChapaStub().transports()["transport"]) as client:
+        with pytest.raises(ValueError):
+            client.verify("tx-1")
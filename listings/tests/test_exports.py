@@ -0,0 +1,62 @@
+# listings/tests/test_exports.py
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from listings.models import Hotel, Booking, Payment
+
+User = get_user_model()
+
+
+@pytest.fixture
+def staff_client(db):
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(username="finance", password="pass123", is_staff=True))
+    return client
+
+def make_bookings():
+    user = User.objects.create_user(username="guest", password="pass123")
+    hotel = Hotel.objects.create(name="Sheraton, Addis", location="Addis Ababa", price_per_night=2500)
+    bookings = [
+        Booking.objects.create(user=user, hotel=hotel, check_in_date=date(2025, 9, day),
+                               check_out_date=date(2025, 9, day + 2), num_guests=1)
+        for day in (1, 10, 20)
+    ]
+    for booking in bookings:
+        Payment.objects.create(booking=booking, amount=5000, currency="ETB", tx_ref=f"tx-{booking.pk}")
+    return bookings
+
+def test_booking_csv_export_streams_rows_in_range(staff_client, settings):
+    settings.EXPORT_CHUNK_SIZE = 1
+    bookings = make_bookings()
+
+    response = staff_client.get("/api/exports/bookings.csv", {"start": "2025-09-05", "end": "2025-09-20"})
+    assert response.status_code == 200 and response.streaming
+    assert response["Content-Disposition"] == 'attachment; filename="bookings-2025-09-05-2025-09-20.csv"'
+    rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+    assert [int(row["id"]) for row in rows] == [bookings[1].pk, bookings[2].pk]
+    assert rows[0]["hotel"] == "Sheraton, Addis"
+    assert rows[0]["nights"] == "2" and Decimal(rows[0]["total_price"]) == 5000
+
+def test_payment_ndjson_export(staff_client):
+    make_bookings()
+
+    response = staff_client.get("/api/exports/payments.ndjson")
+    lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert [line["status"] for line in lines] == ["PENDING"] * 3
+    assert set(lines[0]) == {"id", "booking_id", "tx_ref", "status", "amount", "currency", "created_at", "verified_at"}
+
+    assert staff_client.get("/api/exports/payments.ndjson", {"start": "2999-01-01"}).streaming_content
+    assert staff_client.get("/api/exports/payments.xml").status_code == 404
+    assert staff_client.get("/api/exports/payments.csv", {"start": "2025-02-01", "end": "2025-01-01"}).status_code == 400
+
+def test_exports_are_staff_only(db):
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(username="guest", password="pass123"))
+    assert client.get("/api/exports/bookings.csv").status_code == 403
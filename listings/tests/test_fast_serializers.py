@@ -0,0 +1,69 @@
+# listings/tests/test_fast_serializers.py
+import io
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from listings.fast_serializers import for_serializer
+from listings.models import Hotel, Booking, Payment
+from listings.renderers import FastJSONRenderer
+from listings.serializers import HotelSerializer, BookingSerializer, PaymentSerializer
+from listings.services import hotel_cache
+
+User = get_user_model()
+
+NAMES = ["Plain", 'Quote " and \\ slash', "Ünïcødé ሆቴል 🏨", "Line\u2028sep\u2029para", "Ctrl \x00\x07\t\n\x1f\x7f", ""]
+PRICES = [Decimal("0.10"), Decimal("1"), Decimal("99999999.99"), Decimal("1234.5")]
+
+
+@pytest.fixture
+def rows(db):
+    user = User.objects.create_user(username="guest", password="pass123")
+    hotels = Hotel.objects.bulk_create(
+        Hotel(name=name, location=name[::-1], price_per_night=PRICES[i % len(PRICES)])
+        for i, name in enumerate(NAMES * 3)
+    )
+    hotel_cache.bump_version()
+    bookings = Booking.objects.bulk_create(
+        Booking(user=user, hotel=hotel, check_in_date=date(2025, 1 + i % 12, 1),
+                check_out_date=date(2025, 1 + i % 12, 1 + i % 27 + (i % 2)), num_guests=1 + i % 4)
+        for i, hotel in enumerate(hotels)
+    )
+    Payment.objects.bulk_create(
+        Payment(booking=b, tx_ref=f"tx-{b.id}", amount=PRICES[i % len(PRICES)], currency="ETB",
+                chapa_ref_id=None if i % 2 else "AP1", verified_at=timezone.now() if i % 3 else None)
+        for i, b in enumerate(bookings)
+    )
+    return user
+
+@pytest.mark.parametrize("serializer_class, queryset", [
+    (HotelSerializer, lambda: Hotel.objects.order_by("id")),
+    (BookingSerializer, lambda: Booking.objects.order_by("id")),
+    (PaymentSerializer, lambda: Payment.objects.order_by("id")),
+])
+def test_fast_path_is_byte_identical(rows, serializer_class, queryset):
+    expected = JSONRenderer().render(serializer_class(queryset(), many=True).data)
+    assert FastJSONRenderer().render(for_serializer(serializer_class).data(queryset())) == expected
+    assert b"\\u2028" in expected or serializer_class is not HotelSerializer
+
+def test_list_endpoints_match_the_plain_path(rows, settings):
+    client = APIClient()
+    client.force_authenticate(rows)
+    urls = ["/api/hotels/", "/api/hotels/?page_size=7", "/api/bookings/", "/api/hotels/?format=json"]
+
+    settings.FAST_LIST_SERIALIZATION = True
+    fast = [client.get(url).content for url in urls]
+    settings.FAST_LIST_SERIALIZATION = False
+    hotel_cache.bump_version()
+    assert [client.get(url).content for url in urls] == fast
+
+def test_micro_benchmark_runs_and_rolls_back(db):
+    out = io.StringIO()
+    call_command("bench_serializers", rows=50, repeat=1, stdout=out)
+    assert [line.split()[0] for line in out.getvalue().splitlines()] == ["hotels", "bookings", "payments"]
+    assert not Hotel.objects.exists()
@@ -0,0 +1,111 @@
+# listings/tests/test_fx.py
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from listings.models import Hotel, Booking, ExchangeRate, Payment
+from listings.services import fx
+
+User = get_user_model()
+
+
+@pytest.fixture
+def fx_rates(db):
+    call_command("loaddata", "fx_rates", verbosity=0)
+    yield
+    fx.bump_version()  # the rows roll back; don't leave them in this process's table
+
+def test_conversion_rounds_to_each_currencys_minor_unit(fx_rates):
+    assert fx.convert(Decimal("1000.00"), "usd") == Decimal("7.00")
+    assert fx.convert(Decimal("1234.56"), "JPY") == Decimal("1296")
+    assert fx.convert(Decimal("1234.56"), "KWD") == Decimal("2.642")
+    assert fx.convert(Decimal("0.50"), "USD") == Decimal("0.00") and fx.convert(Decimal("1.50"), "KES") == Decimal("1.35")
+    assert fx.convert(Decimal("10.00"), "EUR", source="USD") == Decimal("8.57")
+    assert fx.convert(Decimal("10.00"), "ETB") == Decimal("10.00")
+    with pytest.raises(fx.UnknownCurrency):
+        fx.converter("XYZ")
+
+def test_rates_are_cached_per_process_for_a_while(fx_rates, settings):
+    fx.table()
+    with CaptureQueriesContext(connection) as queries:
+        for _ in range(100):
+            fx.convert(Decimal("1000"), "USD")
+    assert len(queries) == 0
+
+    # Another process saved a rate; with a per-process cache its version bump never arrives.
+    ExchangeRate.objects.filter(currency="USD").update(rate=Decimal("0.008"))  # no signal
+    assert fx.convert(Decimal("1000"), "USD") == Decimal("7.00")
+    settings.FX_RATE_CACHE_SECONDS = 0
+    assert fx.convert(Decimal("1000"), "USD") == Decimal("8.00")
+
+    ExchangeRate.objects.create(currency="CHF", rate=Decimal("0.0056"))  # signal: this process reloads at once
+    settings.FX_RATE_CACHE_SECONDS = 60
+    assert fx.convert(Decimal("1000"), "CHF") == Decimal("5.60")
+
+def test_converted_prices_cost_no_queries_per_row(fx_rates):
+    user = User.objects.create_user(username="u1", password="pass123", email="u1@example.com")
+    hotels = Hotel.objects.bulk_create(
+        Hotel(name=f"H{i}", location="Addis Ababa", price_per_night=Decimal("1000.00") + i) for i in range(20)
+    )
+    Booking.objects.bulk_create(
+        Booking(user=user, hotel=h, check_in_date=date(2025, 9, 1), check_out_date=date(2025, 9, 3), num_guests=1)
+        for h in hotels
+    )
+    client = APIClient()
+    client.force_authenticate(user)
+    fx.table()
+
+    resp = client.get(reverse("hotel-list"), {"currency": "USD"})
+    assert resp.json()["results"][-1]["converted"] == {"currency": "USD", "price_per_night": "7.00"}
+    assert "converted" not in client.get(reverse("hotel-list")).json()["results"][0]
+    assert client.get(reverse("hotel-detail", args=[hotels[0].id]), {"currency": "JPY"}).json()["converted"] == {
+        "currency": "JPY", "price_per_night": "1050",
+    }
+
+    with CaptureQueriesContext(connection) as plain:
+        client.get(reverse("booking-list"))
+    with CaptureQueriesContext(connection) as converted:
+        resp = client.get(reverse("booking-list"), {"currency": "EUR"})
+    assert len(converted) == len(plain)
+    assert resp.json()[-1]["converted"] == {"currency": "EUR", "total_price": "12.00"}
+
+    assert client.get(reverse("booking-list"), {"currency": "XYZ"}).status_code == 400
+
+def test_payments_are_charged_in_the_requested_currency(fx_rates, stub):
+    user = User.objects.create_user(username="u1", password="pass123", email="u1@example.com")
+    hotel = Hotel.objects.create(name="Sheraton", location="Addis Ababa", price_per_night=2500)
+    booking = Booking.objects.create(user=user, hotel=hotel, check_in_date=date(2025, 9, 1),
+                                     check_out_date=date(2025, 9, 3), num_guests=1)
+    client = APIClient()
+    client.force_authenticate(user)
+
+    resp = client.post(reverse("payments-initiate"), {"booking_id": booking.id, "currency": "XYZ"}, format="json")
+    assert resp.status_code == 400
+    resp = client.post(reverse("payments-initiate"), {"booking_id": booking.id, "currency": "USD"}, format="json")
+    assert resp.status_code == 200
+    payment = Payment.objects.get(booking=booking)
+    assert (payment.amount, payment.currency) == (Decimal("35.00"), "USD")
+
+    again = client.post(reverse("payments-initiate"), {"booking_id": booking.id, "currency": "usd"}, format="json")
+    assert again.json()["checkout_url"] == resp.json()["checkout_url"]
+
+    # The USD checkout can still be paid: no switching away from it...
+    resp = client.post(reverse("payments-initiate"), {"booking_id": booking.id}, format="json")
+    assert resp.status_code == 409 and resp.json()["currency"] == "USD"
+    assert Payment.objects.get(booking=booking).tx_ref == payment.tx_ref
+
+    # ...until it has failed: then the retry is priced in the new currency.
+    stub.verify_status = "cancelled"
+    client.get(reverse("payments-verify", args=[payment.tx_ref]))
+    resp = client.post(reverse("payments-initiate"), {"booking_id": booking.id}, format="json")
+    assert resp.status_code == 200 and resp.json()["checkout_url"] != again.json()["checkout_url"]
+
+    switched = Payment.objects.get(booking=booking)
+    assert (switched.amount, switched.currency) == (Decimal("5000.00"), "ETB")
+    assert switched.tx_ref != payment.tx_ref and switched.status == Payment.Status.PENDING
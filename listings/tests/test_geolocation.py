@@ -0,0 +1,96 @@
+# listings/tests/test_geolocation.py
+import io
+import shutil
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory
+from listings.middleware import LazyGeolocationMiddleware
+from listings.services import geolocation
+
+RANGES = """\
+1.0.0.0,1.0.0.255,AU,OC
+41.0.0.0,41.255.255.255,ET,AF
+2001:db8::,2001:db8::ffff,DE,EU
+not-an-ip,1.2.3.4,XX,XX
+"""
+
+
+@pytest.fixture
+def geoip_db(tmp_path, settings):
+    source = tmp_path / "ranges.csv"
+    source.write_text(RANGES)
+    settings.IP_GEOLOCATION_DATABASE = str(tmp_path / "ip-ranges.bin")
+    settings.IP_GEOLOCATION_SETTINGS = {**settings.IP_GEOLOCATION_SETTINGS,
+                                        "BACKEND": "listings.services.geolocation.LocalIPRangeBackend"}
+    call_command("build_geoip_db", str(source), stdout=io.StringIO())
+    caches[settings.IP_GEOLOCATION_CACHE].clear()
+    return geolocation.get_database()
+
+def test_range_lookup(geoip_db):
+    assert len(geoip_db) == 3
+    assert geoip_db.lookup("41.12.3.4") == ("ET", "AF")
+    assert geoip_db.lookup("1.0.0.255") == ("AU", "OC")
+    assert geoip_db.lookup("2001:db8::42") == ("DE", "EU")
+    assert geoip_db.lookup("1.0.1.0") is None
+    assert geoip_db.lookup("0.0.0.1") is None
+    assert geoip_db.lookup("garbage") is None
+
+def test_lookups_are_cached_per_ip(geoip_db, monkeypatch):
+    calls = []
+    lookup = geoip_db.lookup
+    monkeypatch.setattr(geoip_db, "lookup", lambda ip: calls.append(ip) or lookup(ip))
+
+    assert geolocation.locate_ip("41.1.1.1")["county"] == {"code": "ET", "name": None}
+    assert geolocation.locate_ip(" 41.1.1.1")["continent"] == "AF"
+    assert calls == ["41.1.1.1"]
+
+def test_missing_database_is_retried_after_a_backoff(geoip_db, settings, monkeypatch):
+    settings.IP_GEOLOCATION_DATABASE = str(geoip_db.path) + ".missing"
+    settings.IP_GEOLOCATION_RETRY_SECONDS = 60
+    opened = []
+    monkeypatch.setattr(geolocation, "IPRangeDatabase", lambda path: opened.append(path) or open(path, "rb"))
+    monkeypatch.setattr(geolocation, "_databases", {})
+    assert geolocation.get_database() is None and geolocation.get_database() is None
+    assert len(opened) == 1
+
+    # The file shows up (a refresh finished): the next open after the backoff picks it up, once.
+    shutil.copy(geoip_db.path, settings.IP_GEOLOCATION_DATABASE)
+    settings.IP_GEOLOCATION_RETRY_SECONDS = 0
+    database = geolocation.get_database()
+    assert database is not None and geolocation.get_database() is database
+    assert len(opened) == 2
+
+def test_misses_are_cached_briefly(geoip_db, settings, monkeypatch):
+    lookups = []
+    monkeypatch.setattr(geolocation, "_lookup", lambda ip: lookups.append(ip) or 1 / 0)
+    settings.IP_GEOLOCATION_MISS_CACHE_TIMEOUT = 60
+    assert geolocation.locate_ip("41.1.1.1") is None and geolocation.locate_ip("41.1.1.1") is None
+    assert lookups == ["41.1.1.1"]
+
+    # Misses expire on their own, much sooner than IP_GEOLOCATION_CACHE_TIMEOUT.
+    settings.IP_GEOLOCATION_MISS_CACHE_TIMEOUT = 0
+    assert geolocation.locate_ip("41.1.1.2") is None and geolocation.locate_ip("41.1.1.2") is None
+    assert lookups == ["41.1.1.1", "41.1.1.2", "41.1.1.2"]
+
+def test_middleware_is_lazy_and_limited_to_routes(geoip_db, settings, monkeypatch):
+    settings.IP_GEOLOCATION_ROUTES = [r"^/api/hotels/"]
+    calls = []
+    monkeypatch.setattr(geolocation, "_lookup", lambda ip: calls.append(ip) or {"ip": ip})
+    factory = RequestFactory(REMOTE_ADDR="41.1.1.1")
+
+    def view(request):
+        seen.append(hasattr(request, "geolocation"))
+        return HttpResponse()
+
+    seen = []
+    middleware = LazyGeolocationMiddleware(view)
+    middleware(factory.get("/static/app.css"))
+    middleware(factory.get("/api/hotels/"))
+    assert seen == [False, True] and calls == []  # attached, never resolved
+
+    middleware = LazyGeolocationMiddleware(lambda request: HttpResponse(request.geolocation["ip"]))
+    assert middleware(factory.get("/api/hotels/1/")).content == b"41.1.1.1"
+    assert calls == ["41.1.1.1"]
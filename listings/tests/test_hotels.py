@@ -0,0 +1,121 @@
+# listings/tests/test_hotels.py
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from listings.models import Hotel
+from listings.services import hotel_cache
+
+
+def create_hotels(n, location="Addis Ababa", price=100):
+    hotels = Hotel.objects.bulk_create(
+        Hotel(name=f"Hotel {i}", location=location, price_per_night=price + i) for i in range(n)
+    )
+    hotel_cache.bump_version()  # bulk_create skips the post_save invalidation
+    return hotels
+
+def test_hotels_list_is_cursor_paginated(db):
+    create_hotels(5)
+    client = APIClient()
+    url = reverse("hotel-list")
+
+    resp = client.get(url, {"page_size": 2})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [h["name"] for h in body["results"]] == ["Hotel 4", "Hotel 3"]
+    assert body["next"] and "cursor=" in body["next"]
+
+    seen = [h["id"] for h in body["results"]]
+    while body["next"]:
+        body = client.get(body["next"]).json()
+        seen += [h["id"] for h in body["results"]]
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == 5
+
+def test_hotels_list_filters(db):
+    create_hotels(3, location="Addis Ababa", price=100)
+    create_hotels(3, location="Bahir Dar", price=300)
+    client = APIClient()
+    url = reverse("hotel-list")
+
+    resp = client.get(url, {"location": "Bahir Dar", "max_price": "301"})
+    assert resp.status_code == 200
+    assert [float(h["price_per_night"]) for h in resp.json()["results"]] == [301.0, 300.0]
+
+    for junk in ("abc", "NaN", "Infinity", "-inf"):
+        assert client.get(url, {"min_price": junk}).status_code == 400
+
+def test_hotels_availability_respects_room_inventory(db):
+    user = get_user_model().objects.create_user(username="u1", password="pass123")
+    free, taken, adjacent = create_hotels(3)
+    client = APIClient()
+    client.force_authenticate(user)
+    for hotel, check_in, check_out in [(taken, "2025-09-03", "2025-09-06"), (adjacent, "2025-08-28", "2025-09-01")]:
+        resp = client.post(reverse("booking-list"), {"hotel": hotel.id, "check_in_date": check_in,
+                                                     "check_out_date": check_out, "num_guests": 1}, format="json")
+        assert resp.status_code == 201
+
+    url = reverse("hotel-availability")
+    resp = client.get(url, {"check_in": "2025-09-01", "check_out": "2025-09-04"})
+    assert resp.status_code == 200
+    assert {h["id"] for h in resp.json()["results"]} == {free.id, adjacent.id}
+
+    resp = client.get(url, {"check_in": "2025-09-04", "check_out": "2025-09-01"})
+    assert resp.status_code == 400
+
+def test_hotel_reads_are_cached_until_a_hotel_changes(db, settings, django_assert_num_queries):
+    hotel = create_hotels(2)[0]
+    client = APIClient()
+    url = reverse("hotel-list")
+    client.get(url)
+    with django_assert_num_queries(1):  # rendered again: off by default, as there is no CACHE_URL
+        client.get(url)
+
+    settings.HOTEL_RESPONSE_CACHE = True
+
+    first = client.get(url, {"location": "Addis Ababa"})
+    with django_assert_num_queries(0):
+        again = client.get(url, {"location": "Addis Ababa"})
+    assert again.json() == first.json()
+    assert again["ETag"] == first["ETag"]
+
+    # Conditional GET: same representation, no body.
+    resp = client.get(url, {"location": "Addis Ababa"}, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+    detail = reverse("hotel-detail", args=[hotel.id])
+    assert client.get(detail).json()["name"] == "Hotel 0"
+
+    # A save (API, admin or shell) bumps the version: new body, new ETag.
+    hotel.name = "Renamed"
+    hotel.save()
+    assert client.get(detail).json()["name"] == "Renamed"
+    resp = client.get(url, {"location": "Addis Ababa"}, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert resp.status_code == 200
+    assert resp["ETag"] != first["ETag"]
+    assert "Renamed" in [h["name"] for h in resp.json()["results"]]
+
+    hotel.delete()
+    assert client.get(detail).status_code == 404
+
+def test_hotel_search_is_ranked_and_indexed(db):
+    Hotel.objects.create(name="Lakeside Lodge", location="Bahir Dar", price_per_night=90)
+    Hotel.objects.create(name="Addis Lodge", location="Addis Ababa", price_per_night=120)
+    best = Hotel.objects.create(name="Addis Addis Grand", location="Addis Ababa", price_per_night=300)
+    client = APIClient()
+    url = reverse("hotel-search")
+
+    resp = client.get(url, {"q": "addis"})
+    assert resp.status_code == 200
+    names = [h["name"] for h in resp.json()["results"]]
+    assert names[0] == best.name and set(names) == {"Addis Lodge", "Addis Addis Grand"}
+
+    # Substrings, several words, list filters, and renames through the sync triggers.
+    assert [h["name"] for h in client.get(url, {"q": "lodge dar"}).json()["results"]] == ["Lakeside Lodge"]
+    assert len(client.get(url, {"q": "lodge", "max_price": "100"}).json()["results"]) == 1
+    best.name = "Grand Palace"
+    best.save()
+    assert [h["name"] for h in client.get(url, {"q": "palace"}).json()["results"]] == ["Grand Palace"]
+
+    assert client.get(url).status_code == 400
+    assert Hotel.objects.search("ad").count() == 2  # too short for trigrams: LIKE fallback
@@ -0,0 +1,80 @@
+# listings/tests/test_inventory.py
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from listings.models import Hotel, Booking, Payment, RoomInventory
+from listings.services import inventory
+
+CHECK_IN, CHECK_OUT = date(2025, 12, 24), date(2025, 12, 27)
+
+
+def reserve_with_retry(hotel):
+    """One worker's reservation. SQLite serializes writers, so back off on lock errors."""
+    deadline = time.monotonic() + 60
+    try:
+        while time.monotonic() < deadline:
+            try:
+                inventory.reserve(hotel, CHECK_IN, CHECK_OUT)
+                return True
+            except inventory.NoAvailability:
+                return False
+            except OperationalError:
+                time.sleep(random.uniform(0, 0.02))
+        raise AssertionError("reservation never got the lock")
+    finally:
+        connection.close()
+
+def test_reserve_and_release(db):
+    hotel = Hotel.objects.create(name="H", location="L", price_per_night=100, room_count=1)
+    inventory.reserve(hotel, CHECK_IN, CHECK_OUT)
+    assert list(RoomInventory.objects.values_list("remaining", flat=True)) == [0, 0, 0]
+
+    # Overlapping one night is enough to be refused, and nothing is half-taken.
+    with pytest.raises(inventory.NoAvailability):
+        inventory.reserve(hotel, date(2025, 12, 26), date(2025, 12, 28))
+    assert not RoomInventory.objects.filter(date=date(2025, 12, 27), remaining=0).exists()
+
+    inventory.release(hotel, CHECK_IN, CHECK_OUT)
+    assert set(RoomInventory.objects.values_list("remaining", flat=True)) == {1}
+
+def test_parallel_reservations_never_oversell(transactional_db):
+    rooms, attempts = 25, 300
+    hotel = Hotel.objects.create(name="Busy", location="L", price_per_night=100, room_count=rooms)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda _: reserve_with_retry(hotel), range(attempts)))
+
+    assert results.count(True) == rooms
+    assert list(RoomInventory.objects.order_by("date").values_list("remaining", flat=True)) == [0, 0, 0]
+
+def test_seed_load_is_reproducible_and_rebuilds_inventory(db):
+    def snapshot():
+        return (
+            list(Hotel.objects.order_by("id").values_list("location", "price_per_night", "room_count")),
+            list(Booking._base_manager.order_by("id").values_list("check_in_date", "check_out_date", "num_guests")),
+            list(Payment.objects.order_by("id").values_list("amount", "status")),
+        )
+
+    options = dict(hotels=5, users=10, bookings=200, seed=7, chunk_size=64, batch_size=50)
+    call_command("seed_load", **options)
+    first = snapshot()
+    assert len(first[1]) == 200 and 0 < len(first[2]) < 200
+
+    # Inventory matches a night-by-night count of the generated stays.
+    booking = Booking.objects.first()
+    night = RoomInventory.objects.get(hotel=booking.hotel, date=booking.check_in_date)
+    sold = Booking._base_manager.filter(
+        hotel=booking.hotel, check_in_date__lte=night.date, check_out_date__gt=night.date
+    ).count()
+    assert night.remaining == max(booking.hotel.room_count - sold, 0)
+
+    for model in (Payment, Booking, Hotel):
+        model._base_manager.all().delete()
+    Booking._meta.get_field("user").related_model.objects.all().delete()
+    call_command("seed_load", **dict(options, chunk_size=1000))
+    assert snapshot() == first
@@ -0,0 +1,95 @@
+# listings/tests/test_outbox.py
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.db import transaction
+from django.utils import timezone
+from listings.models import Hotel, Booking, OutboxEvent, Payment
+from listings.services import payments
+from listings.services import outbox
+
+User = get_user_model()
+
+
+def create_bookings(n):
+    user = User.objects.create_user(username="u1", password="pass123", email="u1@example.com")
+    hotel = Hotel.objects.create(name="Sheraton", location="Addis Ababa", price_per_night=2500, room_count=n)
+    return user, Booking.objects.bulk_create(
+        Booking(user=user, hotel=hotel, check_in_date=date(2025, 9, 1), check_out_date=date(2025, 9, 3), num_guests=1)
+        for _ in range(n)
+    )
+
+def test_events_commit_with_their_change_and_are_recorded_once(db):
+    _, bookings = create_bookings(2)
+    outbox.bookings_created([bookings[0].id])
+    outbox.bookings_created([bookings[0].id, bookings[1].id])
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            outbox.bookings_created([999])
+            raise RuntimeError
+    assert sorted(OutboxEvent.objects.values_list("key", flat=True)) == [
+        f"booking.created:{bookings[0].id}", f"booking.created:{bookings[1].id}",
+    ]
+
+def test_payment_status_changes_are_recorded_with_the_payment(db):
+    _, bookings = create_bookings(1)
+    payment = Payment.objects.create(booking=bookings[0], tx_ref="tx-1", amount=100)
+    payments.save_verification(payment, {"data": {"status": "pending"}})
+    assert not OutboxEvent.objects.exists()
+
+    for _ in range(2):
+        payment = payments.save_verification(payment, {"data": {"status": "success", "reference": "R"}})
+    event = OutboxEvent.objects.get()
+    assert (event.topic, event.payload) == (outbox.PAYMENT_STATUS, {
+        "payment_id": payment.id, "booking_id": bookings[0].id, "status": "COMPLETED",
+    })
+    assert outbox.process([event.id]) == 1  # nothing handles them yet
+
+def test_relay_publishes_one_message_per_batch(db):
+    _, bookings = create_bookings(5)
+    outbox.bookings_created(b.id for b in bookings)
+    published = []
+    assert outbox.relay(published.append, batch_size=2) == 5
+    assert [len(ids) for ids in published] == [2, 2, 1]
+    assert outbox.relay(published.append) == 0  # in flight: not sent again
+    assert not OutboxEvent.objects.filter(dispatched_at=None).exists()
+
+def test_lost_batches_are_redelivered_and_processed_once(db, settings):
+    settings.OUTBOX_REDELIVER_SECONDS = 60
+    _, bookings = create_bookings(3)
+    outbox.bookings_created(b.id for b in bookings)
+    published = []
+    outbox.relay(published.append)
+
+    OutboxEvent.objects.update(dispatched_at=timezone.now() - timedelta(seconds=61))
+    outbox.relay(published.append)
+    assert published[0] == published[1]
+
+    assert outbox.process(published[0]) == 3
+    assert outbox.process(published[1]) == 0  # the duplicate delivery
+    assert len(mail.outbox) == 3
+
+def test_a_failing_handler_call_leaves_only_its_chunks_pending(db, settings, monkeypatch):
+    settings.BOOKING_EMAIL_BATCH_SIZE = 2
+    _, bookings = create_bookings(5)
+    outbox.bookings_created(b.id for b in bookings)
+    send, batch_size = outbox._handlers[outbox.BOOKING_CREATED]
+    calls = []
+
+    def smtp_drops_on_second_call(payloads):
+        calls.append(len(payloads))
+        if len(calls) == 2:
+            raise ConnectionError("smtp down")
+        send(payloads)
+    monkeypatch.setitem(outbox._handlers, outbox.BOOKING_CREATED, (smtp_drops_on_second_call, batch_size))
+    event_ids = list(OutboxEvent.objects.order_by("id").values_list("id", flat=True))
+    with pytest.raises(ConnectionError):
+        outbox.process(event_ids)
+    assert len(mail.outbox) == 2
+    assert OutboxEvent.objects.filter(processed_at__isnull=True).count() == 3
+
+    # Redelivered: the mail already sent isn't sent again.
+    assert outbox.process(event_ids) == 3
+    assert calls == [2, 2, 2, 1] and len(mail.outbox) == 5
@@ -0,0 +1,220 @@
+# listings/tests/test_payments.py
+import asyncio
+import json
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from listings.models import Hotel, Booking, Payment, ProviderCall
+from listings.services import payments
+from listings.tasks import reconcile_pending_payments
+from listings.views import AsyncInitiatePaymentView, AsyncVerifyPaymentView
+
+User = get_user_model()
+
+
+def create_booking(username="u1"):
+    user = User.objects.create_user(username=username, password="pass123", email=f"{username}@example.com")
+    hotel = Hotel.objects.create(name="Sheraton", location="Addis Ababa", price_per_night=2500)
+    booking = Booking.objects.create(user=user, hotel=hotel, check_in_date=date(2025, 9, 1),
+                                     check_out_date=date(2025, 9, 3), num_guests=1)
+    return user, booking
+
+def call_async_view(view, method, user=None, data=None, **kwargs):
+    factory = AsyncRequestFactory()
+    if method == "post":
+        request = factory.post("/", data=json.dumps(data or {}), content_type="application/json")
+    else:
+        request = factory.get("/")
+    request._dont_enforce_csrf_checks = True
+    if user is not None:
+        request.user = user
+    response = asyncio.run(view.as_view()(request, **kwargs))
+    return response.status_code, json.loads(response.content)
+
+def test_initiate_and_verify_payment(db, stub):
+    user, booking = create_booking()
+    client = APIClient()
+    client.force_authenticate(user)
+
+    resp = client.post(reverse("payments-initiate"), {"booking_id": booking.id}, format="json")
+    assert resp.status_code == 200
+    payment = Payment.objects.get(booking=booking)
+    assert resp.json()["checkout_url"].endswith(payment.tx_ref)
+    assert payment.amount == 5000
+
+    resp = client.get(reverse("payments-verify", args=[payment.tx_ref]))
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "COMPLETED"
+
+def test_async_payment_views(transactional_db, stub):
+    user, booking = create_booking()
+    other, _ = create_booking("u2")
+
+    status_code, body = call_async_view(AsyncInitiatePaymentView, "post", user=user, data={"booking_id": booking.id})
+    assert status_code == 200
+    tx_ref = Payment.objects.get(booking=booking).tx_ref
+    assert body["checkout_url"].endswith(tx_ref)
+
+    status_code, _ = call_async_view(AsyncInitiatePaymentView, "post", user=other, data={"booking_id": booking.id})
+    assert status_code == 403
+
+    status_code, body = call_async_view(AsyncVerifyPaymentView, "get", tx_ref=tx_ref)
+    assert status_code == 200
+    assert body["status"] == "COMPLETED"
+    assert body["tx_ref"] == tx_ref
+
+def test_async_initiate_requires_auth(transactional_db, stub):
+    _, booking = create_booking()
+    status_code, _ = call_async_view(AsyncInitiatePaymentView, "post", user=AnonymousUser(),
+                                     data={"booking_id": booking.id})
+    assert status_code in (401, 403)
+
+def test_reconcile_pending_payments_in_bulk(db, stub, settings):
+    settings.PAYMENT_RECONCILE_BATCH_SIZE = 2
+    bookings = [create_booking(f"u{i}")[1] for i in range(5)]
+    Payment.objects.bulk_create(Payment(booking=b, tx_ref=f"tx-{b.id}", amount=100) for b in bookings)
+    fresh = Payment.objects.get(booking=bookings[-1])
+    Payment.objects.exclude(pk=fresh.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+
+    assert reconcile_pending_payments() == "Reconciled 4 of 4 pending payment(s)"
+    assert Payment.objects.filter(status=Payment.Status.COMPLETED, verified_at__isnull=False).count() == 4
+    assert Payment.objects.get(pk=fresh.pk).status == Payment.Status.PENDING
+
+    # The callback for a just-reconciled payment is answered without calling Chapa.
+    calls = len(stub.calls)
+    resp = APIClient().get(reverse("payments-verify", args=[f"tx-{bookings[0].id}"]))
+    assert resp.json()["status"] == "COMPLETED"
+    assert len(stub.calls) == calls
+
+def test_reconciliation_keeps_changes_made_while_chapa_answered(db, stub, monkeypatch):
+    bookings = [create_booking(f"u{i}")[1] for i in range(3)]
+    Payment.objects.bulk_create(Payment(booking=b, tx_ref=f"tx-{b.id}", amount=100) for b in bookings)
+    Payment.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+    stub.verify_status = "failed"
+    verify_all = payments._verify_all
+
+    def verify_while_others_write(tx_refs, concurrency):
+        # After the chunk was read: one payment is re-initiated, another completed by its callback.
+        Payment.objects.filter(booking=bookings[0]).update(tx_ref="tx-rotated")
+        Payment.objects.filter(booking=bookings[1]).update(status=Payment.Status.COMPLETED)
+        return verify_all(tx_refs, concurrency)
+    monkeypatch.setattr(payments, "_verify_all", verify_while_others_write)
+
+    assert reconcile_pending_payments() == "Reconciled 1 of 3 pending payment(s)"
+    assert [(p.tx_ref, p.status) for p in Payment.objects.order_by("booking_id")] == [
+        ("tx-rotated", "PENDING"), (f"tx-{bookings[1].id}", "COMPLETED"), (f"tx-{bookings[2].id}", "FAILED"),
+    ]
+
+def test_an_open_checkout_is_not_reused_after_the_booking_changed(db, stub):
+    user, booking = create_booking()
+    client = APIClient()
+    client.force_authenticate(user)
+    url = reverse("payments-initiate")
+    assert client.post(url, {"booking_id": booking.id}, format="json").status_code == 200
+    payment = Payment.objects.get()
+
+    resp = client.patch(reverse("booking-detail", args=[booking.id]), {"check_out_date": "2025-09-04"}, format="json")
+    assert resp.status_code == 200 and resp.json()["total_price"] == "7500.00"
+    resp = client.post(url, {"booking_id": booking.id}, format="json")
+    assert resp.status_code == 409 and resp.json()["amount"] == "5000.00"
+    assert Payment.objects.get().tx_ref == payment.tx_ref
+
+    stub.verify_status = "cancelled"
+    client.get(reverse("payments-verify", args=[payment.tx_ref]))
+    assert client.post(url, {"booking_id": booking.id}, format="json").status_code == 200
+    assert Payment.objects.get().amount == 7500
+
+def test_only_explicit_failures_fail_a_payment(db, stub):
+    bookings = [create_booking(f"u{i}")[1] for i in range(2)]
+    Payment.objects.bulk_create(Payment(booking=b, tx_ref=f"tx-{b.id}", amount=100) for b in bookings)
+    Payment.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+
+    # The guest has not paid yet: still PENDING, just checked.
+    stub.verify_status = "pending"
+    assert reconcile_pending_payments() == "Reconciled 2 of 2 pending payment(s)"
+    assert list(Payment.objects.values_list("status", flat=True)) == ["PENDING", "PENDING"]
+    assert Payment.objects.filter(verified_at__isnull=True).count() == 0
+
+    # Not served from the verification cache: the next callback asks Chapa again.
+    calls = len(stub.calls)
+    url = reverse("payments-verify", args=[f"tx-{bookings[0].id}"])
+    assert APIClient().get(url).json()["status"] == "PENDING"
+    assert len(stub.calls) == calls + 1
+
+    stub.verify_status = "cancelled"
+    assert APIClient().get(url).json()["status"] == "FAILED"
+    assert APIClient().get(url).json()["status"] == "FAILED"
+    assert len(stub.calls) == calls + 3
+
+def test_repeated_initiation_costs_one_provider_call(db, stub):
+    user, booking = create_booking()
+    client = APIClient()
+    client.force_authenticate(user)
+    url = reverse("payments-initiate")
+    initialize_calls = lambda: sum(path.endswith("/initialize") for _, path in stub.calls)
+
+    first = client.post(url, {"booking_id": booking.id}, format="json")
+    again = client.post(url, {"booking_id": booking.id}, format="json", HTTP_IDEMPOTENCY_KEY="k1")
+    assert first.status_code == again.status_code == 200
+    assert first.json() == again.json()
+    assert initialize_calls() == 1
+
+    # Another request is mid-call to Chapa: don't start a second one.
+    Payment.objects.filter(booking=booking).update(checkout_url=None, init_started_at=timezone.now())
+    assert client.post(url, {"booking_id": booking.id}, format="json").status_code == 409
+    assert initialize_calls() == 1
+
+    # ...unless that claim was abandoned.
+    Payment.objects.filter(booking=booking).update(init_started_at=timezone.now() - timedelta(minutes=5))
+    assert client.post(url, {"booking_id": booking.id}, format="json").status_code == 200
+    assert initialize_calls() == 2
+
+def test_provider_payloads_go_to_the_audit_table(db, stub, settings):
+    settings.PROVIDER_AUDIT_COMPRESS = True
+    user, booking = create_booking()
+    client = APIClient()
+    client.force_authenticate(user)
+    client.post(reverse("payments-initiate"), {"booking_id": booking.id}, format="json")
+    tx_ref = Payment.objects.get(booking=booking).tx_ref
+
+    body = client.get(reverse("payments-verify", args=[tx_ref])).json()
+    assert "provider_calls" not in body and "raw_verify_resp" not in body
+    calls = list(ProviderCall.objects.order_by("id"))
+    assert [c.kind for c in calls] == ["initialize", "verify"]
+    assert calls[1].body["data"]["status"] == "success"
+
+    # Staff can ask for the payloads; everyone else gets the slim payment.
+    staff = User.objects.create_user(username="support", is_staff=True)
+    url = reverse("payments-verify", args=[tx_ref]) + "?expand=provider_calls"
+    assert "provider_calls" not in client.get(url).json()
+    client.force_authenticate(staff)
+    expanded = client.get(url).json()["provider_calls"]
+    assert [c["body"] for c in expanded] == [c.body for c in calls]
+
+    with pytest.raises(ValueError):
+        calls[0].save()
+
+def test_failed_initiation_is_audited(db, stub):
+    stub.failure_rate = 1.0
+    user, booking = create_booking()
+    client = APIClient()
+    client.force_authenticate(user)
+    resp = client.post(reverse("payments-initiate"), {"booking_id": booking.id}, format="json",
+                       HTTP_IDEMPOTENCY_KEY="k1")
+    assert resp.status_code == 502
+
+    payment = Payment.objects.get(booking=booking)
+    call = payment.provider_calls.get()
+    assert not call.ok and call.body["body"] == {"message": "Service unavailable (stub)"}
+    # Replaying the failed key answers from the stored error without calling Chapa again.
+    replay = client.post(reverse("payments-initiate"), {"booking_id": booking.id}, format="json",
+                         HTTP_IDEMPOTENCY_KEY="k1")
+    assert replay.status_code == 502
+    assert replay.json()["error"] == payment.provider_error
+    assert len(stub.calls) == 1
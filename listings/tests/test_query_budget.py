@@ -0,0 +1,69 @@
+# listings/tests/test_query_budget.py
+from datetime import date
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from listings.middleware import QueryBudgetExceeded, query_stats, reset_query_stats
+from listings.models import Hotel, Booking
+from listings.testing import assert_query_budget, query_budget_enforced
+from listings.views import BookingViewSet
+
+User = get_user_model()
+
+
+@pytest.fixture
+def logged_in(db, stub):
+    reset_query_stats()
+    user = User.objects.create_user(username="u1", password="pass123", email="u1@example.com")
+    client = APIClient()
+    client.login(username="u1", password="pass123")  # session auth: its lookups count too
+    return client, user
+
+def create_bookings(user, n):
+    hotel = Hotel.objects.create(name="H", location="Addis Ababa", price_per_night=100, room_count=50)
+    return Booking.objects.bulk_create(
+        Booking(user=user, hotel=hotel, check_in_date=date(2025, 9, 1), check_out_date=date(2025, 9, 3), num_guests=1)
+        for _ in range(n)
+    )
+
+@query_budget_enforced()
+def test_listing_views_stay_within_budget(logged_in):
+    client, user = logged_in
+    bookings = create_bookings(user, 25)
+
+    resp = client.get(reverse("booking-list"))
+    assert resp["X-DB-Queries"] == str(resp.query_stats["queries"])
+    assert resp["X-View-Name"] == "listings.views.BookingViewSet"
+    assert_query_budget(resp)
+
+    resp = client.get(reverse("hotel-list"))
+    assert_query_budget(resp)
+
+    resp = client.post(reverse("payments-initiate"), {"booking_id": bookings[0].id}, format="json")
+    assert resp.status_code == 200
+    assert_query_budget(resp)
+
+    resp = client.get(reverse("payments-verify", args=[bookings[0].payment.tx_ref]))
+    assert_query_budget(resp)
+
+    assert query_stats()["listings.views.BookingViewSet"]["requests"] == 1
+
+    for path in ("/wp-login.php", "/.env", "/api/nope/"):
+        client.get(path)
+    assert query_stats()["<unresolved>"]["requests"] == 3
+
+def test_going_over_budget_fails(logged_in, monkeypatch):
+    client, user = logged_in
+    create_bookings(user, 3)
+    monkeypatch.setattr(BookingViewSet, "query_budget", {"list": 2})
+
+    with query_budget_enforced(), pytest.raises(QueryBudgetExceeded, match="BookingViewSet ran 3 queries"):
+        client.get(reverse("booking-list"))
+
+def test_instrumentation_is_off_by_default(logged_in):
+    client, _ = logged_in
+    resp = client.get(reverse("hotel-list"))
+    assert "X-DB-Queries" not in resp
+    assert query_stats() == {}
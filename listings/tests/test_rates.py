@@ -0,0 +1,120 @@
+# listings/tests/test_rates.py
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from listings.models import Hotel, Booking, Payment, RateRule
+from listings.services import rates
+
+User = get_user_model()
+
+
+def reference_quote(hotel, rules, check_in, check_out):
+    """Night by night, the way the rules read."""
+    total = Decimal(0)
+    night = check_in
+    while night < check_out:
+        covering = [r for r in rules if r.hotel_id == hotel.id and r.start_date <= night < r.end_date
+                    and r.weekdays >> night.weekday() & 1]
+        best = max(covering, key=lambda r: (r.priority, r.id), default=None)
+        total += best.price_per_night if best else hotel.price_per_night
+        night += timedelta(days=1)
+    return total
+
+def test_seasons_weekends_and_overrides(db):
+    hotel = Hotel.objects.create(name="Sheraton", location="Addis Ababa", price_per_night=100)
+    RateRule.objects.create(hotel=hotel, start_date=date(2025, 12, 1), end_date=date(2026, 1, 1), price_per_night=150)
+    RateRule.objects.create(hotel=hotel, start_date=date(2025, 1, 1), end_date=date(2027, 1, 1),
+                            weekdays=RateRule.WEEKEND, price_per_night=180, priority=1)
+    RateRule.objects.create(hotel=hotel, start_date=date(2025, 12, 31), end_date=date(2026, 1, 1),
+                            price_per_night=400, priority=9)
+
+    # Sat 29 Nov: weekend; Sun 30 Nov: base; Mon 1, Tue 2 Dec: season
+    assert rates.price_stay(hotel, date(2025, 11, 29), date(2025, 12, 3)) == Decimal("580.00")
+    # Tue 30 Dec: season; Wed 31 Dec: override; Thu 1 Jan: base
+    assert rates.price_stay(hotel, date(2025, 12, 30), date(2026, 1, 2)) == Decimal("650.00")
+    assert rates.quote([hotel], date(2025, 12, 31), date(2025, 12, 31)) == {hotel.id: Decimal("0.00")}
+
+def test_vectorized_quote_matches_the_night_by_night_rules(db):
+    rng = random.Random(7)
+    hotels = Hotel.objects.bulk_create(
+        Hotel(name=f"H{i}", location="Addis Ababa", price_per_night=Decimal(rng.randrange(5_000, 50_000)) / 100)
+        for i in range(60)
+    )
+    rules = []
+    for hotel in hotels[:50]:
+        for _ in range(rng.randrange(0, 6)):
+            start = date(2025, 6, 1) + timedelta(days=rng.randrange(0, 60))
+            rules.append(RateRule(hotel=hotel, start_date=start, end_date=start + timedelta(days=rng.randrange(1, 30)),
+                                  weekdays=rng.randrange(1, 128), priority=rng.randrange(0, 3),
+                                  price_per_night=Decimal(rng.randrange(5_000, 90_000)) / 100))
+    RateRule.objects.bulk_create(rules)
+    rules = list(RateRule.objects.all())
+
+    for _ in range(10):
+        check_in = date(2025, 6, 1) + timedelta(days=rng.randrange(0, 70))
+        check_out = check_in + timedelta(days=rng.randrange(1, 21))
+        with CaptureQueriesContext(connection) as queries:
+            totals = rates.quote(hotels, check_in, check_out)
+        assert len(queries) == 1
+        assert totals == {h.id: reference_quote(h, rules, check_in, check_out) for h in hotels}
+
+def test_quote_endpoint_prices_many_hotels_in_one_call(db, settings):
+    settings.RATE_QUOTE_MAX_NIGHTS = 30
+    hotels = Hotel.objects.bulk_create(
+        Hotel(name=f"H{i}", location="Addis Ababa" if i % 2 else "Gondar", price_per_night=100 + i) for i in range(200)
+    )
+    RateRule.objects.create(hotel=hotels[1], start_date=date(2025, 9, 1), end_date=date(2025, 9, 2), price_per_night=1)
+    client = APIClient()
+    url = reverse("hotel-quote")
+
+    resp = client.get(url, {"check_in": "2025-09-01", "check_out": "2025-09-03", "location": "Addis Ababa"})
+    assert resp.status_code == 200 and resp.json()["nights"] == 2
+    results = {r["hotel"]: r["total_price"] for r in resp.json()["results"]}
+    assert len(results) == 100
+    assert results[hotels[1].id] == "102.00" and results[hotels[3].id] == "206.00"
+
+    resp = client.get(url, {"check_in": "2025-09-01", "check_out": "2025-09-02", "hotels": f"{hotels[0].id},{hotels[1].id}"})
+    assert resp.json()["results"] == [{"hotel": hotels[1].id, "total_price": "1.00"},
+                                      {"hotel": hotels[0].id, "total_price": "100.00"}]
+
+    resp = client.get(url, {"check_in": "2025-09-01", "check_out": "2025-09-02", "hotels": hotels[0].id, "currency": "ETB"})
+    assert resp.json()["results"] == [{"hotel": hotels[0].id, "total_price": "100.00",
+                                       "converted": {"currency": "ETB", "total_price": "100.00"}}]
+
+    assert client.get(url, {"check_in": "2025-09-01", "check_out": "2025-11-01"}).status_code == 400
+    assert client.get(url, {"check_in": "2025-09-01", "check_out": "2025-09-02", "hotels": "1,x"}).status_code == 400
+
+def test_bookings_and_payments_charge_the_quoted_price(db, stub):
+    user = User.objects.create_user(username="u1", password="pass123", email="u1@example.com")
+    hotel = Hotel.objects.create(name="Sheraton", location="Addis Ababa", price_per_night=100, room_count=5)
+    rule = RateRule.objects.create(hotel=hotel, start_date=date(2025, 9, 1), end_date=date(2025, 9, 2), price_per_night=250)
+    client = APIClient()
+    client.force_authenticate(user)
+
+    resp = client.post(reverse("booking-list"), {"hotel": hotel.id, "check_in_date": "2025-09-01",
+                                                 "check_out_date": "2025-09-03", "num_guests": 1}, format="json")
+    assert resp.status_code == 201 and resp.json()["total_price"] == "350.00"
+    resp = client.post(reverse("booking-bulk"), [{"hotel": hotel.id, "check_in_date": "2025-09-01",
+                                                  "check_out_date": "2025-09-02", "num_guests": 1}], format="json")
+    assert resp.json()[0]["booking"]["total_price"] == "250.00"
+
+    # A booked price holds when rates change later.
+    rule.price_per_night = 999
+    rule.save()
+    booking = Booking.objects.get(pk=resp.json()[0]["booking"]["id"])
+    assert booking.total_price == Decimal("250.00")
+
+    client.post(reverse("payments-initiate"), {"booking_id": booking.id}, format="json")
+    # Booked before rates: priced by the engine at payment time, and kept.
+    legacy = Booking.objects.create(user=user, hotel=hotel, check_in_date=date(2025, 9, 1),
+                                    check_out_date=date(2025, 9, 2), num_guests=1)
+    client.post(reverse("payments-initiate"), {"booking_id": legacy.id}, format="json")
+    assert Payment.objects.get(booking=booking).amount == Decimal("250.00")
+    assert Payment.objects.get(booking=legacy).amount == Decimal("999.00")
+    assert Booking.objects.get(pk=legacy.pk).total_price == Decimal("999.00")
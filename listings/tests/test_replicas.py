@@ -0,0 +1,88 @@
+# listings/tests/test_replicas.py
+import copy
+from datetime import date
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connections, transaction
+from rest_framework.test import APIClient
+from listings import db_routers
+from listings.middleware import ReplicaRoutingMiddleware
+from listings.models import Hotel, Booking
+from listings.services import hotel_cache
+
+User = get_user_model()
+REPLICA = "replica_test"
+
+
+@pytest.fixture
+def replica(db, tmp_path, settings):
+    """A second SQLite database standing in for a replica that never catches up."""
+    connections.settings[REPLICA] = {**copy.deepcopy(connections.settings["default"]),
+                                     "NAME": str(tmp_path / "replica.sqlite3")}
+    try:
+        call_command("migrate", database=REPLICA, verbosity=0)
+        settings.DATABASE_REPLICAS = [REPLICA]
+        settings.DATABASE_REPLICA_PIN_SECONDS = 60
+        hotel_cache.bump_version()
+        yield REPLICA
+    finally:
+        connections[REPLICA].close()
+        delattr(connections._connections, REPLICA)
+        del connections.settings[REPLICA]
+
+def test_safe_reads_go_to_the_replica(replica):
+    Hotel.objects.create(name="Primary only", location="Addis Ababa", price_per_night=100)
+    Hotel.objects.using(replica).create(name="Replica copy", location="Addis Ababa", price_per_night=100)
+    client = APIClient()
+
+    resp = client.get("/api/hotels/")
+    assert [h["name"] for h in resp.json()["results"]] == ["Replica copy"]
+    assert ReplicaRoutingMiddleware.PIN_COOKIE not in resp.cookies
+
+def test_writes_pin_the_client_to_the_primary(replica):
+    user = User.objects.create_user(username="guest", password="pass123")
+    User.objects.using(replica).create(pk=user.pk, username="guest")
+    hotel = Hotel.objects.create(name="H", location="Addis Ababa", price_per_night=100)
+    client = APIClient()
+    client.force_authenticate(user)
+
+    resp = client.post("/api/bookings/", {"hotel": hotel.id, "check_in_date": "2025-09-01",
+                                          "check_out_date": "2025-09-03", "num_guests": 1}, format="json")
+    assert resp.status_code == 201
+    assert resp.cookies[ReplicaRoutingMiddleware.PIN_COOKIE]["max-age"] == 60
+
+    # The replica has not seen the booking; the pinned client reads it from the primary.
+    assert [b["id"] for b in client.get("/api/bookings/").json()] == [resp.json()["id"]]
+    client.cookies.clear()
+    assert client.get("/api/bookings/").json() == []
+
+def test_reads_after_a_write_or_in_a_transaction_use_the_primary(replica):
+    route = db_routers.Route()
+    route.replica = replica
+    route.atomic_depth = len(connections["default"].atomic_blocks)
+    token = db_routers.activate(route)
+    try:
+        assert Hotel.objects.all().db == replica
+        with transaction.atomic():
+            assert Hotel.objects.all().db == "default"
+        Booking.objects.filter(check_in_date__lt=date(2000, 1, 1)).delete()
+        assert route.pinned and Hotel.objects.all().db == "default"
+    finally:
+        db_routers.deactivate(token)
+    assert Hotel.objects.all().db == "default"
+
+def test_replica_selection(settings):
+    settings.DATABASE_REPLICAS = ["r1", "r2", "r3"]
+    assert {db_routers.choose_replica() for _ in range(3)} == {"r1", "r2", "r3"}
+
+    settings.DATABASE_REPLICA_SELECTION = "least_latency"
+    db_routers.reset_latency()
+    for alias, seconds in [("r1", 0.004), ("r2", 0.001), ("r3", 0.002)]:
+        db_routers.record_latency(alias, seconds)
+    assert db_routers.choose_replica() == "r2"
+    for _ in range(10):
+        db_routers.record_latency("r2", 0.010)
+    assert db_routers.choose_replica() == "r3"
+    db_routers.reset_latency()
@@ -0,0 +1,94 @@
+# listings/tests/test_revenue.py
+import io
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from listings.models import Hotel, Booking, HotelDaySummary, Payment
+from listings.services import payments
+from listings.tasks import reconcile_pending_payments
+
+User = get_user_model()
+
+
+def make_payments(n, currency="ETB"):
+    user = User.objects.create_user(username=f"guest-{currency}", password="pass123")
+    hotel = Hotel.objects.create(name="Sheraton", location="Addis Ababa", price_per_night=2500)
+    bookings = [
+        Booking.objects.create(user=user, hotel=hotel, check_in_date=date(2025, 9, 1),
+                               check_out_date=date(2025, 9, 1 + nights), num_guests=2)
+        for nights in range(1, n + 1)
+    ]
+    return hotel, [
+        Payment.objects.create(booking=b, tx_ref=f"tx-{currency}-{b.id}", amount=2500 * (i + 1), currency=currency)
+        for i, b in enumerate(bookings)
+    ]
+
+def summary(hotel):
+    return list(HotelDaySummary.objects.filter(hotel=hotel)
+                .values_list("currency", "bookings", "nights_sold", "guests", "revenue"))
+
+def test_verification_updates_summaries_once(db, stub):
+    hotel, (first, second) = make_payments(2)
+    client = APIClient()
+
+    client.get(reverse("payments-verify", args=[first.tx_ref]))
+    assert summary(hotel) == [("ETB", 1, 1, 2, 2500)]
+
+    # Re-verifying a completed payment must not count it again.
+    Payment.objects.filter(pk=first.pk).update(verified_at=None)
+    client.get(reverse("payments-verify", args=[first.tx_ref]))
+    client.get(reverse("payments-verify", args=[second.tx_ref]))
+    assert summary(hotel) == [("ETB", 2, 3, 4, 7500)]
+    assert HotelDaySummary.objects.get().date == timezone.localdate()
+
+    # A payment Chapa no longer reports as successful is taken back out.
+    stub.verify_status = "failed"
+    Payment.objects.filter(pk=second.pk).update(verified_at=None)
+    client.get(reverse("payments-verify", args=[second.tx_ref]))
+    assert summary(hotel) == [("ETB", 1, 1, 2, 2500)]
+
+def test_concurrent_verifications_count_a_payment_once(db, stub):
+    hotel, (payment,) = make_payments(1)
+    # The Chapa callback and the guest's browser both loaded the PENDING row.
+    callback, browser = Payment.objects.get(pk=payment.pk), Payment.objects.get(pk=payment.pk)
+    resp = {"status": "success", "data": {"status": "success", "reference": "REF-1"}}
+    payments.save_verification(callback, resp)
+    stored = payments.save_verification(browser, resp)
+    assert summary(hotel) == [("ETB", 1, 1, 2, 2500)]
+    assert stored.completed_at == Payment.objects.get(pk=payment.pk).completed_at
+
+    # A verdict for a superseded tx_ref doesn't touch the re-initiated payment.
+    Payment.objects.filter(pk=payment.pk).update(tx_ref="tx-new", status=Payment.Status.PENDING)
+    payments.save_verification(browser, {"status": "success", "data": {"status": "failed"}})
+    assert Payment.objects.filter(pk=payment.pk, tx_ref="tx-new", status=Payment.Status.PENDING).exists()
+
+def test_reconciliation_updates_summaries_and_rebuild_agrees(db, stub):
+    hotel, _ = make_payments(3, currency="USD")
+    Payment.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+    reconcile_pending_payments()
+    incremental = summary(hotel)
+    assert incremental == [("USD", 3, 6, 6, 15000)]
+
+    HotelDaySummary.objects.update(revenue=0)
+    call_command("rebuild_revenue_summary", stdout=io.StringIO())
+    assert summary(hotel) == incremental
+
+def test_revenue_report(db, stub, django_assert_max_num_queries):
+    hotel, payments = make_payments(2)
+    for payment in payments:
+        APIClient().get(reverse("payments-verify", args=[payment.tx_ref]))
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(username="finance", password="pass123", is_staff=True))
+    today = timezone.localdate()
+
+    with django_assert_max_num_queries(3):
+        body = client.get(reverse("reports-revenue"), {"start": today, "end": today, "by": "hotel"}).json()
+    assert body["results"] == [{"hotel_id": hotel.id, "hotel": "Sheraton", "currency": "ETB", "bookings": 2,
+                                "nights_sold": 3, "guests": 4, "revenue": "7500.00"}]
+    body = client.get(reverse("reports-revenue"), {"end": today - timedelta(days=1)}).json()
+    assert body["results"] == []
+    assert APIClient().get(reverse("reports-revenue")).status_code in (401, 403)
@@ -0,0 +1,56 @@
+# listings/tests/test_schema.py
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings as django_settings
+from django.core.management import call_command
+from django.test import Client
+
+
+@pytest.fixture
+def schema_file(tmp_path, settings):
+    settings.OPENAPI_SCHEMA_FILE = str(tmp_path / "openapi" / "swagger.json")
+    call_command("generate_schema", stdout=io.StringIO())
+    return settings.OPENAPI_SCHEMA_FILE
+
+def test_schema_is_served_from_the_generated_file(db, schema_file):
+    client = Client()
+    resp = client.get("/swagger.json")
+    assert resp.status_code == 200 and resp["Cache-Control"].startswith("public")
+    with open(schema_file, "rb") as fh:
+        assert resp.content == fh.read()
+    assert "/hotels/" in json.loads(resp.content)["paths"]
+
+    assert client.get("/swagger.json", HTTP_IF_NONE_MATCH=resp["ETag"]).status_code == 304
+
+    # A rebuilt file is picked up, under a new ETag.
+    with open(schema_file, "w") as fh:
+        json.dump({"swagger": "2.0", "paths": {}}, fh)
+    os.utime(schema_file, ns=(1, 1))
+    resp2 = client.get("/swagger.json", HTTP_IF_NONE_MATCH=resp["ETag"])
+    assert resp2.status_code == 200 and resp2["ETag"] != resp["ETag"]
+
+def test_schema_generates_without_the_test_host(db, tmp_path, settings):
+    settings.ALLOWED_HOSTS = ["127.0.0.1", "localhost"]  # the shipped list, without "testserver"
+    settings.OPENAPI_SCHEMA_FILE = str(tmp_path / "swagger.json")
+    call_command("generate_schema", stdout=io.StringIO())
+    with open(settings.OPENAPI_SCHEMA_FILE, "rb") as fh:
+        assert "/hotels/" in json.loads(fh.read())["paths"]
+
+def test_docs_pages_point_at_the_static_schema(db, schema_file, settings):
+    settings.STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"  # no collectstatic manifest
+    for url in ("/swagger/", "/redoc/"):
+        resp = Client().get(url)
+        assert resp.status_code == 200
+        assert b"/swagger.json" in resp.content
+
+def test_drf_yasg_is_not_imported_with_the_urlconf():
+    code = "import django, sys; django.setup(); import alx_travel_app.urls; print('drf_yasg.views' in sys.modules)"
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": "alx_travel_app.settings"}
+    out = subprocess.run([sys.executable, "-c", code], cwd=django_settings.BASE_DIR, env=env,
+                         capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
@@ -1,31 +1,56 @@
 # listings/tests/test_smoke.py
+import io
+import json
+from datetime import date
+
+import pytest
 from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
 from django.urls import reverse
 from rest_framework.test import APIClient
-from listings.models import Listing, Booking
+from listings.models import Hotel, Booking
 
 User = get_user_model()
 
 def create_user(username="u1", password="pass123", email="u1@example.com"):
     return User.objects.create_user(username=username, password=password, email=email)
 
-def test_listings_list_ok(db):
-    Listing.objects.create(title="Test A", price_per_night=100)
+def test_hotels_list_ok(db):
+    Hotel.objects.create(name="Test A", location="Addis Ababa", price_per_night=100)
     client = APIClient()
-    url = reverse("listing-list")  # from DefaultRouter in listings/urls.py
+    url = reverse("hotel-list")  # from DefaultRouter in listings/urls.py
     resp = client.get(url)
     assert resp.status_code == 200
-    assert isinstance(resp.json(), list)
+    assert [h["name"] for h in resp.json()["results"]] == ["Test A"]
 
 def test_payments_initiate_requires_auth(db):
     user = create_user()
-    l = Listing.objects.create(title="Test B", price_per_night=100)
+    hotel = Hotel.objects.create(name="Test B", location="Gondar", price_per_night=100)
     booking = Booking.objects.create(
-        user=user, listing=l, start_date="2025-08-20", end_date="2025-08-21",
-        guests=1, total_price=100, currency="ETB"
+        user=user, hotel=hotel, check_in_date=date(2025, 8, 20), check_out_date=date(2025, 8, 21), num_guests=1
     )
     client = APIClient()  # not authenticated
     url = reverse("payments-initiate")
     resp = client.post(url, {"booking_id": booking.id, "currency": "ETB"}, format="json")
     # IsAuthenticated on the view should reject anonymous
     assert resp.status_code in (401, 403)
+
+def test_endpoint_benchmark_writes_comparable_json(db, tmp_path):
+    options = dict(requests=5, hotels=5, users=3, bookings=30, latency=0, stdout=io.StringIO())
+    output = tmp_path / "run.json"
+    call_command("bench_endpoints", output=str(output), **options)
+
+    results = json.loads(output.read_text())
+    assert set(results["endpoints"]) == {"hotels", "bookings", "payments_initiate", "payments_verify"}
+    for r in results["endpoints"].values():
+        assert r["requests"] == 5 and r["errors"] == 0
+        assert r["p50_ms"] <= r["p95_ms"] <= r["p99_ms"]
+        assert r["queries_per_request"] > 0
+    assert not Hotel.objects.exists()  # seeded rows were rolled back
+
+    # Against an impossibly fast baseline every endpoint is flagged.
+    for r in results["endpoints"].values():
+        r["p95_ms"], r["queries_per_request"] = 0, 0
+    output.write_text(json.dumps(results))
+    with pytest.raises(CommandError, match="payments_verify"):
+        call_command("bench_endpoints", baseline=str(output), **options)
@@ -0,0 +1,45 @@
+# listings/tests/test_tasks.py
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail import get_connection
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from listings import tasks
+from listings.models import Hotel, Booking
+from listings.services.notifications import queue_booking_confirmations
+from listings.tasks import relay_outbox, send_booking_confirmation_email
+
+User = get_user_model()
+
+
+def create_bookings(n):
+    hotel = Hotel.objects.create(name="Sheraton", location="Addis Ababa", price_per_night=2500)
+    users = [User.objects.create_user(username=f"u{i}", email=f"u{i}@example.com") for i in range(n)]
+    return Booking.objects.bulk_create(
+        Booking(user=u, hotel=hotel, check_in_date=date(2025, 9, 1), check_out_date=date(2025, 9, 2), num_guests=1)
+        for u in users
+    )
+
+def test_single_task_is_a_thin_wrapper(db):
+    booking = create_bookings(1)[0]
+    assert send_booking_confirmation_email(booking.id) == f"Confirmation email sent for booking ID {booking.id}"
+    assert send_booking_confirmation_email(999999) == "Booking with ID 999999 not found."
+
+def test_confirmations_are_relayed_after_commit_in_chunks(db, settings, eager_celery, monkeypatch):
+    settings.BOOKING_EMAIL_BATCH_SIZE = 4
+    bookings = create_bookings(10)
+    connections = []
+    monkeypatch.setattr(tasks, "get_connection", lambda: connections.append(get_connection()) or connections[-1])
+
+    with transaction.atomic():
+        queue_booking_confirmations([b.id for b in bookings] + [999999])
+    assert mail.outbox == []
+    with CaptureQueriesContext(connection) as queries:
+        assert relay_outbox() == "Dispatched 11 outbox event(s); purged 0"
+    assert len(mail.outbox) == 10
+    assert mail.outbox[0].subject == "Booking Confirmation for Sheraton"
+    # One joined query and one SMTP connection per chunk of BOOKING_EMAIL_BATCH_SIZE.
+    assert len(connections) == 3
+    assert sum("listings_booking" in q["sql"] for q in queries) == 3
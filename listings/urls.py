@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
@@ -6,14 +7,28 @@ from .views import (
     BookingViewSet,
     InitiatePaymentAPIView,
     VerifyPaymentAPIView,
+    AsyncInitiatePaymentView,
+    AsyncVerifyPaymentView,
+    BookingExportView,
+    PaymentExportView,
+    RevenueReportView,
 )
 
+# Served under ASGI, the async payment views keep no thread busy while Chapa answers.
+if getattr(settings, "ASYNC_PAYMENT_VIEWS", False):
+    initiate_view, verify_view = AsyncInitiatePaymentView, AsyncVerifyPaymentView
+else:
+    initiate_view, verify_view = InitiatePaymentAPIView, VerifyPaymentAPIView
+
 router = DefaultRouter()
 router.register(r"hotels", HotelViewSet, basename="hotel")
 router.register(r"bookings", BookingViewSet, basename="booking")
 
 urlpatterns = [
     path("", include(router.urls)),
-    path("payments/initiate/", InitiatePaymentAPIView.as_view(), name="payments-initiate"),
-    path("payments/verify/<str:tx_ref>/", VerifyPaymentAPIView.as_view(), name="payments-verify"),
+    path("payments/initiate/", initiate_view.as_view(), name="payments-initiate"),
+    path("payments/verify/<str:tx_ref>/", verify_view.as_view(), name="payments-verify"),
+    path("exports/bookings.<str:fmt>", BookingExportView.as_view(), name="exports-bookings"),
+    path("exports/payments.<str:fmt>", PaymentExportView.as_view(), name="exports-payments"),
+    path("reports/revenue/", RevenueReportView.as_view(), name="reports-revenue"),
 ]
\ No newline at end of file
@@ -1,91 +1,378 @@
+from decimal import Decimal, InvalidOperation
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.db import transaction
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.views import View
+from django.views.decorators.http import condition, require_safe
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotAuthenticated, PermissionDenied, ValidationError
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.views import APIView
 
 # Corrected imports to use Hotel instead of Listing
-from .models import Hotel, Booking, Payment
-from .serializers import HotelSerializer, BookingSerializer, PaymentSerializer
-from .services import chapa
+from .fast_serializers import FastListMixin
+from .models import Hotel, Booking, Payment, ProviderCall
+from .pagination import HotelCursorPagination
+from .serializers import (
+    HotelSerializer,
+    BookingSerializer,
+    PaymentSerializer,
+    AvailabilitySearchSerializer,
+    HotelSearchSerializer,
+    RateQuoteSerializer,
+    HotelQuoteSerializer,
+    BookingBulkSerializer,
+    ExportRangeSerializer,
+    RevenueReportSerializer,
+    RevenueRowSerializer,
+)
+from .services import api_schema, chapa, exports, fx, hotel_cache, inventory, notifications, payments, rates, revenue
+
+
+class RoomsUnavailable(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The hotel has no rooms left for some of the requested nights."
+    default_code = "rooms_unavailable"
+
+
+def _decimal_param(params, name):
+    """Parse an optional decimal query parameter, rejecting junk with a 400."""
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        value = Decimal(raw)
+    except InvalidOperation:
+        value = None
+    if value is None or not value.is_finite():  # NaN/Infinity would reach the filter
+        raise ValidationError({name: "A valid number is required."})
+    return value
+
+def _fx_converter(currency):
+    """fx.converter() for a client-supplied currency; unknown ones get a 400."""
+    try:
+        return fx.converter(currency)
+    except fx.UnknownCurrency:
+        raise ValidationError({"currency": f"Unsupported currency: {currency}."})
+
 
-class HotelViewSet(viewsets.ModelViewSet):
+class PriceCurrencyMixin:
+    """?currency=XXX adds converted prices to responses (serializers.ConvertedPricesMixin)."""
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        currency = self.request.query_params.get("currency") if self.request is not None else None
+        if currency:
+            context["convert"] = _fx_converter(currency)
+        return context
+
+    def cached_response(self, request, action, render):
+        # Converted prices depend on the FX table as well as on the hotels.
+        convert = self.get_serializer_context().get("convert")
+        if convert is not None:
+            action = f"{action}:fx{convert.version}"
+        return hotel_cache.cached_response(request, action, render)
+
+
+class HotelViewSet(PriceCurrencyMixin, FastListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows hotels to be viewed or edited.
     """
     queryset = Hotel.objects.all().order_by("-id")
     serializer_class = HotelSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = HotelCursorPagination
+    # Queries per request, session/auth lookups included (listings.middleware)
+    query_budget = {"list": 3, "availability": 3, "retrieve": 3, "search": 3, "quote": 3}
+    # Safe requests read from a replica when DATABASE_REPLICAS is set (listings.db_routers)
+    read_replica = True
+
+    def get_queryset(self):
+        """
+        Optional filters: ?location=<exact>&min_price=<n>&max_price=<n>.
+        All of them are served by the Hotel indexes.
+        """
+        queryset = super().get_queryset()
+        params = self.request.query_params
+
+        location = params.get("location")
+        if location:
+            queryset = queryset.filter(location=location)
+
+        min_price = _decimal_param(params, "min_price")
+        if min_price is not None:
+            queryset = queryset.filter(price_per_night__gte=min_price)
+
+        max_price = _decimal_param(params, "max_price")
+        if max_price is not None:
+            queryset = queryset.filter(price_per_night__lte=max_price)
+
+        return queryset
+
+    # Reads are served from the versioned response cache (services.hotel_cache)
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, "list", lambda: super(HotelViewSet, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, "retrieve", lambda: super(HotelViewSet, self).retrieve(request, *args, **kwargs)
+        )
+
+    @action(detail=False, methods=["get"])
+    def availability(self, request):
+        """
+        Hotels free for the whole stay:
+        ?check_in=YYYY-MM-DD&check_out=YYYY-MM-DD plus the list filters.
+        """
+        search = AvailabilitySearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        queryset = self.get_queryset().available(
+            search.validated_data["check_in"], search.validated_data["check_out"]
+        )
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=["get"])
+    def quote(self, request):
+        """
+        Price of one stay at many hotels: ?check_in=&check_out=[&hotels=1,2,...]
+        plus the list filters, for at most RATE_QUOTE_MAX_HOTELS hotels (newest
+        first). Seasonal, weekend and per-night rates apply (services.rates);
+        ?currency= adds converted totals.
+        """
+        params = RateQuoteSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        check_in, check_out = params.validated_data["check_in"], params.validated_data["check_out"]
+
+        queryset = self.get_queryset().only("id", "price_per_night")
+        if "hotels" in params.validated_data:
+            queryset = queryset.filter(id__in=params.validated_data["hotels"])
+        hotels = list(queryset[:settings.RATE_QUOTE_MAX_HOTELS])
+        totals = rates.quote(hotels, check_in, check_out)
+        results = HotelQuoteSerializer(
+            [{"hotel": hotel.id, "total_price": totals[hotel.id]} for hotel in hotels],
+            many=True, context=self.get_serializer_context(),
+        )
+        return Response({
+            "check_in": check_in,
+            "check_out": check_out,
+            "nights": (check_out - check_in).days,
+            "results": results.data,
+        })
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Hotels whose name or location match ?q=, best matches first, at most
+        ?limit= of them; combinable with the list filters. Index-backed (services.search).
+        """
+        params = HotelSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        def render():
+            hotels = self.get_queryset().search(params.validated_data["q"])[:params.validated_data["limit"]]
+            return Response({"results": self.get_serializer(hotels, many=True).data})
+
+        return self.cached_response(request, "search", render)
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(PriceCurrencyMixin, FastListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows bookings to be viewed or edited.
     """
     queryset = Booking.objects.all().order_by("-id")
     serializer_class = BookingSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = {"list": 3, "retrieve": 3}
+    read_replica = {"list": True, "retrieve": True}
 
     def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False):  # schema generation
+            return Booking.objects.none()
+        # Booking.objects joins hotel/user and annotates nights/total_price
         return Booking.objects.filter(user=self.request.user).order_by("-id")
 
     def perform_create(self, serializer):
-        # The serializer now saves the booking without payment logic
-        serializer.save(user=self.request.user)
+        # Reserve the nights, insert the booking and record its confirmation
+        # in one transaction so a sold-out night rolls all of them back.
+        data = serializer.validated_data
+        try:
+            with transaction.atomic():
+                inventory.reserve(data["hotel"], data["check_in_date"], data["check_out_date"])
+                booking = serializer.save(user=self.request.user, quoted_total=rates.price_stay(
+                    data["hotel"], data["check_in_date"], data["check_out_date"]))
+                notifications.queue_booking_confirmations([booking.id])
+        except inventory.NoAvailability:
+            raise RoomsUnavailable()
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Create many bookings from a JSON list in one transaction. Each item is
+        validated and reserved on its own; the ones that pass are inserted with
+        a single bulk_create and their confirmation emails queued as one batch
+        after commit. Returns per-item results in request order: 201 if every
+        item was created, 207 otherwise.
+        """
+        serializer = BookingBulkSerializer(
+            child=BookingSerializer(), data=request.data, context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        results = [
+            {"index": i, "status": status.HTTP_400_BAD_REQUEST, "errors": errors} if errors else None
+            for i, errors in enumerate(serializer.item_errors)
+        ]
+
+        with transaction.atomic():
+            pending = []
+            for i, data in enumerate(serializer.validated_data):
+                if data is None:
+                    continue
+                try:
+                    inventory.reserve(data["hotel"], data["check_in_date"], data["check_out_date"])
+                except inventory.NoAvailability:
+                    results[i] = {"index": i, "status": status.HTTP_409_CONFLICT,
+                                  "errors": {"detail": RoomsUnavailable.default_detail}}
+                    continue
+                pending.append((i, Booking(user=request.user, **data)))
+
+            rates.price_bookings([booking for _, booking in pending])
+            created = Booking.objects.bulk_create([booking for _, booking in pending])
+            notifications.queue_booking_confirmations([booking.id for booking in created])
+
+        for (i, _), booking in zip(pending, created):
+            results[i] = {"index": i, "status": status.HTTP_201_CREATED,
+                          "booking": BookingSerializer(booking, context=self.get_serializer_context()).data}
+        all_created = len(created) == len(results)
+        return Response(results, status=status.HTTP_201_CREATED if all_created else status.HTTP_207_MULTI_STATUS)
+
+    def perform_update(self, serializer):
+        booking = serializer.instance
+        old = (booking.hotel, booking.check_in_date, booking.check_out_date)
+        data = serializer.validated_data
+        new = (
+            data.get("hotel", booking.hotel),
+            data.get("check_in_date", booking.check_in_date),
+            data.get("check_out_date", booking.check_out_date),
+        )
+        if new == old:
+            serializer.save()
+            return
+        try:
+            with transaction.atomic():
+                inventory.release(*old)
+                inventory.reserve(*new)
+                serializer.save(quoted_total=rates.price_stay(*new))
+        except inventory.NoAvailability:
+            raise RoomsUnavailable()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            inventory.release(instance.hotel, instance.check_in_date, instance.check_out_date)
+            instance.delete()
+
+
+def _initialize_kwargs(payment, user):
+    return dict(
+        amount=payment.amount,
+        currency=payment.currency,
+        email=user.email or "guest@example.com",
+        first_name=user.first_name or "Guest",
+        last_name=user.last_name or "User",
+        tx_ref=payment.tx_ref,
+        callback_url=getattr(settings, "API_CALLBACK_URL", None),
+        return_url=getattr(settings, "FRONTEND_RETURN_URL", None),
+        customization={"title": "Travel App Booking Payment"},
+    )
+
+def _apply_init_response(payment, init_resp):
+    """Returns the (unsaved) ProviderCall audit row, as do the helpers below."""
+    payment.checkout_url = init_resp.get("data", {}).get("checkout_url", "")
+    payment.provider_error = ""
+    return ProviderCall.build(payment, ProviderCall.Kind.INITIALIZE, init_resp)
+
+def _apply_init_error(payment, error):
+    payment.status = Payment.Status.FAILED
+    payment.provider_error = str(error)[:255]
+    body = {"error": str(error), "body": getattr(error, "body", None)}
+    return ProviderCall.build(payment, ProviderCall.Kind.INITIALIZE, body, ok=False)
+
+def _verify_error_call(payment, error):
+    body = {"error": str(error), "body": getattr(error, "body", None)}
+    return ProviderCall.build(payment, ProviderCall.Kind.VERIFY, body, ok=False)
+
+def _expand(request):
+    # Provider payloads are for support staff only; the verify URL is public.
+    requested = request.query_params.get("expand", "").split(",")
+    return ["provider_calls"] if "provider_calls" in requested and request.user.is_staff else []
+
+def _payment_data(request, payment):
+    return PaymentSerializer(payment, context={"request": request, "expand": _expand(request)}).data
+
+def _provider_error(error):
+    return {"detail": "Payment provider could not be reached.", "error": str(error)}
+
+FORBIDDEN_BOOKING = {"detail": "You do not have permission to pay for this booking."}
+
+def _claimed_response(outcome, payment):
+    """Body and status for claim outcomes that need no Chapa call, else None."""
+    if outcome == payments.REUSE:
+        return {"checkout_url": payment.checkout_url}, status.HTTP_200_OK
+    if outcome == payments.BUSY:
+        return {"detail": "Payment initiation for this booking is already in progress."}, status.HTTP_409_CONFLICT
+    if outcome == payments.PAID:
+        return {"detail": "This booking has already been paid."}, status.HTTP_409_CONFLICT
+    if outcome == payments.REPLAY_FAILED:
+        return _provider_error(payment.provider_error), status.HTTP_502_BAD_GATEWAY
+    if outcome == payments.CHECKOUT_OPEN:
+        return {"detail": f"An open checkout charges {payment.amount} {payment.currency} for this booking; "
+                          "complete or cancel it first.",
+                "amount": str(payment.amount), "currency": payment.currency,
+                "checkout_url": payment.checkout_url}, status.HTTP_409_CONFLICT
+    return None
 
 
 class InitiatePaymentAPIView(APIView):
     """
     Creates a Payment object for a booking and returns a Chapa checkout URL.
+    Idempotent per booking (and per optional Idempotency-Key header): retries
+    and double-clicks get the stored checkout URL instead of a new Chapa call.
     """
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 12  # two of them price a booking made before rates (services.rates)
 
     def post(self, request, *args, **kwargs):
         booking_id = request.data.get("booking_id")
-        currency = request.data.get("currency", "ETB")
+        # Amounts are converted from PRICE_CURRENCY (services.fx)
+        currency = _fx_converter(request.data.get("currency", settings.PRICE_CURRENCY)).currency
 
+        # The hotel comes joined (Booking.objects), ready for services.rates
         booking = get_object_or_404(Booking, id=booking_id)
-        if booking.user != request.user:
-            return Response({"detail": "You do not have permission to pay for this booking."}, status=status.HTTP_403_FORBIDDEN)
-
-        # Use get_or_create to avoid creating duplicate payments for the same booking
-        tx_ref = chapa.generate_tx_ref(prefix=f"booking-{booking.id}")
-        payment, created = Payment.objects.get_or_create(
-            booking=booking,
-            defaults={
-                "tx_ref": tx_ref,
-                "amount": booking.total_price,
-                "currency": currency,
-                "status": Payment.Status.PENDING,
-            }
-        )
+        if booking.user_id != request.user.id:
+            return Response(FORBIDDEN_BOOKING, status=status.HTTP_403_FORBIDDEN)
 
-        # If payment already existed but failed, generate a new tx_ref
-        if not created and payment.status == Payment.Status.FAILED:
-            payment.tx_ref = tx_ref
-            payment.status = Payment.Status.PENDING
-            payment.save()
+        outcome, payment = payments.claim_initiation(booking, currency, request.headers.get("Idempotency-Key"))
+        claimed = _claimed_response(outcome, payment)
+        if claimed:
+            return Response(*claimed)
 
-        user = request.user
         try:
-            init_resp = chapa.initialize(
-                amount=payment.amount,
-                currency=payment.currency,
-                email=user.email or "guest@example.com",
-                first_name=user.first_name or "Guest",
-                last_name=user.last_name or "User",
-                tx_ref=payment.tx_ref,
-                callback_url=getattr(settings, "API_CALLBACK_URL", None),
-                return_url=getattr(settings, "FRONTEND_RETURN_URL", None),
-                customization={"title": "Travel App Booking Payment"},
-            )
-            payment.raw_init_resp = init_resp
-            payment.checkout_url = init_resp.get("data", {}).get("checkout_url", "")
-            payment.save()
+            init_resp = chapa.initialize(**_initialize_kwargs(payment, request.user))
+            call = _apply_init_response(payment, init_resp)
         except Exception as e:
-            payment.status = Payment.Status.FAILED
-            payment.raw_init_resp = {"error": str(e)}
-            payment.save()
-            return Response({"detail": "Payment provider could not be reached.", "error": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+            call = _apply_init_error(payment, e)
+            payments.save_init_failure(payment, call)
+            return Response(_provider_error(e), status=status.HTTP_502_BAD_GATEWAY)
+        payment.save()
+        call.save()
 
         return Response({"checkout_url": payment.checkout_url}, status=status.HTTP_200_OK)
 
@@ -96,23 +383,209 @@ class VerifyPaymentAPIView(APIView):
     This is typically used as the callback URL.
     """
     permission_classes = [permissions.AllowAny]
+    query_budget = 13  # includes locking and re-reading the payment, the revenue summary upsert and the outbox event
 
     def get(self, request, tx_ref: str):
         payment = get_object_or_404(Payment, tx_ref=tx_ref)
+        # Reconciled moments ago (see tasks.reconcile_pending_payments): skip Chapa
+        if payments.is_recently_verified(payment):
+            return Response(_payment_data(request, payment), status=status.HTTP_200_OK)
 
         try:
             verify_resp = chapa.verify(tx_ref)
         except Exception as e:
-            return Response({"detail": "Payment provider could not be reached.", "error": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+            _verify_error_call(payment, e).save()
+            return Response(_provider_error(e), status=status.HTTP_502_BAD_GATEWAY)
 
-        payment.raw_verify_resp = verify_resp
-        data = verify_resp.get("data", {})
-        
-        if data and data.get("status") == "success":
-            payment.status = Payment.Status.COMPLETED
-            payment.chapa_ref_id = data.get("reference") or data.get("ref_id") or ""
-        else:
-            payment.status = Payment.Status.FAILED
+        payment = payments.save_verification(payment, verify_resp)
+        return Response(_payment_data(request, payment), status=status.HTTP_200_OK)
 
-        payment.save()
-        return Response(PaymentSerializer(payment).data, status=status.HTTP_200_OK)
\ No newline at end of file
+
+class ExportView(APIView):
+    """
+    Staff-only streaming export, as CSV or NDJSON (/api/exports/<name>.<fmt>),
+    filtered by ?start= and ?end= dates. Rows are read through a cursor and
+    written as they arrive, so the first bytes leave before the query is done.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    name = None
+    columns = None
+    rows = None
+    formats = {
+        "csv": (exports.stream_csv, "text/csv; charset=utf-8"),
+        "ndjson": (exports.stream_ndjson, "application/x-ndjson"),
+    }
+
+    def get(self, request, fmt):
+        if fmt not in self.formats:
+            raise Http404
+        params = ExportRangeSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        start, end = params.validated_data.get("start"), params.validated_data.get("end")
+
+        stream, content_type = self.formats[fmt]
+        rows = self.rows(start, end)
+        response = StreamingHttpResponse(stream(self.columns, rows, settings.EXPORT_CHUNK_SIZE),
+                                         content_type=content_type)
+        filename = "-".join([self.name, *(str(d) for d in (start, end) if d)])
+        response["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+        return response
+
+
+class BookingExportView(ExportView):
+    """Bookings with hotel and total price, by check-in date."""
+    name = "bookings"
+    columns = exports.BOOKING_COLUMNS
+    rows = staticmethod(exports.booking_rows)
+
+
+class PaymentExportView(ExportView):
+    """Payments by creation date."""
+    name = "payments"
+    columns = exports.PAYMENT_COLUMNS
+    rows = staticmethod(exports.payment_rows)
+
+
+class RevenueReportView(APIView):
+    """
+    Staff-only revenue report over ?start= and ?end= (inclusive), per day or
+    per hotel (?by=), read from the pre-aggregated HotelDaySummary rows.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    query_budget = 3
+
+    def get(self, request):
+        params = RevenueReportSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+        rows = revenue.report(query.get("start"), query.get("end"), query.get("hotel"), query["by"])
+        return Response({
+            "start": query.get("start"),
+            "end": query.get("end"),
+            "by": query["by"],
+            "results": RevenueRowSerializer(rows, many=True).data,
+        })
+
+
+# ─── ASGI payment endpoints ───────────────────────────────────────────────────
+class AsyncPaymentView(View):
+    """
+    Base for the async payment endpoints. DRF authentication and permissions run
+    once off the event loop; the rest of the request only awaits the async ORM
+    and the async Chapa client, so a slow provider does not hold a worker thread.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Like APIView: SessionAuthentication enforces CSRF itself.
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = APIView().initialize_request(request)
+        try:
+            await sync_to_async(self.check_permissions)(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            return self.handle_exception(request, exc)
+
+    def handle_exception(self, request, exc):
+        response = self.respond({"detail": exc.detail}, exc.status_code)
+        if isinstance(exc, NotAuthenticated):
+            auth_header = request.authenticators[0].authenticate_header(request) if request.authenticators else None
+            if auth_header:
+                response["WWW-Authenticate"] = auth_header
+            else:
+                response.status_code = status.HTTP_403_FORBIDDEN
+        return response
+
+    def check_permissions(self, request):
+        for permission in (p() for p in self.permission_classes):
+            if not permission.has_permission(request, self):
+                if request.authenticators and not request.successful_authenticator:
+                    raise NotAuthenticated()
+                raise PermissionDenied(getattr(permission, "message", None))
+
+    @staticmethod
+    def respond(data, status_code=status.HTTP_200_OK):
+        return JsonResponse(data, status=status_code, encoder=JSONEncoder, safe=False)
+
+
+class AsyncInitiatePaymentView(AsyncPaymentView):
+    """ASGI twin of InitiatePaymentAPIView."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    async def post(self, request, *args, **kwargs):
+        booking_id = request.data.get("booking_id")
+        # Amounts are converted from PRICE_CURRENCY (services.fx)
+        currency = (await sync_to_async(_fx_converter)(request.data.get("currency", settings.PRICE_CURRENCY))).currency
+
+        try:
+            booking = await Booking.objects.aget(id=booking_id)
+        except (Booking.DoesNotExist, ValueError, TypeError):
+            return self.respond({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+        if booking.user_id != request.user.id:
+            return self.respond(FORBIDDEN_BOOKING, status.HTTP_403_FORBIDDEN)
+
+        outcome, payment = await sync_to_async(payments.claim_initiation)(
+            booking, currency, request.headers.get("Idempotency-Key")
+        )
+        claimed = _claimed_response(outcome, payment)
+        if claimed:
+            return self.respond(*claimed)
+
+        try:
+            init_resp = await chapa.get_async_client().initialize(**_initialize_kwargs(payment, request.user))
+            call = _apply_init_response(payment, init_resp)
+        except Exception as e:
+            call = _apply_init_error(payment, e)
+            await sync_to_async(payments.save_init_failure)(payment, call)
+            return self.respond(_provider_error(e), status.HTTP_502_BAD_GATEWAY)
+        await payment.asave()
+        await call.asave()
+
+        return self.respond({"checkout_url": payment.checkout_url})
+
+
+class AsyncVerifyPaymentView(AsyncPaymentView):
+    """ASGI twin of VerifyPaymentAPIView."""
+    permission_classes = [permissions.AllowAny]
+
+    async def get(self, request, tx_ref: str):
+        try:
+            payment = await Payment.objects.aget(tx_ref=tx_ref)
+        except Payment.DoesNotExist:
+            return self.respond({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+        if payments.is_recently_verified(payment):
+            return self.respond(await sync_to_async(_payment_data)(request, payment))
+
+        try:
+            verify_resp = await chapa.get_async_client().verify(tx_ref)
+        except Exception as e:
+            await _verify_error_call(payment, e).asave()
+            return self.respond(_provider_error(e), status.HTTP_502_BAD_GATEWAY)
+
+        payment = await sync_to_async(payments.save_verification)(payment, verify_resp)
+        return self.respond(await sync_to_async(_payment_data)(request, payment))
+
+
+# ─── API schema ───────────────────────────────────────────────────────────────
+
+@require_safe
+@condition(etag_func=lambda request: api_schema.load()[1])
+def schema_json(request):
+    """The pre-generated OpenAPI document (services.api_schema); If-None-Match gets a 304."""
+    body, _ = api_schema.load()
+    response = HttpResponse(body, content_type="application/json")
+    response["Cache-Control"] = f"public, max-age={settings.OPENAPI_SCHEMA_MAX_AGE}"
+    return response
+
+@require_safe
+def schema_ui(request, ui):
+    """Swagger UI / ReDoc page; the browser then loads schema_json."""
+    try:
+        return HttpResponse(api_schema.render_ui(request, ui))
+    except ImportError:  # drf_yasg is optional at runtime
+        raise Http404("API docs are not installed.")